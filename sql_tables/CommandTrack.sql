@@ -1,5 +1,6 @@
 CREATE TABLE CommandTrack(
-    CommandName PRIMARY KEY NVARCHAR(225) NOT NULL,
-    UsageMonth PRIMARY KEY CHAR(7) NOT NULL, -- Format: YYYY-MM
-    UsageCount INTEGER NOT NULL
+    CommandName NVARCHAR(225) NOT NULL,
+    UsageMonth CHAR(7) NOT NULL, -- Format: MM-YYYY
+    UsageCount INTEGER NOT NULL,
+    CONSTRAINT PK_CommandTrack PRIMARY KEY (CommandName, UsageMonth)
 )
\ No newline at end of file
@@ -3,5 +3,6 @@ CREATE TABLE SolveTimes(
     UserID INTEGER FOREIGN KEY REFERENCES Users(UserID),
     SolveTime DECIMAL(10, 2) NOT NULL,
     PuzzleType NVARCHAR(20) NOT NULL,
+    SolveStatus NVARCHAR(20) NOT NULL DEFAULT 'Completed',
     SolveAt DATETIME NOT NULL DEFAULT GETDATE()
 )
\ No newline at end of file
@@ -1,8 +1,16 @@
+import base64
 import json
 import discord
 from discord.ext import commands, tasks
-from database.DB_Manager import DatabaseManager
-from azure.storage.blob import BlobServiceClient
+from database import AsyncDatabase, CommandUsageBuffer, ConnectionSupervisor, FLUSH_INTERVAL, UserIdentityCache, create_storage, set_query_tag
+from database.migrations import migrate
+from rubik.cube import Cube
+from rubik.draw import draw_rubiks_cube
+from rubik.scrambler import generate_scramble
+from rubik import cases, pocket, recognize, twophase
+from azure.storage.blob.aio import BlobServiceClient
+from views.attachment_cache import attachment_urls
+from views.image_cache import case_images
 import os
 import requests
 import logging
@@ -28,8 +36,24 @@ class RubiksBot(commands.Bot):
         self.server_count = 0
         super().__init__(command_prefix="/", intents=intents)
 
-        # Persistent database manager shared across the bot
-        self.db_manager = DatabaseManager()
+        # Storage backend shared across the bot (DB_BACKEND), used through the async façade
+        self.storage = create_storage()
+        self.db = AsyncDatabase(self.storage)
+        # Connects in the background and reconnects after outages, failing commands fast meanwhile
+        self.db_supervisor = ConnectionSupervisor(self.db, on_connect=self.on_database_connected)
+        # Command usage counts, written to the database in batches
+        self.command_usage = CommandUsageBuffer(self.db)
+        # Discord ID to UserID, queried once per user
+        self.user_ids = UserIdentityCache(self.db)
+
+        # Async Azure Blob client for algorithm images that cannot be rendered locally
+        account_url = os.getenv("AZURE_STORAGE_ACCOUNT_URL")
+        access_key = os.getenv("AZURE_STORAGE_ACCESS_KEY")
+        self.container = os.getenv("AZURE_STORAGE_CONTAINER_NAME")
+        if account_url and access_key:
+            self.blob_service_client = BlobServiceClient(account_url=account_url, credential=access_key)
+        else:
+            self.blob_service_client = None
 
     async def setup_hook(self) -> None:
         """
@@ -54,11 +78,29 @@ class RubiksBot(commands.Bot):
             else:
                 logger.warning("GUILD_ID not found in environment. Skipping guild sync.")
 
+        # Memory-map the solver tables (built on first run if missing)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, twophase.get_tables)
+        await loop.run_in_executor(None, pocket.get_tables)
+        await loop.run_in_executor(None, recognize.get_tables)
+
+        # Render any OLL/PLL case images missing from the disk cache, then load them all
+        await loop.run_in_executor(None, cases.build_case_images)
+        await case_images.prefetch(self.blob_service_client, self.container)
+
+        # Upload case images once to the asset channel and reuse their CDN URLs
+        asset_channel_id = os.getenv("ASSET_CHANNEL_ID")
+        attachment_urls.configure(self, int(asset_channel_id) if asset_channel_id else None)
+
         # Start background tasks for database health and stats reporting
         if not self.keep_database_alive.is_running():
-            logger.info("Starting keep-alive task...")
+            logger.info("Starting database health task...")
             self.keep_database_alive.start()
 
+        if not self.flush_command_usage.is_running():
+            logger.info("Starting command usage flush task...")
+            self.flush_command_usage.start()
+
         if not self.update_topgg.is_running():
             logger.info("Starting updating topgg...")
             self.update_topgg.start()
@@ -74,6 +116,10 @@ class RubiksBot(commands.Bot):
         if not self.daily_scramble_task.is_running():
             logger.info("Starting daily scramble task...")
             self.daily_scramble_task.start()
+
+        if self.blob_service_client and not self.revalidate_case_images.is_running():
+            logger.info("Starting case image revalidation task...")
+            self.revalidate_case_images.start()
         
     async def on_ready(self) -> None:
         """
@@ -83,27 +129,69 @@ class RubiksBot(commands.Bot):
         if not self.rotate_status.is_running():
             logger.info("Starting roatate statuses")
             self.rotate_status.start()
-        # Initialize the shared database connection
-        try:
-            self.db_manager.connect()
-            await self.check_and_generate_daily_scramble()
-        except Exception as e:
-            logger.error(f"Failed to initialize database connection: {e}")
+        # Connect to the database in the background; on_database_connected runs once connected
+        self.db_supervisor.start()
+
+    async def on_database_connected(self) -> None:
+        """
+        Triggered by the connection supervisor after every (re)connect to the database.
+        """
+        set_query_tag("on_database_connected")
+        # Bring the schema up to date unless migrations are run by hand (python -m database.migrations)
+        if os.getenv("DB_AUTO_MIGRATE", "true").lower() != "false":
+            await migrate(self.db)
+        await self.check_and_generate_daily_scramble()
 
-    async def on_disconnect(self) -> None:
+    async def close(self) -> None:
         """
-        Cleanup logic when the bot disconnects.
+        Writes buffered command usage, then closes the blob client's HTTP session, the
+        database connections and the database thread pool before shutting down.
         """
-        self.db_manager.close()
+        await self.command_usage.flush()
+        if self.blob_service_client:
+            await self.blob_service_client.close()
+        await self.db_supervisor.stop()
+        self.db.close()
+        await super().close()
 
-    @tasks.loop(minutes=5)
+    @tasks.loop(minutes=1)
     async def keep_database_alive(self) -> None:
         """
-        Background task to prevent Azure SQL from going idle.
+        Background task that publishes the database health: probes the connection (opening
+        the circuit breaker if it fails), trims idle pooled connections and reports usage.
         """
-        logger.debug("Executing keep-alive query...")
-        self.db_manager.keep_alive()
+        set_query_tag("keep_database_alive")
+        health = await self.db_supervisor.check_health()
+        if health.breaker_open:
+            retry = f", next attempt in {health.retry_in:.0f}s" if health.retry_in is not None else ""
+            logger.warning(f"Database unavailable after {health.attempts} attempts{retry}: {health.last_error}")
+            return
+        pruned = await self.db.call(self.storage.prune_idle)
+        if pruned:
+            logger.info(f"Closed {pruned} idle database connections")
+        logger.debug(f"Database health: {health}, threads: {self.db.stats()}, user IDs: {self.user_ids.stats()}")
+        logger.debug(f"Queries by total time:\n{self.db.metrics.report()}")
     
+    @tasks.loop(seconds=FLUSH_INTERVAL)
+    async def flush_command_usage(self) -> None:
+        """
+        Writes the command usage buffered since the last flush.
+        """
+        set_query_tag("flush_command_usage")
+        await self.command_usage.flush()
+
+    @tasks.loop(hours=6)
+    async def revalidate_case_images(self) -> None:
+        """
+        Re-downloads blob-sourced case images whose ETag changed.
+        """
+        # The images were just prefetched by setup_hook
+        if self.revalidate_case_images.current_loop == 0:
+            return
+        refreshed = await case_images.revalidate(self.blob_service_client, self.container)
+        if refreshed:
+            logger.info(f"Refreshed {refreshed} case images from blob storage")
+
     @tasks.loop(minutes=15)
     async def rotate_status(self) -> None:
         statuses = [
@@ -202,35 +290,22 @@ class RubiksBot(commands.Bot):
         today = datetime.datetime.now(datetime.timezone.utc).date()
         try:
             # Check if scramble exists
-            self.db_manager.cursor.execute(
-                "SELECT 1 FROM DailyScramble WHERE ScrambleDate = ?", (today,)
-            )
-            if self.db_manager.cursor.fetchone():
+            if await self.db.fetchone("SELECT 1 FROM DailyScramble WHERE ScrambleDate = ?", today):
                 logger.info("Daily scramble for today already exists.")
                 return
 
             logger.info("Generating daily scramble...")
-            puzzle_api_value = "THREE"
             puzzle_display_name = "3x3"
-            
-            url = "https://scrambler-api-apim.azure-api.net/scrambler-api/GetScramble"
-            params = {"puzzle": puzzle_api_value}
 
-            # Use run_in_executor to avoid blocking the event loop with requests
-            loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(None, lambda: requests.get(url=url, params=params))
+            # Scramble and draw locally; the image is stored as base64 PNG like the API's
+            scramble_string = generate_scramble(3)
+            cube = Cube(3)
+            cube.scrambleCube(scramble_string)
+            image_string = base64.b64encode(draw_rubiks_cube(cube).getvalue()).decode("utf-8")
 
-            if response.status_code == 200:
-                response_json = response.json()
-                scramble_string = response_json["scramble"]
-                image_string = response_json["image"]
-                
-                query = "INSERT INTO DailyScramble (ScrambleText, ScrambleDate, PuzzleType, ImageString) VALUES (?, ?, ?, ?)"
-                self.db_manager.cursor.execute(query, (scramble_string, today, puzzle_display_name, image_string))
-                self.db_manager.cursor.commit()
-                logger.info(f"Daily scramble generated: {scramble_string}")
-            else:
-                logger.error(f"Failed to generate daily scramble: {response.status_code} - {response.text}")
+            query = "INSERT INTO DailyScramble (ScrambleText, ScrambleDate, PuzzleType, ImageString) VALUES (?, ?, ?, ?)"
+            await self.db.execute(query, scramble_string, today, puzzle_display_name, image_string)
+            logger.info(f"Daily scramble generated: {scramble_string}")
 
         except Exception as e:
             logger.error(f"Error checking/generating daily scramble: {e}")
@@ -240,4 +315,5 @@ class RubiksBot(commands.Bot):
         """
         Generates a daily scramble for 3x3 at 00:00 UTC.
         """
+        set_query_tag("daily_scramble_task")
         await self.check_and_generate_daily_scramble()
\ No newline at end of file
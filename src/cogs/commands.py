@@ -6,15 +6,26 @@ import base64
 from PIL import Image, ImageEnhance
 import io
 import datetime
+import asyncio
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from bot import RubiksBot
 
 from views.algorithms import AlgorithmsView
+from views.attachment_cache import attachment_urls
+from views.image_cache import case_images
+from views.registry import REGISTRY
+from views.search import ALGORITHM_INDEX
 from views.timer import TimerView
-from azure.storage.blob import BlobServiceClient
 from stats import get_user_pbs, calculate_wca_avg, recalculate_user_pbs
+from database import set_query_tag
+from rubik.cube import Cube
+from rubik.draw import draw_rubiks_cube
+from rubik.render_cache import RenderCache, render_cache
+from rubik.scrambler import PUZZLE_SIZES, generate_scramble
+from rubik import pocket, twophase
+from rubik.recognize import describe, recognize
 import os
 from dotenv import load_dotenv
 import logging
@@ -37,6 +48,14 @@ PUZZLE_CHOICES = [
     app_commands.Choice(name="clock", value="CLOCK"),
 ]
 
+# Seconds /solve waits for the solver; the two-phase search gives up on its own a little sooner
+SOLVE_TIMEOUT = twophase.SOLVE_TIMEOUT + 5
+
+DATABASE_UNAVAILABLE = (
+    "Solve history is temporarily unavailable while the bot reconnects to its database. "
+    "Please try again in a minute."
+)
+
 
 class RubiksCommands(commands.Cog):
     """
@@ -45,43 +64,37 @@ class RubiksCommands(commands.Cog):
 
     def __init__(self, bot: "RubiksBot") -> None:
         self.bot = bot
-        account_url = os.getenv("AZURE_STORAGE_ACCOUNT_URL")
-        access_key = os.getenv("AZURE_STORAGE_ACCESS_KEY")
-        self.container = os.getenv("AZURE_STORAGE_CONTAINER_NAME")
-
-        # Initialize Azure Blob service client for algorithm images
-        if account_url and access_key:
-            self.blob_service_client = BlobServiceClient(
-                account_url=account_url, credential=access_key
-            )
-        else:
-            self.blob_service_client = None
-
         super().__init__()
 
     def _log_command_usage(self, command_name) -> None:
         """
-        Logs the usage of a specific command to the database.
+        Counts the usage of a specific command; the counts are written to the database in batches.
+        Also tags the database queries of the rest of the command (see QueryMetrics).
         """
-        try:
-            self.bot.db_manager.cursor.execute(
-                "INSERT INTO CommandLog(CommandName) VALUES(?)", (command_name,)
-            )
-            self.bot.db_manager.cursor.commit()
-        except Exception as e:
-            logger.error(f"Log usage failed: {e}")
+        self.bot.command_usage.record(command_name)
+        set_query_tag(f"/{command_name}")
 
-    def _get_db_user_id(self, discord_id: int) -> int | None:
+    async def _reject_if_database_down(self, interaction: discord.Interaction) -> bool:
+        """
+        Answers at once with a friendly message while the database circuit breaker is open,
+        instead of letting the command wait on an unreachable database.
+
+        Input: interaction (discord.Interaction) - The command's interaction, not yet responded to.
+        Output: bool - True if the command should stop.
+        """
+        if not self.bot.db.breaker.is_open:
+            return False
+        await interaction.response.send_message(DATABASE_UNAVAILABLE, ephemeral=True)
+        return True
+
+    async def _get_db_user_id(self, discord_id: int) -> int | None:
         """
         Fetches the internal database UserID for a given Discord user ID.
 
         Input: discord_id (int) - The Discord user's ID.
         Output: int | None - The internal UserID, or None if not found.
         """
-        self.bot.db_manager.cursor.execute(
-            "SELECT UserID FROM Users WHERE DiscordID = ?", (discord_id,)
-        )
-        return self.bot.db_manager.cursor.fetchval()
+        return await self.bot.user_ids.lookup(discord_id)
 
     def _process_scramble_image(self, b64_string: str) -> io.BytesIO:
         """
@@ -90,18 +103,31 @@ class RubiksCommands(commands.Cog):
         Input: b64_string (str) - Base64-encoded image data.
         Output: io.BytesIO - A PNG image buffer ready for Discord upload.
         """
-        decoded = base64.b64decode(b64_string)
-        png_buffer = io.BytesIO(decoded)
-        png_buffer.seek(0)
+        def render() -> bytes:
+            decoded = base64.b64decode(b64_string)
+            png_buffer = io.BytesIO(decoded)
+            png_buffer.seek(0)
 
-        with Image.open(png_buffer) as img:
-            resized = img.resize((500, 300))
-            enhanced = ImageEnhance.Contrast(resized).enhance(2)
+            with Image.open(png_buffer) as img:
+                resized = img.resize((500, 300))
+                enhanced = ImageEnhance.Contrast(resized).enhance(2)
 
-            out_buffer = io.BytesIO()
-            enhanced.save(out_buffer, format="PNG")
-            out_buffer.seek(0)
-            return out_buffer
+                out_buffer = io.BytesIO()
+                enhanced.save(out_buffer, format="PNG")
+                return out_buffer.getvalue()
+
+        # The same source image (e.g. the daily scramble) is only processed once
+        key = RenderCache.make_key("scramble_image", 500, 300, 2, b64_string)
+        return render_cache.get_or_render(key, render)
+
+    @staticmethod
+    def _add_last_layer_field(embed: discord.Embed, cube: Cube) -> None:
+        """
+        Names the OLL/PLL case of a 3x3 whose first two layers are solved.
+        """
+        recognition = recognize(cube.state)
+        if recognition is not None:
+            embed.add_field(name="Last Layer", value=describe(recognition), inline=False)
 
     @app_commands.command(name="scramble", description="Generate a Rubik's Cube scramble")
     @app_commands.describe(puzzle="Choose the scramble type")
@@ -132,33 +158,94 @@ class RubiksCommands(commands.Cog):
             # Log command usage
             self._log_command_usage("scramble")
 
-            # Call external Scrambler API
-            url = "https://scrambler-api-apim.azure-api.net/scrambler-api/GetScramble"
-            params = {"puzzle": puzzle}
+            if puzzle in PUZZLE_SIZES:
+                # NxN cubes are scrambled and drawn in-process
+                size = PUZZLE_SIZES[puzzle]
+                scramble_string = generate_scramble(size)
+                cube = Cube(size)
+                cube.scrambleCube(scramble_string)
+                new_png_buffer = draw_rubiks_cube(cube)
+            else:
+                # Call external Scrambler API for the other puzzles
+                url = "https://scrambler-api-apim.azure-api.net/scrambler-api/GetScramble"
+                params = {"puzzle": puzzle}
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status != 200:
-                        await interaction.followup.send("Failed to retrieve scramble. Please try again later.")
-                        logger.error(f"Scrambler API error: {response.status} - {await response.text()}")
-                        return
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(url, params=params) as response:
+                        if response.status != 200:
+                            await interaction.followup.send("Failed to retrieve scramble. Please try again later.")
+                            logger.error(f"Scrambler API error: {response.status} - {await response.text()}")
+                            return
 
-                    response_json = await response.json()
+                        response_json = await response.json()
 
-            scramble_string = response_json["scramble"]
-            svg_string = response_json["image"]
+                scramble_string = response_json["scramble"]
+                svg_string = response_json["image"]
 
-            new_png_buffer = self._process_scramble_image(svg_string)
+                new_png_buffer = self._process_scramble_image(svg_string)
 
             # Create Discord file and embed
             file = discord.File(fp=new_png_buffer, filename="rubiks_cube.png")
             embed = discord.Embed(
                 title=f"Your {puzzle} Scramble", description=scramble_string, color=0x0099FF
             )
+            if puzzle == "THREE":
+                self._add_last_layer_field(embed, cube)
             embed.set_image(url="attachment://rubiks_cube.png")
 
             await interaction.followup.send(embed=embed, file=file)
 
+    @app_commands.command(name="solve", description="Find a solution for a 2x2 or 3x3 scramble")
+    @app_commands.describe(scramble="The scramble to solve, e.g. R U R' U'", puzzle="The puzzle to solve")
+    @app_commands.choices(
+        puzzle=[
+            app_commands.Choice(name="3x3", value="THREE"),
+            app_commands.Choice(name="2x2 (optimal)", value="TWO"),
+        ]
+    )
+    async def solve(self, interaction: discord.Interaction, scramble: str, puzzle: str = "THREE") -> None:
+        """
+        Solves a scramble (optimally for 2x2, with the two-phase solver for 3x3) and shows the solution.
+        """
+        await interaction.response.defer()
+        self._log_command_usage("solve")
+
+        size = PUZZLE_SIZES[puzzle]
+        try:
+            cube = Cube(size)
+            cube.scrambleCube(scramble)
+        except ValueError:
+            await interaction.followup.send("Invalid scramble. Use WCA notation, e.g. `R U R' U'`.")
+            return
+
+        try:
+            # The search is CPU-bound, keep it off the event loop
+            loop = asyncio.get_running_loop()
+            solver = pocket.solve if size == 2 else twophase.solve
+            solution = await asyncio.wait_for(loop.run_in_executor(None, solver, cube), SOLVE_TIMEOUT)
+        except TimeoutError:
+            logger.warning(f"Solve timed out: {scramble}")
+            await interaction.followup.send("This scramble took too long to solve, please try again later.")
+            return
+        except Exception as e:
+            logger.error(f"Solve error: {e}")
+            await interaction.followup.send("Could not find a solution for this scramble.")
+            return
+
+        embed = discord.Embed(title=f"{size}x{size} Solution", color=0x0099FF)
+        embed.add_field(name="Scramble", value=scramble, inline=False)
+        embed.add_field(
+            name=f"Solution ({len(solution.split())} moves)",
+            value=solution or "Already solved!",
+            inline=False,
+        )
+        if size == 3:
+            self._add_last_layer_field(embed, cube)
+        file = discord.File(fp=draw_rubiks_cube(cube), filename="rubiks_cube.png")
+        embed.set_image(url="attachment://rubiks_cube.png")
+
+        await interaction.followup.send(embed=embed, file=file)
+
     @app_commands.command(name="oll", description="View all OLL algorithms")
     @app_commands.choices(
         arg=[
@@ -189,15 +276,14 @@ class RubiksCommands(commands.Cog):
             user_id=interaction.user.id,
             userName=interaction.user.name,
             initial_group=arg,
-            blob_service_client=self.blob_service_client,
-            container=self.container,
         )
 
-        if arg and arg not in algo_view.OLL_GROUPS:
+        if arg and arg not in REGISTRY["oll"].groups:
             await interaction.followup.send(f"Unknown OLL group: {arg}")
             return
 
         algo_view.update_buttons()
+        await algo_view.prepare_image()
         embed, file = algo_view.get_embed()
 
         if file:
@@ -226,15 +312,14 @@ class RubiksCommands(commands.Cog):
             user_id=interaction.user.id,
             userName=interaction.user.name,
             initial_group=arg,
-            blob_service_client=self.blob_service_client,
-            container=self.container,
         )
 
-        if arg and arg not in algo_view.PLL_GROUPS:
+        if arg and arg not in REGISTRY["pll"].groups:
             await interaction.followup.send(f"Unknown PLL group: {arg}")
             return
 
         algo_view.update_buttons()
+        await algo_view.prepare_image()
         embed, file = algo_view.get_embed()
 
         if file:
@@ -242,6 +327,55 @@ class RubiksCommands(commands.Cog):
         else:
             await interaction.followup.send(embed=embed, view=algo_view)
 
+    @app_commands.command(name="alg", description="Look up an OLL or PLL algorithm")
+    @app_commands.describe(query="Case, group, ID or moves, e.g. T Perm, OLL 21, Cross or R U R'")
+    async def alg(self, interaction: discord.Interaction, query: str) -> None:
+        """
+        Shows the algorithm, move counts and case image of the best matching case.
+        """
+        await interaction.response.defer()
+        self._log_command_usage("alg")
+
+        entry = ALGORITHM_INDEX.lookup(query)
+        if entry is None:
+            await interaction.followup.send(f"No algorithm found for **{query}**.")
+            return
+
+        embed = discord.Embed(
+            title=entry.name,
+            color=discord.Color.yellow() if entry.mode == "oll" else discord.Color.green(),
+        )
+        embed.add_field(name="Algorithm", value=entry.algorithm, inline=False)
+        if entry.group:
+            embed.add_field(name="Group", value=entry.group, inline=True)
+        embed.add_field(
+            name="Moves",
+            value=f"{entry.counts.htm} HTM · {entry.counts.qtm} QTM · {entry.counts.stm} STM",
+            inline=True,
+        )
+
+        # Reply without waiting on an upload: an image without a URL yet is attached this time
+        image_url = attachment_urls.get(entry.mode, entry.alg_id)
+        image_stream = None if image_url else case_images.get(entry.mode, entry.alg_id)
+        if image_url is None:
+            attachment_urls.ensure_in_background(entry.mode, entry.alg_id)
+        if image_url:
+            embed.set_image(url=image_url)
+            await interaction.followup.send(embed=embed)
+        elif image_stream is not None:
+            file = discord.File(fp=image_stream, filename=f"{entry.alg_id}.png")
+            embed.set_image(url=f"attachment://{entry.alg_id}.png")
+            await interaction.followup.send(embed=embed, file=file)
+        else:
+            await interaction.followup.send(embed=embed)
+
+    @alg.autocomplete("query")
+    async def alg_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+        """
+        Suggests cases as the user types, shortest algorithms first.
+        """
+        return list(ALGORITHM_INDEX.autocomplete(current))
+
     @app_commands.command(name="stopwatch", description="Time your own solve with an interactive timer")
     @app_commands.describe(arg="Optional: Choose your Puzzle: 3x3, 4x4, etc.")
     @app_commands.choices(arg=PUZZLE_CHOICES)
@@ -265,7 +399,8 @@ class RubiksCommands(commands.Cog):
                 user_id=user_id,
                 userName=user.name,
                 puzzle=puzzle,
-                db_manager=self.bot.db_manager,
+                db=self.bot.db,
+                user_ids=self.bot.user_ids,
             )
             await interaction.followup.send(
                 "Click **Start** to begin timing. Click **Stop** when finished.", view=view
@@ -289,6 +424,8 @@ class RubiksCommands(commands.Cog):
         """
         Fetches the last 15 solves from the database and calculates Ao5/Ao12.
         """
+        if await self._reject_if_database_down(interaction):
+            return
         await interaction.response.defer(thinking=True)
         self._log_command_usage("time")
 
@@ -296,18 +433,16 @@ class RubiksCommands(commands.Cog):
             user_id = interaction.user.id
             user = await self.bot.fetch_user(user_id)
 
-            db_id = self._get_db_user_id(user_id)
+            db_id = await self._get_db_user_id(user_id)
 
             if not db_id:
                 await interaction.followup.send("You haven't recorded any solves yet!")
                 return
 
             # Fetch last 15 solves for the specific puzzle
-            self.bot.db_manager.cursor.execute(
-                "SELECT TOP 15 TimeID, SolveTime, SolveStatus FROM SolveTimes WHERE UserID=? AND PuzzleType=? ORDER BY TimeID DESC",
-                (db_id, puzzle)
+            rows = await self.bot.db.fetchall(
+                self.bot.db.queries.recent_solves, db_id, puzzle,
             )
-            rows = self.bot.db_manager.cursor.fetchall()
             
             if not rows:
                 await interaction.followup.send(f"No solve history found for **{puzzle}**.")
@@ -368,6 +503,8 @@ class RubiksCommands(commands.Cog):
         """
         Fetches the user's personal best single, Ao5, and Ao12 for the specified puzzle.
         """
+        if await self._reject_if_database_down(interaction):
+            return
         await interaction.response.defer(thinking=True)
         self._log_command_usage("personal_bests")
 
@@ -375,13 +512,13 @@ class RubiksCommands(commands.Cog):
             user_id = interaction.user.id
             user = await self.bot.fetch_user(user_id)
 
-            db_id = self._get_db_user_id(user_id)
+            db_id = await self._get_db_user_id(user_id)
 
             if not db_id:
                 await interaction.followup.send("You haven't recorded any solves yet!")
                 return
 
-            pb_data = get_user_pbs(self.bot.db_manager, db_id, puzzle)
+            pb_data = await self.bot.db.run(get_user_pbs, db_id, puzzle)
 
             if pb_data["BestSingle"] is None and pb_data["BestAo5"] is None and pb_data["BestAo12"] is None:
                 await interaction.followup.send(f"No personal bests found for **{puzzle}**.")
@@ -405,6 +542,8 @@ class RubiksCommands(commands.Cog):
         """
         Begin users daily sessions with timer and auto record to DailySolves table
         """
+        if await self._reject_if_database_down(interaction):
+            return
         await interaction.response.defer(ephemeral=True)
         self._log_command_usage("daily")
         # Fetch Daily Scramble
@@ -414,12 +553,11 @@ class RubiksCommands(commands.Cog):
             user_id = interaction.user.id
             user = await self.bot.fetch_user(user_id)
 
-            db_id = self._get_db_user_id(user_id)
+            db_id = await self._get_db_user_id(user_id)
 
-            self.bot.db_manager.cursor.execute(
-                "SELECT SolveTime, SolveStatus FROM DailySolves WHERE UserID=? AND SolveDate=?", (db_id,curr_date)
+            result = await self.bot.db.fetchone(
+                "SELECT SolveTime, SolveStatus FROM DailySolves WHERE UserID=? AND SolveDate=?", db_id, curr_date
             )
-            result = self.bot.db_manager.cursor.fetchone()
             if result:
                 await interaction.followup.send(f"You already did your daily, your time is {result[0]} ({result[1]}). Come back tommorrow please ☺️")
                 return
@@ -428,10 +566,9 @@ class RubiksCommands(commands.Cog):
             await interaction.followup.send("Error getting your User profile")
             return
         try:
-            self.bot.db_manager.cursor.execute(
-                "SELECT ScrambleText, ImageString, PuzzleType FROM DailyScramble WHERE ScrambleDate = ?", (curr_date)
+            response = await self.bot.db.fetchone(
+                "SELECT ScrambleText, ImageString, PuzzleType FROM DailyScramble WHERE ScrambleDate = ?", curr_date
             )
-            response = self.bot.db_manager.cursor.fetchone()
             if not response:
                 await interaction.followup.send("Daily scramble not generated yet. Come back latter")
                 return
@@ -459,7 +596,8 @@ class RubiksCommands(commands.Cog):
                 user_id=user_id,
                 userName=user.name,
                 puzzle=puzzle,
-                db_manager=self.bot.db_manager,
+                db=self.bot.db,
+                user_ids=self.bot.user_ids,
             )
             await interaction.followup.send(
                 "Click **Start** to begin timing. Click **Stop** when finished.", 
@@ -486,7 +624,10 @@ class RubiksCommands(commands.Cog):
         """
         Get daily leaderboard in current server
         """
+        if await self._reject_if_database_down(interaction):
+            return
         await interaction.response.defer(thinking=True)
+        set_query_tag("/leaderboard")
        # Ensure members are loaded
         if not interaction.guild.chunked:
             await interaction.guild.chunk()
@@ -501,8 +642,7 @@ class RubiksCommands(commands.Cog):
         try:
             placeholders = ",".join("?" * len(member_ids))
             query = f"SELECT UserID, UserName FROM Users WHERE DiscordID IN ({placeholders})"
-            self.bot.db_manager.cursor.execute(query, *member_ids)
-            results = self.bot.db_manager.cursor.fetchall()
+            results = await self.bot.db.fetchall(query, *member_ids)
             
             if not results:
                 await interaction.followup.send("No users in this server have registered with the bot.")
@@ -544,8 +684,7 @@ class RubiksCommands(commands.Cog):
             params = list(user_ids)
             params.append(curr_date)
             
-            self.bot.db_manager.cursor.execute(query, *params)
-            results = self.bot.db_manager.cursor.fetchall()
+            results = await self.bot.db.fetchall(query, *params)
 
             if not results:
                 await interaction.followup.send("No daily solves found for today.")
@@ -600,22 +739,21 @@ class RubiksCommands(commands.Cog):
         """
         Deletes a specific solve time from the user's history.
         """
+        if await self._reject_if_database_down(interaction):
+            return
         await interaction.response.defer(thinking=True)
         self._log_command_usage("delete_time")
         
         try:
             user_id = interaction.user.id
-            db_id = self._get_db_user_id(user_id)
+            db_id = await self._get_db_user_id(user_id)
 
             if not db_id:
                 await interaction.followup.send("History not found.")
                 return
 
             # Security check: Ensure the time belongs to the user
-            self.bot.db_manager.cursor.execute(
-                "SELECT UserID FROM SolveTimes WHERE TimeID = ?", (timeid,)
-            )
-            owner_id = self.bot.db_manager.cursor.fetchval()
+            owner_id = await self.bot.db.fetchval("SELECT UserID FROM SolveTimes WHERE TimeID = ?", timeid)
 
             if not owner_id:
                 await interaction.followup.send("Time ID not found.")
@@ -626,10 +764,7 @@ class RubiksCommands(commands.Cog):
                 return
 
             # Perform deletion
-            self.bot.db_manager.cursor.execute(
-                "DELETE FROM SolveTimes WHERE TimeID = ?", (timeid,)
-            )
-            self.bot.db_manager.cursor.commit()
+            await self.bot.db.execute("DELETE FROM SolveTimes WHERE TimeID = ?", timeid)
 
             await interaction.followup.send(f"Successfully deleted record `{timeid}`.")
 
@@ -651,11 +786,13 @@ class RubiksCommands(commands.Cog):
           timeid (str): The ID of the time to adjust (found in /time).
           operation (str): The type of adjustment to make ("plus2" or "dnf").
         """
+        if await self._reject_if_database_down(interaction):
+            return
         await interaction.response.defer(thinking=True)
         self._log_command_usage("adjust_time")
         try:
             user_id = interaction.user.id
-            db_id = self._get_db_user_id(user_id)
+            db_id = await self._get_db_user_id(user_id)
             if not db_id:
                 await interaction.followup.send("History not found.")
                 return
@@ -666,10 +803,9 @@ class RubiksCommands(commands.Cog):
         
         try:
             # Fetch original time and puzzle type
-            self.bot.db_manager.cursor.execute(
-                "SELECT SolveTime, PuzzleType, SolveStatus FROM SolveTimes WHERE TIMEID = ? AND UserID = ?", (timeid, db_id)
+            result = await self.bot.db.fetchone(
+                "SELECT SolveTime, PuzzleType, SolveStatus FROM SolveTimes WHERE TIMEID = ? AND UserID = ?", timeid, db_id
             )
-            result = self.bot.db_manager.cursor.fetchone()
             if not result:
                 await interaction.followup.send("Time not found or inaccessible.")
                 return
@@ -693,13 +829,13 @@ class RubiksCommands(commands.Cog):
                 await interaction.followup.send("Invalid operation.")
                 return
 
-            self.bot.db_manager.cursor.execute(
-                "UPDATE SolveTimes SET SolveTime = ?, SolveStatus = ? WHERE TIMEID = ?", (new_time, status, timeid)
-            )
-            self.bot.db_manager.cursor.commit()
-            
-            # Recalculate PBs after adjustment
-            recalculate_user_pbs(self.bot.db_manager, db_id, puzzle_type)
+            async with self.bot.db.transaction() as tx:
+                await tx.execute(
+                    "UPDATE SolveTimes SET SolveTime = ?, SolveStatus = ? WHERE TIMEID = ?", new_time, status, timeid
+                )
+
+                # Recalculate PBs after adjustment
+                await tx.run(recalculate_user_pbs, db_id, puzzle_type)
 
             msg = f"Successfully adjusted time `{timeid}`: "
             if operation == "plus2":
@@ -727,12 +863,14 @@ class RubiksCommands(commands.Cog):
             color=discord.Color.blue()
         )
         embed.add_field(name="/scramble", value="Generate a scramble for various puzzles", inline=False)
+        embed.add_field(name="/solve", value="Find a solution for a 2x2 or 3x3 scramble", inline=False)
         embed.add_field(name="/stopwatch", value="Interactive timer to record your solves", inline=False)
         embed.add_field(name="/time", value="View your recent times and WCA averages", inline=False)
         embed.add_field(name="/adjust_time", value="Add 2 seconds penalty or flag as DNF")
         embed.add_field(name="/delete_time", value="Remove an incorrect time record", inline=False)
         embed.add_field(name="/personal_bests", value="View your personal bests for the specified puzzle", inline=False)
         embed.add_field(name="/oll / /pll", value="Reference library for CFOP algorithms", inline=False)
+        embed.add_field(name="/alg", value="Look up an OLL or PLL algorithm", inline=False)
         embed.add_field(name="/daily", value="Start your daily section with timer", inline=False)
         embed.add_field(name="/leaderboard", value="Get your server daily leaderboard", inline=False)
 
@@ -1,8 +1,8 @@
 import pyodbc
 import os
 from dotenv import load_dotenv
-import time
 from paths import SRC_DIR
+from database.storage import Queries, Storage
 import logging
 
 logger = logging.getLogger(__name__)
@@ -30,79 +30,52 @@ else:
     driver = "{ODBC Driver 18 for SQL Server}"
     trust = "yes"
 
-class DatabaseManager:
+# T-SQL versions of the dialect-specific statements (see Queries)
+SQLSERVER_QUERIES = Queries(
+    recent_solves=(
+        "SELECT TOP 15 TimeID, SolveTime, SolveStatus FROM SolveTimes WHERE UserID=? AND PuzzleType=? "
+        "ORDER BY TimeID DESC"
+    ),
+    recent_solve_times=(
+        "SELECT TOP 15 SolveTime, SolveStatus FROM SolveTimes WHERE UserID=? AND PuzzleType=? "
+        "ORDER BY SolveAt DESC, TimeID DESC"
+    ),
+    # The no-op update on a match is what makes OUTPUT return existing rows too
+    upsert_user="""
+MERGE Users WITH (HOLDLOCK) AS target
+USING (VALUES (?, ?)) AS source (DiscordID, UserName)
+ON target.DiscordID = source.DiscordID
+WHEN MATCHED THEN
+    UPDATE SET target.UserName = target.UserName
+WHEN NOT MATCHED THEN
+    INSERT (UserName, DiscordID) VALUES (source.UserName, source.DiscordID)
+OUTPUT inserted.UserID;
+""",
+    merge_usage="""
+MERGE CommandTrack WITH (HOLDLOCK) AS target
+USING (VALUES (?, ?, ?)) AS source (CommandName, UsageMonth, UsageCount)
+ON target.CommandName = source.CommandName AND target.UsageMonth = source.UsageMonth
+WHEN MATCHED THEN
+    UPDATE SET UsageCount = target.UsageCount + source.UsageCount
+WHEN NOT MATCHED THEN
+    INSERT (CommandName, UsageMonth, UsageCount)
+    VALUES (source.CommandName, source.UsageMonth, source.UsageCount);
+""",
+)
+
+class DatabaseManager(Storage):
     """
-    Manages connections and operations for the Azure SQL Database.
-    Handles connection lifecycle, reconnection logic, and keep-alive tasks.
+    Storage backend for the Azure SQL Database (SQL Server through ODBC Driver 18).
+    Connects with a single attempt; ConnectionSupervisor retries with backoff.
     """
 
-    def __init__(self) -> None:
-        self.connection = None
-        self.cursor = None
-
-    def connect(self) -> None:
-        """
-        Establishes a connection to the Azure SQL Database.
-        Includes retry logic and checks for existing active connections.
-        """
-        # Check if we already have an active connection
-        if self.connection and self.cursor:
-            try:
-                self.cursor.execute("SELECT 1")
-                return
-            except pyodbc.Error:
-                logger.info("Connection lost, reconnecting...")
-                self.close()
-
-        max_attempts = 3  # Maximum number of reconnection attempts
-        for attempt in range(max_attempts):
-            try:
-                # Construct connection string and connect
-                self.connection = pyodbc.connect(
-                    f"DRIVER={driver};SERVER=tcp:{server};PORT=1433;DATABASE={database};UID={username};PWD={password};Encrypt=yes;TrustServerCertificate={trust};Connection Timeout=60;"
-                )
-                self.cursor = self.connection.cursor()
-                logger.info("DB connected successfully")
-                return
-            except pyodbc.Error as e:
-                logger.warning(f"Connection attempt {attempt + 1} failed: {e}")
-                if attempt < max_attempts - 1:
-                    logger.info("Waiting for 5 seconds before retrying...")
-                    time.sleep(5)
-
-        if self.connection is None:
-            logger.error("Failed to connect to database after multiple attempts.")
-            raise Exception("Unable to connect to the database.")
-
-    def close(self) -> None:
-        """
-        Safely closes the database cursor and connection.
-        """
-        try:
-            if self.cursor:
-                self.cursor.close()
-            if self.connection:
-                self.connection.close()
-            logger.info("DB connection closed")
-        except pyodbc.Error as e:
-            logger.error(f"Error closing database connection: {e}")
-        finally:
-            self.cursor = None
-            self.connection = None
+    name = "sqlserver"
+    queries = SQLSERVER_QUERIES
 
-    def keep_alive(self) -> None:
+    def _open_connection(self) -> pyodbc.Connection:
         """
-        Executes a lightweight query to keep the database connection alive.
-        Prevents Azure SQL from timing out idle connections.
+        Opens a single connection to the Azure SQL Database.
         """
-        if not self.cursor:
-            logger.warning("No active cursor found. Attempting to reconnect.")
-            self.connect()
-        try:
-            self.cursor.execute("SELECT 1")
-            self.cursor.fetchall()
-            logger.debug("Keep-alive query executed successfully.")
-        except pyodbc.Error as e:
-            logger.error(f"Error during keep-alive query: {e}")
-            # Reconnect if the connection was lost
-            self.connect()
\ No newline at end of file
+        return pyodbc.connect(
+            f"DRIVER={driver};SERVER=tcp:{server};PORT=1433;DATABASE={database};UID={username};PWD={password};Encrypt=yes;TrustServerCertificate={trust};Connection Timeout=60;"
+        )
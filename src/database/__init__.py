@@ -1 +1,15 @@
-from .DB_Manager import DatabaseManager
\ No newline at end of file
+from .async_db import AsyncDatabase, Transaction
+from .identity import UserIdentityCache
+from .metrics import QueryMetrics, set_query_tag
+from .storage import Queries, Storage, create_storage
+from .supervisor import CircuitOpenError, ConnectionSupervisor, DatabaseHealth
+from .usage import FLUSH_INTERVAL, CommandUsageBuffer
+
+
+def __getattr__(name: str):
+    # The SQL Server backend needs pyodbc and the ODBC driver, so it is only imported when used
+    if name == "DatabaseManager":
+        from .DB_Manager import DatabaseManager
+
+        return DatabaseManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
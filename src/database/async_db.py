@@ -0,0 +1,275 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable
+
+from database.metrics import InstrumentedCursor, QueryMetrics, query_tag
+from database.supervisor import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+
+class Transaction:
+    """
+    A unit of work on the database, started by AsyncDatabase.transaction().
+
+    Every statement runs on the database thread pool, on a connection and cursor of the
+    transaction's own; the transaction is committed when the async with block exits, or
+    rolled back if it raises.
+    """
+
+    def __init__(self, db: "AsyncDatabase", cursor) -> None:
+        self._db = db
+        self.cursor = cursor
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Runs a blocking function as func(cursor, *args) on the database thread pool.
+        Its statements are recorded under the current query tag and the function's name.
+        """
+        self.cursor.tag = query_tag(func)
+        return await self._db._submit(func, self.cursor, *args)
+
+    async def execute(self, sql: str, *params) -> int:
+        """
+        Executes a statement.
+
+        Returns:
+            int: The number of affected rows.
+        """
+        return await self.run(_execute, sql, params)
+
+    async def fetchone(self, sql: str, *params) -> Any:
+        """
+        Executes a query and returns its first row, or None.
+        """
+        return await self.run(_fetchone, sql, params)
+
+    async def fetchall(self, sql: str, *params) -> list:
+        """
+        Executes a query and returns all of its rows.
+        """
+        return await self.run(_fetchall, sql, params)
+
+    async def fetchval(self, sql: str, *params) -> Any:
+        """
+        Executes a query and returns the first column of its first row, or None.
+        """
+        return await self.run(_fetchval, sql, params)
+
+
+def _execute(cursor, sql: str, params: tuple) -> int:
+    cursor.execute(sql, params)
+    return cursor.rowcount
+
+
+def _fetchone(cursor, sql: str, params: tuple) -> Any:
+    cursor.execute(sql, params)
+    return cursor.fetchone()
+
+
+def _fetchall(cursor, sql: str, params: tuple) -> list:
+    cursor.execute(sql, params)
+    return cursor.fetchall()
+
+
+def _fetchval(cursor, sql: str, params: tuple) -> Any:
+    row = _fetchone(cursor, sql, params)
+    return row[0] if row else None
+
+
+class AsyncDatabase:
+    """
+    Async façade over a storage backend (see Storage) for coroutines.
+
+    Blocking database calls run on a dedicated, bounded thread pool instead of the event
+    loop, so a slow query only delays the command that issued it. Each unit of work checks
+    out its own pooled connection, so up to max_workers of them run at once; stats()
+    reports how many are waiting for a connection. While the circuit breaker is open
+    (see ConnectionSupervisor), every call fails at once with CircuitOpenError.
+    Every statement is timed into metrics (see QueryMetrics).
+    """
+
+    def __init__(self, storage, max_workers: int | None = None) -> None:
+        """
+        Initializes the façade and its thread pool.
+
+        Args:
+            storage (Storage): The backend owning the connection pool.
+            max_workers (int, optional): Size of the database thread pool, by default the
+                maximum size of the connection pool.
+        """
+        self.storage = storage
+        self.max_workers = max_workers or storage.max_size
+        self.breaker = CircuitBreaker()
+        self.metrics = QueryMetrics()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="db")
+        self._slots = asyncio.Semaphore(self.max_workers)
+        self._counter_lock = threading.Lock()
+        self._waiting = 0  # Units of work waiting for a connection
+        self._queued = 0  # Calls submitted to the pool but not yet started
+        self._running = 0
+        self._completed = 0
+
+    @property
+    def queries(self):
+        """
+        The dialect-specific statements of the storage backend (see Queries).
+        """
+        return self.storage.queries
+
+    def stats(self) -> dict:
+        """
+        Returns the pool counters, e.g. for logging.
+        """
+        with self._counter_lock:
+            stats = {
+                "workers": self.max_workers,
+                "waiting": self._waiting,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+            }
+        stats["connections"] = self.storage.stats()
+        return stats
+
+    async def _submit(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Runs a blocking function on the database thread pool, counting it while queued.
+        """
+        with self._counter_lock:
+            self._queued += 1
+
+        def call() -> Any:
+            with self._counter_lock:
+                self._queued -= 1
+                self._running += 1
+            try:
+                return func(*args)
+            finally:
+                with self._counter_lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def call(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Runs a blocking function (e.g. Storage.connect) on the database thread pool.
+        """
+        return await self._submit(func, *args)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Transaction]:
+        """
+        Checks out a connection for a unit of work, committing it on success.
+
+        Usage:
+            async with db.transaction() as tx:
+                await tx.execute("UPDATE ...", value)
+                row = await tx.fetchone("SELECT ...", key)
+
+        Yields:
+            Transaction: Runs statements on the checked-out connection.
+
+        Raises:
+            CircuitOpenError: If the database is known to be unreachable.
+            ConnectionError: If the database is not connected.
+        """
+        self.breaker.check()
+        with self._counter_lock:
+            self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            with self._counter_lock:
+                self._waiting -= 1
+
+        try:
+            try:
+                connection, cursor = await self._submit(self._checkout)
+            except TimeoutError:
+                # Every connection is busy, which says nothing about the database's health
+                raise
+            except Exception as e:
+                self.breaker.record_failure(e)
+                raise
+            self.breaker.record_success()
+            try:
+                yield Transaction(self, cursor)
+            except BaseException:
+                await self._submit(self._finish, connection, cursor, False)
+                raise
+            await self._submit(self._finish, connection, cursor, True)
+        finally:
+            self._slots.release()
+
+    def _checkout(self) -> tuple:
+        connection = self.storage.acquire()
+        try:
+            return connection, InstrumentedCursor(connection.cursor(), self.metrics)
+        except BaseException:
+            self.storage.release(connection, discard=True)
+            raise
+
+    def _finish(self, connection, cursor, commit: bool) -> None:
+        """
+        Commits or rolls back a unit of work and returns its connection to the pool.
+        A connection that fails to do either is discarded.
+        """
+        discard = False
+        try:
+            cursor.close()
+            if commit:
+                connection.commit()
+            else:
+                connection.rollback()
+        except Exception as e:
+            discard = True
+            if commit:
+                raise
+            logger.error(f"Rollback failed: {e}")
+        finally:
+            self.storage.release(connection, discard)
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Runs func(cursor, *args) on the database thread pool as one transaction.
+        """
+        async with self.transaction() as tx:
+            return await tx.run(func, *args)
+
+    async def execute(self, sql: str, *params) -> int:
+        """
+        Executes and commits a single statement.
+
+        Returns:
+            int: The number of affected rows.
+        """
+        return await self.run(_execute, sql, params)
+
+    async def fetchone(self, sql: str, *params) -> Any:
+        """
+        Executes a query and returns its first row, or None.
+        """
+        return await self.run(_fetchone, sql, params)
+
+    async def fetchall(self, sql: str, *params) -> list:
+        """
+        Executes a query and returns all of its rows.
+        """
+        return await self.run(_fetchall, sql, params)
+
+    async def fetchval(self, sql: str, *params) -> Any:
+        """
+        Executes a query and returns the first column of its first row, or None.
+        """
+        return await self.run(_fetchval, sql, params)
+
+    def close(self) -> None:
+        """
+        Shuts the thread pool down; calls already queued still run.
+        """
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,113 @@
+import logging
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 10_000
+DEFAULT_TTL = 6 * 60 * 60
+
+SELECT_USER_ID = "SELECT UserID FROM Users WHERE DiscordID = ?"
+
+
+class UserIdentityCache:
+    """
+    Process-wide map from Discord user ID to internal UserID.
+
+    A UserID never changes once created, so lookups are served from memory after the
+    first one; entries still expire after a TTL (e.g. if a user row is deleted by hand)
+    and the least recently used are evicted beyond max_size. Only existing users are
+    cached, so a user created later is found on their next lookup.
+    """
+
+    def __init__(self, db, max_size: int = DEFAULT_MAX_SIZE, ttl: float = DEFAULT_TTL) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+            db (AsyncDatabase): The database queried on a miss.
+            max_size (int): Maximum number of cached users.
+            ttl (float): Seconds an entry stays valid.
+        """
+        self.db = db
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[int, tuple[int, float]] = OrderedDict()  # UserID and expiry
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, discord_id: int) -> int | None:
+        """
+        Returns the cached UserID of a Discord user, without querying the database.
+        """
+        entry = self._entries.get(discord_id)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._entries[discord_id]
+            return None
+        self._entries.move_to_end(discord_id)
+        return entry[0]
+
+    def put(self, discord_id: int, user_id: int) -> None:
+        """
+        Caches the UserID of a Discord user.
+        """
+        self._entries[discord_id] = (user_id, time.monotonic() + self.ttl)
+        self._entries.move_to_end(discord_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, discord_id: int) -> None:
+        """
+        Forgets a Discord user, e.g. after deleting their row.
+        """
+        self._entries.pop(discord_id, None)
+
+    def _hit(self, discord_id: int) -> int | None:
+        user_id = self.get(discord_id)
+        if user_id is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return user_id
+
+    async def lookup(self, discord_id: int) -> int | None:
+        """
+        Fetches the UserID of a Discord user.
+
+        Args:
+            discord_id (int): The Discord user's ID.
+
+        Returns:
+            int | None: The internal UserID, or None if the user has no record yet.
+        """
+        user_id = self._hit(discord_id)
+        if user_id is None:
+            user_id = await self.db.fetchval(SELECT_USER_ID, discord_id)
+            if user_id is not None:
+                self.put(discord_id, user_id)
+        return user_id
+
+    async def get_or_create(self, discord_id: int, user_name: str) -> int:
+        """
+        Fetches the UserID of a Discord user, creating their record in the same statement.
+
+        Args:
+            discord_id (int): The Discord user's ID.
+            user_name (str): The name stored for a new user.
+
+        Returns:
+            int: The internal UserID.
+        """
+        user_id = self._hit(discord_id)
+        if user_id is None:
+            user_id = await self.db.fetchval(self.db.queries.upsert_user, discord_id, user_name)
+            self.put(discord_id, user_id)
+        return user_id
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters, e.g. for logging.
+        """
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,238 @@
+import bisect
+import contextvars
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, NamedTuple
+
+from dotenv import load_dotenv
+
+from paths import SRC_DIR
+
+logger = logging.getLogger(__name__)
+
+load_dotenv(SRC_DIR / ".env")
+
+# Statements slower than this many milliseconds are logged with their normalized SQL
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", 500))
+
+# Upper bounds of the latency histogram buckets, in milliseconds; the last bucket is open
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# What issued the current task's queries, e.g. "/time" or "confirm_callback"
+_query_tag: contextvars.ContextVar[str] = contextvars.ContextVar("query_tag", default="untagged")
+
+_STRING_LITERAL = re.compile(r"N?'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def set_query_tag(tag: str) -> None:
+    """
+    Tags the database queries of the rest of the current task, e.g. a command's interaction.
+    """
+    _query_tag.set(tag)
+
+
+def query_tag(func=None) -> str:
+    """
+    Returns the tag of a unit of work: the current task's tag, followed by the name of
+    the function run on the cursor (e.g. "/adjust_time > recalculate_user_pbs") unless
+    it is an anonymous one.
+    """
+    tag = _query_tag.get()
+    name = getattr(func, "__name__", "<lambda>")
+    if func is None or name.startswith("<") or getattr(func, "__module__", None) == "database.async_db":
+        return tag
+    return name if tag == "untagged" else f"{tag} > {name}"
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Reduces a statement to its shape, so executions with different literals or
+    placeholder counts (e.g. "IN (?, ?, ?)") are counted together.
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(?...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class StatementSummary(NamedTuple):
+    """
+    Counters of one normalized statement issued under one tag.
+    """
+
+    tag: str
+    sql: str
+    calls: int
+    errors: int
+    rows: int
+    total_ms: float
+    max_ms: float
+    # Bucket upper bounds (LATENCY_BUCKETS_MS) that 50% and 95% of the calls finished within
+    p50_ms: float
+    p95_ms: float
+
+
+class _StatementStats:
+    __slots__ = ("calls", "errors", "rows", "total_ms", "max_ms", "buckets")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def percentile(self, fraction: float) -> float:
+        threshold = fraction * self.calls
+        seen = 0
+        for bound, count in zip((*LATENCY_BUCKETS_MS, float("inf")), self.buckets):
+            seen += count
+            if seen >= threshold:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+
+class QueryMetrics:
+    """
+    Latency histograms and rows-returned counters per tag and normalized statement,
+    recorded by the cursors of AsyncDatabase from its worker threads.
+    """
+
+    def __init__(self, slow_query_ms: float = SLOW_QUERY_MS) -> None:
+        """
+        Args:
+            slow_query_ms (float): Statements slower than this are logged as slow queries.
+        """
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self._stats: dict[tuple[str, str], _StatementStats] = {}
+
+    def record(self, tag: str, sql: str, elapsed_ms: float, rows: int, failed: bool = False) -> None:
+        """
+        Counts one execution of a statement, timed inside execute() and its fetches.
+        """
+        key = (tag, normalize_sql(sql))
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _StatementStats()
+            stats.calls += 1
+            stats.errors += failed
+            stats.rows += rows
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        if elapsed_ms >= self.slow_query_ms:
+            logger.warning(f"Slow query ({elapsed_ms:.0f} ms, {rows} rows, {tag}): {key[1]}")
+
+    def summary(self) -> list[StatementSummary]:
+        """
+        Returns the counters of every statement, by total time spent, slowest first.
+        """
+        with self._lock:
+            summaries = [
+                StatementSummary(
+                    tag, sql, stats.calls, stats.errors, stats.rows, stats.total_ms, stats.max_ms,
+                    stats.percentile(0.5), stats.percentile(0.95),
+                )
+                for (tag, sql), stats in self._stats.items()
+            ]
+        return sorted(summaries, key=lambda summary: summary.total_ms, reverse=True)
+
+    def report(self, limit: int = 5) -> str:
+        """
+        Formats the statements with the most total time, e.g. for logging.
+        """
+        lines = [
+            f"{s.total_ms:.0f} ms in {s.calls} calls (p50 {s.p50_ms:g} ms, p95 {s.p95_ms:g} ms, max {s.max_ms:.0f} ms, "
+            f"{s.rows} rows, {s.errors} errors) {s.tag}: {s.sql}"
+            for s in self.summary()[:limit]
+        ]
+        return "\n".join(lines) if lines else "No queries recorded"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+class InstrumentedCursor:
+    """
+    Wraps a DB-API cursor, timing each statement's execute() and fetch calls and
+    counting the rows fetched; other attributes are passed through to the cursor.
+
+    Only the time spent inside the driver counts, not the time between calls (e.g. a
+    coroutine awaiting something else while its transaction stays open). A statement
+    is recorded once the next one is executed or the cursor is closed, so that all of
+    its fetches are counted.
+    """
+
+    def __init__(self, cursor, metrics: QueryMetrics, tag: str = "untagged") -> None:
+        self._cursor = cursor
+        self._metrics = metrics
+        self.tag = tag
+        self._pending: list[Any] | None = None  # tag, SQL, milliseconds and rows of the last statement
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def _finish(self) -> None:
+        if self._pending is not None:
+            tag, sql, elapsed_ms, rows = self._pending
+            self._pending = None
+            self._metrics.record(tag, sql, elapsed_ms, rows)
+
+    def _run(self, method, sql: str, params) -> Any:
+        self._finish()
+        started = time.perf_counter()
+        try:
+            result = method(sql, params)
+        except Exception:
+            self._metrics.record(self.tag, sql, (time.perf_counter() - started) * 1000, 0, failed=True)
+            raise
+        self._pending = [self.tag, sql, (time.perf_counter() - started) * 1000, 0]
+        return result
+
+    def execute(self, sql: str, params=()) -> Any:
+        self._run(self._cursor.execute, sql, params)
+        return self
+
+    def executemany(self, sql: str, params) -> Any:
+        self._run(self._cursor.executemany, sql, params)
+        return self
+
+    def _fetch(self, method, *args) -> Any:
+        started = time.perf_counter()
+        result = method(*args)
+        if self._pending is not None:
+            self._pending[2] += (time.perf_counter() - started) * 1000
+        return result
+
+    def _count(self, rows: int) -> None:
+        if self._pending is not None:
+            self._pending[3] += rows
+
+    def fetchone(self) -> Any:
+        row = self._fetch(self._cursor.fetchone)
+        self._count(row is not None)
+        return row
+
+    def fetchall(self) -> list:
+        rows = self._fetch(self._cursor.fetchall)
+        self._count(len(rows))
+        return rows
+
+    def fetchmany(self, size: int = 1) -> list:
+        rows = self._fetch(self._cursor.fetchmany, size)
+        self._count(len(rows))
+        return rows
+
+    def close(self) -> None:
+        self._finish()
+        self._cursor.close()
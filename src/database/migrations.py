@@ -0,0 +1,197 @@
+import argparse
+import asyncio
+import logging
+from typing import NamedTuple
+
+from database.storage import Cursor
+
+logger = logging.getLogger(__name__)
+
+
+class Migration(NamedTuple):
+    """
+    A versioned schema change, with the statements of each SQL dialect (see Storage.name).
+    Statements are written to be safe to re-run, in case a DDL statement committed on its own.
+    """
+
+    version: int
+    description: str
+    statements: dict[str, tuple[str, ...]]
+
+
+# The applied migrations, one row per version
+SCHEMA_VERSION_TABLE = {
+    "sqlserver": """
+IF OBJECT_ID('SchemaVersion', 'U') IS NULL
+CREATE TABLE SchemaVersion(
+    Version INT PRIMARY KEY,
+    Description NVARCHAR(255) NOT NULL,
+    AppliedAt DATETIME NOT NULL DEFAULT GETDATE()
+)
+""",
+    "sqlite": """
+CREATE TABLE IF NOT EXISTS SchemaVersion (
+    Version INTEGER PRIMARY KEY,
+    Description TEXT NOT NULL,
+    AppliedAt TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+)
+""",
+}
+
+# Duplicate UserStats rows keep the best of each personal best in the row with the lowest StatID
+MERGE_DUPLICATE_USER_STATS = (
+    """
+UPDATE UserStats SET
+    BestSingle = (SELECT MIN(s.BestSingle) FROM UserStats s WHERE s.UserID = UserStats.UserID AND s.PuzzleType = UserStats.PuzzleType),
+    BestAo5 = (SELECT MIN(s.BestAo5) FROM UserStats s WHERE s.UserID = UserStats.UserID AND s.PuzzleType = UserStats.PuzzleType),
+    BestAo12 = (SELECT MIN(s.BestAo12) FROM UserStats s WHERE s.UserID = UserStats.UserID AND s.PuzzleType = UserStats.PuzzleType)
+WHERE EXISTS (
+    SELECT 1 FROM UserStats s
+    WHERE s.UserID = UserStats.UserID AND s.PuzzleType = UserStats.PuzzleType AND s.StatID <> UserStats.StatID
+)
+""",
+    "DELETE FROM UserStats WHERE StatID NOT IN (SELECT MIN(StatID) FROM UserStats GROUP BY UserID, PuzzleType)",
+)
+
+
+def _sqlserver_index(name: str, definition: str) -> str:
+    return f"IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = '{name}')\nCREATE {definition}"
+
+
+MIGRATIONS = (
+    Migration(
+        1,
+        "Covering indexes for the solve, daily and user lookups; one UserStats row per puzzle",
+        {
+            # Nonclustered indexes carry the clustered key (TimeID, UserID), so INCLUDE only
+            # lists the other selected columns
+            "sqlserver": (
+                # Recent solves for averages, PB recalculation and the 15-solve trigger
+                _sqlserver_index(
+                    "IX_SolveTimes_User_Puzzle_SolveAt",
+                    "INDEX IX_SolveTimes_User_Puzzle_SolveAt ON SolveTimes (UserID, PuzzleType, SolveAt DESC, TimeID DESC) "
+                    "INCLUDE (SolveTime, SolveStatus)",
+                ),
+                # /time history, newest TimeID first
+                _sqlserver_index(
+                    "IX_SolveTimes_User_Puzzle_TimeID",
+                    "INDEX IX_SolveTimes_User_Puzzle_TimeID ON SolveTimes (UserID, PuzzleType, TimeID DESC) "
+                    "INCLUDE (SolveTime, SolveStatus)",
+                ),
+                # Daily solve of a user and the daily leaderboard
+                _sqlserver_index(
+                    "IX_DailySolves_User_Date",
+                    "INDEX IX_DailySolves_User_Date ON DailySolves (UserID, SolveDate) INCLUDE (SolveTime, SolveStatus)",
+                ),
+                # DiscordID IN (...) lookups of the leaderboard, which also read the name
+                _sqlserver_index(
+                    "IX_Users_DiscordID",
+                    "UNIQUE INDEX IX_Users_DiscordID ON Users (DiscordID) INCLUDE (UserName)",
+                ),
+                *MERGE_DUPLICATE_USER_STATS,
+                _sqlserver_index(
+                    "UX_UserStats_User_Puzzle",
+                    "UNIQUE INDEX UX_UserStats_User_Puzzle ON UserStats (UserID, PuzzleType) "
+                    "INCLUDE (BestSingle, BestAo5, BestAo12)",
+                ),
+            ),
+            # SQLite has no INCLUDE; the covered columns go at the end of the key instead.
+            # Users.DiscordID lookups already seek the index of its UNIQUE constraint.
+            "sqlite": (
+                "CREATE INDEX IF NOT EXISTS IX_SolveTimes_User_Puzzle_SolveAt "
+                "ON SolveTimes (UserID, PuzzleType, SolveAt DESC, TimeID DESC, SolveTime, SolveStatus)",
+                "CREATE INDEX IF NOT EXISTS IX_SolveTimes_User_Puzzle_TimeID "
+                "ON SolveTimes (UserID, PuzzleType, TimeID DESC, SolveTime, SolveStatus)",
+                "CREATE INDEX IF NOT EXISTS IX_DailySolves_User_Date "
+                "ON DailySolves (UserID, SolveDate, SolveTime, SolveStatus)",
+                *MERGE_DUPLICATE_USER_STATS,
+                "CREATE UNIQUE INDEX IF NOT EXISTS UX_UserStats_User_Puzzle ON UserStats (UserID, PuzzleType)",
+            ),
+        },
+    ),
+)
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def schema_version(cursor: Cursor, dialect: str) -> int:
+    """
+    Returns the version of the database schema, creating the SchemaVersion table if needed.
+
+    Args:
+        cursor (Cursor): Cursor of a transaction (see AsyncDatabase.run).
+        dialect (str): Name of the storage backend, e.g. "sqlserver".
+
+    Returns:
+        int: The latest applied migration, or 0 for the schema of sql_tables/.
+    """
+    cursor.execute(SCHEMA_VERSION_TABLE[dialect])
+    cursor.execute("SELECT MAX(Version) FROM SchemaVersion")
+    row = cursor.fetchone()
+    return row[0] if row and row[0] is not None else 0
+
+
+def apply_migration(cursor: Cursor, dialect: str, migration: Migration) -> None:
+    """
+    Runs the statements of a migration and records its version, in one transaction.
+    """
+    for statement in migration.statements[dialect]:
+        cursor.execute(statement)
+    cursor.execute(
+        "INSERT INTO SchemaVersion (Version, Description) VALUES (?, ?)",
+        (migration.version, migration.description),
+    )
+
+
+async def migrate(db, target: int | None = None) -> list[int]:
+    """
+    Brings the database schema up to date, one transaction per migration.
+
+    Args:
+        db (AsyncDatabase): The database to migrate.
+        target (int, optional): Stop at this version instead of the latest one.
+
+    Returns:
+        list[int]: The versions applied, oldest first.
+    """
+    dialect = db.storage.name
+    version = await db.run(schema_version, dialect)
+    target = LATEST_VERSION if target is None else target
+    applied = []
+    for migration in MIGRATIONS:
+        if version < migration.version <= target:
+            logger.info(f"Applying migration {migration.version}: {migration.description}")
+            await db.run(apply_migration, dialect, migration)
+            applied.append(migration.version)
+    if applied:
+        logger.info(f"Database schema migrated from version {version} to {applied[-1]}")
+    else:
+        logger.info(f"Database schema is up to date (version {version})")
+    return applied
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from database.async_db import AsyncDatabase
+    from database.storage import create_storage
+
+    storage = create_storage(args.backend)
+    db = AsyncDatabase(storage)
+    try:
+        await db.call(storage.connect)
+        if args.status:
+            version = await db.run(schema_version, storage.name)
+            print(f"{storage.name} schema version {version} (latest {LATEST_VERSION})")
+        else:
+            await migrate(db, args.target)
+    finally:
+        await db.call(storage.close)
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format="%(asctime)s %(levelname)s:%(name)s: %(message)s", level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Applies the pending database schema migrations.")
+    parser.add_argument("--backend", help="sqlserver or sqlite, instead of DB_BACKEND")
+    parser.add_argument("--target", type=int, help="migrate up to this version only")
+    parser.add_argument("--status", action="store_true", help="print the schema version and exit")
+    asyncio.run(_main(parser.parse_args()))
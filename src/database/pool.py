@@ -0,0 +1,214 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_SIZE = 1
+DEFAULT_MAX_SIZE = 5
+DEFAULT_VALIDATION_QUERY = "SELECT 1"
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of database connections, sized between min_size and max_size.
+
+    Connections are validated when checked out, so one dropped by the server (e.g. Azure
+    SQL closing an idle session) is replaced transparently instead of failing a command.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        min_size: int = DEFAULT_MIN_SIZE,
+        max_size: int = DEFAULT_MAX_SIZE,
+        validation_query: str = DEFAULT_VALIDATION_QUERY,
+    ) -> None:
+        """
+        Initializes an empty pool (see open()).
+
+        Args:
+            connect (Callable[[], Connection]): Opens a new DB-API connection.
+            min_size (int): Connections kept open even when idle.
+            max_size (int): Maximum number of open connections.
+            validation_query (str): Cheap query run on a connection before handing it out.
+
+        Raises:
+            ValueError: If the sizes are inconsistent.
+        """
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError(f"Invalid pool size: min {min_size}, max {max_size}")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.validation_query = validation_query
+        self._idle: deque[tuple[Any, float]] = deque()  # Connection and when it was returned
+        self._size = 0  # Open connections, idle or checked out
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def open(self) -> None:
+        """
+        Opens min_size connections up front.
+
+        Raises:
+            Exception: Whatever connect() raises if the database is unreachable.
+        """
+        with self._condition:
+            self._closed = False
+        while True:
+            with self._condition:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                connection = self._connect()
+            except BaseException:
+                with self._condition:
+                    self._size -= 1
+                raise
+            self.release(connection)
+
+    def _validate(self, connection) -> bool:
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(self.validation_query)
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception as e:
+            logger.info(f"Discarding a broken pooled connection: {e}")
+            return False
+
+    def _discard(self, connection) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def acquire(self, timeout: float | None = None):
+        """
+        Checks out a validated connection, opening one if none is idle and the pool has room.
+
+        Args:
+            timeout (float | None): Seconds to wait for a connection when the pool is full.
+
+        Returns:
+            Connection: A connection for the caller's exclusive use until release().
+
+        Raises:
+            ConnectionError: If the pool is closed.
+            TimeoutError: If no connection became available in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise ConnectionError("The connection pool is closed")
+                    if self._idle:
+                        connection, _ = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        connection = None
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("Timed out waiting for a database connection")
+                    self._condition.wait(remaining)
+
+            if connection is None:
+                try:
+                    return self._connect()
+                except BaseException:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+            if self._validate(connection):
+                return connection
+            self._discard(connection)
+
+    def release(self, connection, discard: bool = False) -> None:
+        """
+        Returns a checked-out connection to the pool.
+
+        Args:
+            connection (Connection): The connection from acquire().
+            discard (bool): Close the connection instead, e.g. after a connection error.
+        """
+        if discard or self._closed:
+            self._discard(connection)
+            return
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self, timeout: float | None = None) -> Iterator[Any]:
+        """
+        Checks out a connection for the duration of a with block, rolling back on error.
+        """
+        connection = self.acquire(timeout)
+        discard = False
+        try:
+            yield connection
+        except BaseException:
+            # A connection that cannot even roll back is not reused
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+            raise
+        finally:
+            self.release(connection, discard)
+
+    def prune(self, max_idle: float) -> int:
+        """
+        Closes connections idle for longer than max_idle seconds, down to min_size.
+
+        Returns:
+            int: The number of connections closed.
+        """
+        now = time.monotonic()
+        stale = []
+        with self._condition:
+            # The least recently returned connections are at the left
+            while self._idle and self._size - len(stale) > self.min_size and now - self._idle[0][1] > max_idle:
+                stale.append(self._idle.popleft()[0])
+        for connection in stale:
+            self._discard(connection)
+        return len(stale)
+
+    def close(self) -> None:
+        """
+        Closes every idle connection; connections still checked out close when released.
+        """
+        with self._condition:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._condition.notify_all()
+        for connection in idle:
+            self._discard(connection)
+
+    def stats(self) -> dict:
+        """
+        Returns the pool counters, e.g. for logging.
+        """
+        with self._condition:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "max_size": self.max_size,
+            }
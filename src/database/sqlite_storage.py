@@ -0,0 +1,166 @@
+import datetime
+import logging
+import os
+import sqlite3
+
+from database.storage import Queries, Storage, pool_max_size, pool_min_size
+from paths import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+# The database file, e.g. for a small self-hosted deployment or offline tests
+SQLITE_PATH = os.getenv("SQLITE_PATH", str(DATA_DIR / "cubecrafter.db"))
+# How long a writer waits for another connection's write lock, in milliseconds
+BUSY_TIMEOUT = 5000
+
+# Dates are stored as ISO text, which sorts and compares like the dates themselves
+sqlite3.register_adapter(datetime.date, datetime.date.isoformat)
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(" "))
+
+# SQLite versions of the dialect-specific statements (see Queries)
+SQLITE_QUERIES = Queries(
+    recent_solves=(
+        "SELECT TimeID, SolveTime, SolveStatus FROM SolveTimes WHERE UserID=? AND PuzzleType=? "
+        "ORDER BY TimeID DESC LIMIT 15"
+    ),
+    recent_solve_times=(
+        "SELECT SolveTime, SolveStatus FROM SolveTimes WHERE UserID=? AND PuzzleType=? "
+        "ORDER BY SolveAt DESC, TimeID DESC LIMIT 15"
+    ),
+    # The no-op update on a conflict is what makes RETURNING return existing rows too
+    upsert_user="""
+INSERT INTO Users (DiscordID, UserName) VALUES (?, ?)
+ON CONFLICT (DiscordID) DO UPDATE SET UserName = Users.UserName
+RETURNING UserID;
+""",
+    merge_usage="""
+INSERT INTO CommandTrack (CommandName, UsageMonth, UsageCount) VALUES (?, ?, ?)
+ON CONFLICT (CommandName, UsageMonth) DO UPDATE SET UsageCount = UsageCount + excluded.UsageCount;
+""",
+)
+
+# The tables of sql_tables/ and the trigger of sql_trigger/trg_AutoDeleteOldSolveTimes.sql
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS Users (
+    UserID INTEGER PRIMARY KEY AUTOINCREMENT,
+    DiscordID INTEGER NOT NULL UNIQUE,
+    UserName TEXT NOT NULL,
+    JoinDate TEXT NOT NULL DEFAULT (date('now'))
+);
+
+CREATE TABLE IF NOT EXISTS SolveTimes (
+    TimeID INTEGER PRIMARY KEY AUTOINCREMENT,
+    UserID INTEGER REFERENCES Users (UserID),
+    SolveTime REAL NOT NULL,
+    PuzzleType TEXT NOT NULL,
+    SolveStatus TEXT NOT NULL DEFAULT 'Completed',
+    SolveAt TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS UserStats (
+    StatID INTEGER PRIMARY KEY AUTOINCREMENT,
+    UserID INTEGER NOT NULL REFERENCES Users (UserID),
+    PuzzleType TEXT NOT NULL,
+    BestSingle REAL,
+    BestAo5 REAL,
+    BestAo12 REAL
+);
+
+CREATE TABLE IF NOT EXISTS DailySolves (
+    SolveID INTEGER PRIMARY KEY AUTOINCREMENT,
+    UserID INTEGER REFERENCES Users (UserID),
+    SolveTime REAL NOT NULL,
+    SolveDate TEXT NOT NULL DEFAULT (date('now')),
+    SolveStatus TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS DailyScramble (
+    ScrambleID INTEGER PRIMARY KEY AUTOINCREMENT,
+    ScrambleText TEXT NOT NULL,
+    ScrambleDate TEXT NOT NULL,
+    PuzzleType TEXT NOT NULL,
+    ImageString TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS CommandLog (
+    LogID INTEGER PRIMARY KEY AUTOINCREMENT,
+    CommandName TEXT NOT NULL,
+    UserTime TEXT NOT NULL DEFAULT (date('now'))
+);
+
+CREATE TABLE IF NOT EXISTS CommandTrack (
+    CommandName TEXT NOT NULL,
+    UsageMonth TEXT NOT NULL,
+    UsageCount INTEGER NOT NULL,
+    PRIMARY KEY (CommandName, UsageMonth)
+);
+
+CREATE TABLE IF NOT EXISTS DuelMatches (
+    MatchID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Player1ID INTEGER REFERENCES Users (UserID),
+    Player2ID INTEGER REFERENCES Users (UserID),
+    WinnerID INTEGER REFERENCES Users (UserID),
+    PuzzleType TEXT NOT NULL,
+    MatchDate TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+);
+
+-- Keep the 15 latest solves of every user and puzzle
+CREATE TRIGGER IF NOT EXISTS trg_AutoDeleteOldSolveTimes
+AFTER INSERT ON SolveTimes
+BEGIN
+    DELETE FROM SolveTimes
+    WHERE UserID = NEW.UserID AND PuzzleType = NEW.PuzzleType AND TimeID NOT IN (
+        SELECT TimeID FROM SolveTimes
+        WHERE UserID = NEW.UserID AND PuzzleType = NEW.PuzzleType
+        ORDER BY SolveAt DESC, TimeID DESC
+        LIMIT 15
+    );
+END;
+"""
+
+
+class SqliteStorage(Storage):
+    """
+    Embedded storage backend: a SQLite database file in WAL mode.
+
+    WAL lets readers run alongside the single writer, so the pool still serves concurrent
+    commands; every query is local file I/O instead of a network round trip.
+    """
+
+    name = "sqlite"
+    queries = SQLITE_QUERIES
+
+    def __init__(self, path: str = SQLITE_PATH, min_size: int = pool_min_size, max_size: int = pool_max_size) -> None:
+        """
+        Args:
+            path (str): The database file, created with the schema if missing.
+            min_size (int): Connections kept open even when idle.
+            max_size (int): Maximum number of open connections.
+        """
+        super().__init__(min_size, max_size)
+        self.path = str(path)
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """
+        Opens a connection in WAL mode; pooled connections move between worker threads.
+        """
+        connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT / 1000, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # Durable at every checkpoint rather than every commit, the usual WAL trade-off
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        connection.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT}")
+        return connection
+
+    def connect(self) -> None:
+        """
+        Creates the database file and schema if needed, then opens the connection pool.
+        """
+        if self.pool is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = self._open_connection()
+            try:
+                connection.executescript(SCHEMA)
+            finally:
+                connection.close()
+        super().connect()
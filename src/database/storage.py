@@ -0,0 +1,184 @@
+import abc
+import logging
+import os
+from typing import Any, NamedTuple
+
+from dotenv import load_dotenv
+
+from database.pool import DEFAULT_MAX_SIZE, DEFAULT_MIN_SIZE, ConnectionPool
+from paths import SRC_DIR
+
+logger = logging.getLogger(__name__)
+
+# DB_BACKEND and the pool sizes are read from the same .env as the database credentials
+load_dotenv(SRC_DIR / ".env")
+
+# A DB-API 2.0 cursor of whichever backend is in use (pyodbc or sqlite3)
+Cursor = Any
+
+BACKENDS = ("sqlserver", "sqlite")
+
+# Size of the connection pool, and how long a command waits for a connection when all are busy
+pool_min_size = int(os.getenv("DB_POOL_MIN_SIZE", DEFAULT_MIN_SIZE))
+pool_max_size = int(os.getenv("DB_POOL_MAX_SIZE", DEFAULT_MAX_SIZE))
+CHECKOUT_TIMEOUT = 30
+# Idle connections above the minimum are closed after this many seconds
+MAX_IDLE = 10 * 60
+
+
+class Queries(NamedTuple):
+    """
+    The statements whose syntax differs between SQL dialects.
+    Portable statements are written inline where they are used.
+    """
+
+    # TimeID, SolveTime, SolveStatus of a user's 15 latest solves of a puzzle (UserID, PuzzleType)
+    recent_solves: str
+    # SolveTime, SolveStatus of the same solves, newest first by SolveAt (UserID, PuzzleType)
+    recent_solve_times: str
+    # Returns the UserID of a user, creating the row if needed (DiscordID, UserName)
+    upsert_user: str
+    # Adds to a command's monthly usage count (CommandName, UsageMonth, UsageCount)
+    merge_usage: str
+
+
+class Storage(abc.ABC):
+    """
+    Base class of the storage backends AsyncDatabase runs on.
+
+    A backend is a pool of DB-API connections (see ConnectionPool) plus the queries of its
+    SQL dialect; subclasses set queries (usually as a class attribute) and say how to open
+    a connection, or fail to instantiate.
+    """
+
+    name = ""
+
+    @property
+    @abc.abstractmethod
+    def queries(self) -> Queries:
+        """
+        The statements of the backend's SQL dialect.
+        """
+
+    def __init__(self, min_size: int = pool_min_size, max_size: int = pool_max_size) -> None:
+        """
+        Args:
+            min_size (int): Connections kept open even when idle.
+            max_size (int): Maximum number of open connections (and concurrent queries).
+        """
+        self.min_size = min_size
+        self.max_size = max_size
+        self.pool = None
+
+    @abc.abstractmethod
+    def _open_connection(self):
+        """
+        Opens a single connection to the database.
+        """
+
+    def connect(self) -> None:
+        """
+        Opens the connection pool, keeping an already open one.
+        """
+        if self.pool is not None:
+            return
+        pool = ConnectionPool(self._open_connection, self.min_size, self.max_size)
+        try:
+            pool.open()
+        except BaseException:
+            pool.close()
+            raise
+        self.pool = pool
+        logger.info(f"DB connected successfully ({self.name}, pool of {self.min_size}-{self.max_size} connections)")
+
+    def ping(self) -> None:
+        """
+        Opens the pool if needed and checks out one validated connection, which fails if
+        the database is unreachable.
+        """
+        self.connect()
+        self.release(self.acquire())
+
+    def acquire(self):
+        """
+        Checks out a validated connection from the pool; return it with release().
+
+        Raises:
+            ConnectionError: If the pool is not open.
+            TimeoutError: If every connection stayed busy for CHECKOUT_TIMEOUT seconds.
+        """
+        if self.pool is None:
+            raise ConnectionError("Not connected to the database")
+        return self.pool.acquire(timeout=CHECKOUT_TIMEOUT)
+
+    def release(self, connection, discard: bool = False) -> None:
+        """
+        Returns a connection to the pool, or closes it if discard is set or the pool is gone.
+        """
+        if self.pool is None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+            return
+        self.pool.release(connection, discard)
+
+    def close(self) -> None:
+        """
+        Safely closes every pooled connection.
+        """
+        if self.pool is None:
+            return
+        try:
+            self.pool.close()
+            logger.info("DB connection pool closed")
+        except Exception as e:
+            logger.error(f"Error closing database connections: {e}")
+        finally:
+            self.pool = None
+
+    def prune_idle(self) -> int:
+        """
+        Closes connections idle for longer than MAX_IDLE, down to the minimum pool size.
+
+        Returns:
+            int: The number of connections closed.
+        """
+        if self.pool is None:
+            return 0
+        return self.pool.prune(MAX_IDLE)
+
+    def stats(self) -> dict:
+        """
+        Returns the pool counters, e.g. for logging.
+        """
+        if self.pool is None:
+            return {"size": 0, "idle": 0, "in_use": 0, "max_size": self.max_size}
+        return self.pool.stats()
+
+
+def create_storage(backend: str | None = None) -> Storage:
+    """
+    Creates the storage backend selected by the DB_BACKEND environment variable.
+
+    Args:
+        backend (str, optional): "sqlserver" (Azure SQL, the default) or "sqlite"
+            (an embedded database file at SQLITE_PATH), overriding DB_BACKEND.
+
+    Returns:
+        Storage: The backend, not yet connected.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    backend = (backend or os.getenv("DB_BACKEND") or "sqlserver").lower()
+    # Imported lazily, so a SQLite deployment does not need the ODBC driver
+    if backend == "sqlserver":
+        from database.DB_Manager import DatabaseManager
+
+        return DatabaseManager()
+    if backend == "sqlite":
+        from database.sqlite_storage import SqliteStorage
+
+        return SqliteStorage()
+    raise ValueError(f"Unknown DB_BACKEND {backend!r}, expected one of {', '.join(BACKENDS)}")
@@ -0,0 +1,252 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# Consecutive failed connection checkouts that open the circuit breaker
+FAILURE_THRESHOLD = 3
+# Reconnect delays double from BASE_DELAY up to MAX_DELAY seconds, with full jitter
+BASE_DELAY = 1.0
+MAX_DELAY = 60.0
+
+# States published in DatabaseHealth
+CONNECTED = "connected"
+CONNECTING = "connecting"
+STOPPED = "stopped"
+
+
+class CircuitOpenError(ConnectionError):
+    """
+    Raised instead of running a database call while the circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Fails database calls at once while the database is known to be unreachable.
+
+    The breaker opens after FAILURE_THRESHOLD consecutive connection failures, or when
+    tripped by the supervisor; it closes again once the supervisor has reconnected.
+    Used from the event loop only.
+    """
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD) -> None:
+        self.failure_threshold = failure_threshold
+        self.failures = 0
+        self.last_error: str | None = None
+        self.opened_at: float | None = None
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def on_open(self, listener: Callable[[], None]) -> None:
+        """
+        Registers a callback run whenever the breaker opens.
+        """
+        self._listeners.append(listener)
+
+    def check(self) -> None:
+        """
+        Raises:
+            CircuitOpenError: If the breaker is open.
+        """
+        if self.is_open:
+            raise CircuitOpenError(f"The database is unavailable: {self.last_error}")
+
+    def record_success(self) -> None:
+        self.failures = 0
+
+    def record_failure(self, error: BaseException) -> None:
+        """
+        Counts a failed connection, opening the breaker at the failure threshold.
+        """
+        self.failures += 1
+        self.last_error = str(error)
+        if self.failures >= self.failure_threshold:
+            self.trip(error)
+
+    def trip(self, error: BaseException | str) -> None:
+        """
+        Opens the breaker now, e.g. when a health check fails.
+        """
+        self.last_error = str(error)
+        if self.is_open:
+            return
+        self.opened_at = time.monotonic()
+        logger.warning(f"Database circuit breaker opened: {self.last_error}")
+        for listener in self._listeners:
+            listener()
+
+    def reset(self) -> None:
+        """
+        Closes the breaker after a successful reconnect.
+        """
+        if self.is_open:
+            logger.info(f"Database circuit breaker closed after {time.monotonic() - self.opened_at:.0f}s")
+        self.failures = 0
+        self.opened_at = None
+
+
+class DatabaseHealth(NamedTuple):
+    """
+    Snapshot of the database connection, published by ConnectionSupervisor.
+    """
+
+    state: str
+    breaker_open: bool
+    # Failed reconnect attempts since the connection was lost
+    attempts: int
+    last_error: str | None
+    # Seconds until the next reconnect attempt, while reconnecting
+    retry_in: float | None
+    # Round trip of the last health check, in milliseconds
+    latency_ms: float | None
+    pool: dict
+
+
+def backoff_delay(attempt: int, base_delay: float = BASE_DELAY, max_delay: float = MAX_DELAY) -> float:
+    """
+    Returns a random delay before reconnect attempt number attempt (from 0), up to
+    base_delay * 2**attempt seconds capped at max_delay ("full jitter"), so that
+    reconnecting clients do not retry in lockstep.
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2**attempt))
+
+
+class ConnectionSupervisor:
+    """
+    Keeps the bot connected to the database without blocking the event loop.
+
+    Connecting runs as a background task that retries with jittered exponential backoff;
+    while the database is unreachable the circuit breaker of the AsyncDatabase stays open,
+    so commands fail fast instead of waiting on it. The task reconnects whenever the
+    breaker opens again, and the latest state is published as health.
+    """
+
+    def __init__(
+        self,
+        db,
+        on_connect: Callable[[], Awaitable[None]] | None = None,
+        base_delay: float = BASE_DELAY,
+        max_delay: float = MAX_DELAY,
+    ) -> None:
+        """
+        Args:
+            db (AsyncDatabase): The database to connect; its breaker is driven by the supervisor.
+            on_connect (callable, optional): Coroutine function awaited after every
+                (re)connect, e.g. to apply migrations.
+            base_delay (float): Upper bound of the first retry delay, in seconds.
+            max_delay (float): Upper bound of any retry delay, in seconds.
+        """
+        self.db = db
+        self.breaker = db.breaker
+        self.on_connect = on_connect
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.state = STOPPED
+        self.attempts = 0
+        self.latency_ms: float | None = None
+        self._retry_at: float | None = None
+        self._lost = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.health = self._snapshot()
+        self.breaker.on_open(self._lost.set)
+
+    def start(self) -> None:
+        """
+        Starts connecting in the background, returning at once; does nothing if running.
+        """
+        if self._task is not None and not self._task.done():
+            return
+        self.breaker.trip("Not connected yet")
+        self._task = asyncio.get_running_loop().create_task(self._supervise())
+
+    async def stop(self) -> None:
+        """
+        Stops the background task and closes the connection pool.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.db.call(self.db.storage.close)
+        self._set_state(STOPPED)
+
+    async def _supervise(self) -> None:
+        while True:
+            self._lost.clear()
+            await self._reconnect()
+            await self._lost.wait()
+
+    async def _reconnect(self) -> None:
+        """
+        Retries connecting until it succeeds, then closes the breaker.
+        """
+        self.attempts = 0
+        self._set_state(CONNECTING)
+        while True:
+            try:
+                await self.db.call(self.db.storage.ping)
+                break
+            except Exception as e:
+                delay = backoff_delay(self.attempts, self.base_delay, self.max_delay)
+                self.attempts += 1
+                self.breaker.last_error = str(e)
+                self._retry_at = time.monotonic() + delay
+                logger.warning(f"Database connection attempt {self.attempts} failed, retrying in {delay:.1f}s: {e}")
+                self._publish()
+                await asyncio.sleep(delay)
+
+        self._retry_at = None
+        self.breaker.reset()
+        self._set_state(CONNECTED)
+        if self.on_connect is not None:
+            try:
+                await self.on_connect()
+            except Exception as e:
+                logger.error(f"Error after connecting to the database: {e}")
+
+    async def check_health(self) -> DatabaseHealth:
+        """
+        Probes the database while connected, tripping the breaker if the probe fails,
+        then publishes and returns the current health.
+        """
+        if self.state == CONNECTED:
+            started = time.perf_counter()
+            try:
+                await self.db.fetchval("SELECT 1")
+                self.latency_ms = (time.perf_counter() - started) * 1000
+            except Exception as e:
+                self.latency_ms = None
+                self.breaker.trip(e)
+        return self._publish()
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.info(f"Database {self.state} -> {state}")
+            self.state = state
+        self._publish()
+
+    def _snapshot(self) -> DatabaseHealth:
+        retry_in = None if self._retry_at is None else max(0.0, self._retry_at - time.monotonic())
+        return DatabaseHealth(
+            state=self.state,
+            breaker_open=self.breaker.is_open,
+            attempts=self.attempts,
+            last_error=self.breaker.last_error,
+            retry_in=retry_in,
+            latency_ms=self.latency_ms,
+            pool=self.db.storage.stats(),
+        )
+
+    def _publish(self) -> DatabaseHealth:
+        self.health = self._snapshot()
+        return self.health
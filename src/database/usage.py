@@ -0,0 +1,96 @@
+import asyncio
+import datetime
+import logging
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# Buffered usage is written at least this often (seconds), or once this many commands ran
+FLUSH_INTERVAL = 30
+MAX_PENDING = 50
+
+def usage_month(now: datetime.datetime | None = None) -> str:
+    """
+    Formats the month a command ran in, as stored in CommandTrack (e.g. "03-2025").
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    return now.strftime("%m-%Y")
+
+
+def _write_usage(cursor, merge_usage: str, rows: list[tuple[str, str, int]]) -> None:
+    cursor.executemany(merge_usage, rows)
+
+
+class CommandUsageBuffer:
+    """
+    Write-behind buffer of command usage counts.
+
+    Commands only bump an in-memory counter per (command, month); the counts are merged
+    into CommandTrack in one batch every FLUSH_INTERVAL seconds (see the bot's
+    flush_command_usage loop), as soon as MAX_PENDING commands ran, and on shutdown.
+    """
+
+    def __init__(self, db, max_pending: int = MAX_PENDING) -> None:
+        """
+        Initializes an empty buffer.
+
+        Args:
+            db (AsyncDatabase): The database the counts are flushed to.
+            max_pending (int): Number of buffered commands that triggers an early flush.
+        """
+        self.db = db
+        self.max_pending = max_pending
+        self._counts: Counter[tuple[str, str]] = Counter()
+        self._pending = 0
+        self._flush_lock = asyncio.Lock()
+        self._flush_task = None
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of command uses not yet written to the database.
+        """
+        return self._pending
+
+    def record(self, command_name: str) -> None:
+        """
+        Counts one use of a command; never touches the database.
+
+        Args:
+            command_name (str): The command, e.g. "scramble".
+        """
+        self._counts[(command_name, usage_month())] += 1
+        self._pending += 1
+        if self._pending >= self.max_pending and self._flush_task is None:
+            try:
+                self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+            except RuntimeError:
+                # No event loop (e.g. a script): the next flush() call writes the counts
+                pass
+
+    async def flush(self) -> int:
+        """
+        Writes the buffered counts to CommandTrack in one batch, adding each to the stored
+        count with the backend's merge_usage upsert.
+        Counts that fail to be written are put back and retried with the next flush.
+
+        Returns:
+            int: The number of command uses written.
+        """
+        async with self._flush_lock:
+            self._flush_task = None
+            if not self._counts:
+                return 0
+            counts, pending = self._counts, self._pending
+            self._counts, self._pending = Counter(), 0
+
+            rows = [(command, month, count) for (command, month), count in counts.items()]
+            try:
+                await self.db.run(_write_usage, self.db.queries.merge_usage, rows)
+            except Exception as e:
+                logger.error(f"Failed to write command usage, keeping {pending} uses for the next flush: {e}")
+                self._counts.update(counts)
+                self._pending += pending
+                return 0
+            logger.debug(f"Wrote {pending} command uses ({len(rows)} rows)")
+            return pending
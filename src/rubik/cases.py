@@ -0,0 +1,204 @@
+"""
+Locally rendered OLL and PLL case images.
+
+A case is the last layer left by the inverse of its algorithm on a solved cube held
+with yellow on top and green in front. It is drawn from above: the top face plus the
+top-layer stickers of the four sides. OLL images only show which stickers are
+oriented (yellow) and which are not (grey); PLL images show every color.
+
+Rendered PNGs are written to CASES_DIR so they survive restarts, and are normally
+created ahead of time by
+
+    python -m rubik.cases
+"""
+
+import json
+import logging
+from functools import lru_cache
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from paths import DATA_DIR
+from rubik.compiler import compile_scramble
+from rubik.draw import BACKGROUND, GRID, PALETTE
+from rubik.encoding import symmetries
+from rubik.moves import COLORS, solved_state, sticker_positions
+from rubik.render_cache import RenderCache, render_cache
+
+logger = logging.getLogger(__name__)
+
+ALGORITHMS_PATH = DATA_DIR / "algorithms.json"
+CASES_DIR = DATA_DIR / "cases"
+MODES = ("oll", "pll")
+
+# Pixel sizes of a top-face sticker, a side sticker's depth and the grid lines
+STICKER_SIZE = 60
+SIDE_DEPTH = 18
+LINE_WIDTH = 3
+
+# The case palette extends the net palette with grey for unoriented OLL stickers
+CASE_PALETTE = np.vstack((PALETTE, [(128, 128, 128)])).astype(np.uint8)
+GREY = len(PALETTE)
+YELLOW = COLORS.index("yellow")
+
+# Held yellow on top, green in front
+_HOLD = "z2"
+
+
+@lru_cache(maxsize=None)
+def load_algorithms() -> dict[str, dict[str, str]]:
+    """
+    Reads the OLL and PLL algorithms, keyed by mode then case id.
+    """
+    with open(ALGORITHMS_PATH, "r") as f:
+        return json.load(f)
+
+
+def case_state(algorithm: str, auf: str = "") -> np.ndarray:
+    """
+    Sets up a case: the inverse of its algorithm applied to a held solved cube.
+
+    Args:
+        algorithm (str): The algorithm that solves the case.
+        auf (str): U turns of the held cube's top layer that finish the solve after
+            the algorithm (e.g. "U2"), whichever way up the algorithm leaves the cube.
+
+    Returns:
+        np.ndarray: The flat 3x3 sticker state of the case.
+    """
+    held = solved_state(3)[compile_scramble(3, _HOLD)]
+    permutation = compile_scramble(3, algorithm)
+    unsolved = held[np.argsort(compile_scramble(3, auf))]
+
+    # Algorithms with rotations (e.g. "x L2 D2 ...") finish with the cube turned, so
+    # undo them from a solved cube held in that final orientation
+    centers = np.arange(4, len(held), 9)
+    for rotation in symmetries(3)[0]:
+        finished = unsolved[rotation]
+        if np.array_equal(finished[centers], held[permutation][centers]):
+            # Inverting the compiled permutation undoes the whole algorithm at once
+            return finished[np.argsort(permutation)]
+    raise ValueError(f"Invalid algorithm: {algorithm}")
+
+
+@lru_cache(maxsize=None)
+def _pixel_map() -> np.ndarray:
+    """
+    Precomputes which sticker every pixel of a case image shows.
+
+    Stickers are placed from their 3D positions seen from above: top-face stickers
+    become squares, top-layer side stickers thin strips around them. Pixels outside
+    every sticker point one past the state (background), sticker outlines two past.
+    """
+    positions = sticker_positions(3)
+    sticker_count = len(positions)
+
+    # Doubled coordinates -3 (side), -2, 0, 2 (top face) and 3 (side) along x and z
+    spans = {-3: SIDE_DEPTH, -2: STICKER_SIZE, 0: STICKER_SIZE, 2: STICKER_SIZE, 3: SIDE_DEPTH}
+    starts, offset = {}, 0
+    for coordinate, span in spans.items():
+        starts[coordinate] = offset
+        offset += span + LINE_WIDTH
+    size = offset + LINE_WIDTH
+
+    pixel_map = np.full((size, size), sticker_count)
+    for index, (x, y, z) in enumerate(positions.tolist()):
+        on_top = y == 3 and abs(x) < 3 and abs(z) < 3
+        on_side = y == 2 and (abs(x) == 3) != (abs(z) == 3)
+        if not (on_top or on_side):
+            continue
+        # Looking down with green (front, +z) at the bottom of the image
+        left, top = starts[x], starts[z]
+        width, height = spans[x], spans[z]
+        pixel_map[top : top + height + 2 * LINE_WIDTH, left : left + width + 2 * LINE_WIDTH] = sticker_count + 1
+        pixel_map[top + LINE_WIDTH : top + LINE_WIDTH + height, left + LINE_WIDTH : left + LINE_WIDTH + width] = index
+
+    pixel_map.setflags(write=False)
+    return pixel_map
+
+
+def render_case(mode: str, algorithm: str) -> bytes:
+    """
+    Renders the image of an OLL or PLL case.
+
+    Args:
+        mode (str): "oll" or "pll".
+        algorithm (str): The algorithm that solves the case.
+
+    Returns:
+        bytes: The PNG image.
+    """
+    state = case_state(algorithm)
+    if mode == "oll":
+        state = np.where(state == YELLOW, YELLOW, GREY)
+
+    pixel_map = _pixel_map()
+    colors = np.concatenate((state, (BACKGROUND, GRID))).astype(np.uint8)
+    pixels = np.ascontiguousarray(colors[pixel_map])
+    height, width = pixel_map.shape
+    image = Image.frombuffer("P", (width, height), pixels, "raw", "P", 0, 1)
+    image.putpalette(CASE_PALETTE.tobytes())
+
+    img_bytes = BytesIO()
+    image.save(img_bytes, format="PNG", optimize=True)
+    return img_bytes.getvalue()
+
+
+def case_image(mode: str, alg_id: str) -> BytesIO | None:
+    """
+    Returns the image of a case, from memory, from CASES_DIR, or freshly rendered.
+
+    Args:
+        mode (str): "oll" or "pll".
+        alg_id (str): The case id, e.g. "21" or "Ua".
+
+    Returns:
+        BytesIO | None: The PNG image, or None if the case is unknown.
+    """
+    algorithm = load_algorithms().get(mode, {}).get(alg_id)
+    if algorithm is None:
+        return None
+
+    path = CASES_DIR / mode / f"{alg_id}.png"
+
+    def render() -> bytes:
+        if path.exists():
+            return path.read_bytes()
+        data = render_case(mode, algorithm)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        except OSError as e:
+            logger.warning(f"Could not cache case image {path}: {e}")
+        return data
+
+    key = RenderCache.make_key("case", mode, alg_id, algorithm)
+    return render_cache.get_or_render(key, render)
+
+
+def build_case_images(force: bool = False) -> int:
+    """
+    Renders every OLL and PLL case into CASES_DIR.
+
+    Args:
+        force (bool): Re-render images that already exist.
+
+    Returns:
+        int: The number of images written.
+    """
+    written = 0
+    for mode in MODES:
+        (CASES_DIR / mode).mkdir(parents=True, exist_ok=True)
+        for alg_id, algorithm in load_algorithms().get(mode, {}).items():
+            path = CASES_DIR / mode / f"{alg_id}.png"
+            if force or not path.exists():
+                path.write_bytes(render_case(mode, algorithm))
+                written += 1
+    return written
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format="%(asctime)s %(levelname)s:%(name)s: %(message)s", level=logging.INFO)
+    logger.info(f"Rendered {build_case_images(force=True)} case images into {CASES_DIR}")
@@ -0,0 +1,147 @@
+"""
+Scramble compiler: turns a scramble string into a single sticker permutation.
+
+A scramble is tokenized once into compact Move opcodes, consecutive turns of the
+same layers are merged, and the per-move permutation tables from rubik.moves are
+composed into one gather. Compiled scrambles are memoized in a bounded LRU keyed
+by (size, scramble), so re-applying a daily or repeated scramble costs one gather.
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from rubik.moves import SLICE_MOVES, move_permutation
+
+# Number of compiled scrambles kept in memory
+COMPILE_CACHE_SIZE = 256
+
+
+class Move(NamedTuple):
+    """
+    A single parsed move: the face letter (or slice/rotation letter), clockwise quarter
+    turns (1-3), number of turned layers and the first of them (1 = the outer layer).
+    """
+
+    face: str
+    turns: int
+    layers: int
+    first_layer: int = 1
+
+
+# An optional layer count, the face (wide with "w" or in lower case), a slice or a
+# rotation, then an optional turn amount and direction: "R", "U2", "3Rw'", "2R", "r", "M2", "x'"
+_MOVE_PATTERN = re.compile(r"(?P<depth>\d*)(?P<face>[URFDLB]w?|[urfdlb]|[MESxyz])(?P<amount>\d*)(?P<prime>'?)")
+
+
+def parse_move(command: str) -> Move:
+    """
+    Parses one move token (e.g. "R", "U'", "Fw2", "3Rw", "2R", "r", "M2", "x'").
+
+    A number before a wide move ("3Rw", "3r") is how many layers it turns; before a
+    plain face letter ("2R") it selects that single inner layer.
+
+    Args:
+        command (str): The move token.
+
+    Returns:
+        Move: The parsed move.
+
+    Raises:
+        ValueError: If the token is not a valid move.
+    """
+    match = _MOVE_PATTERN.fullmatch(command)
+    if match is None:
+        raise ValueError(f"Invalid move: {command}")
+
+    face = match["face"]
+    depth = int(match["depth"]) if match["depth"] else None
+    amount = int(match["amount"]) if match["amount"] else 1
+    turns = (-amount if match["prime"] else amount) % 4
+
+    if face in SLICE_MOVES:
+        if depth is not None:
+            raise ValueError(f"Invalid move: {command}")
+        return Move(face, turns, 1)
+    if face.endswith("w") or face.islower():
+        return Move(face[0].upper(), turns, depth or 2)
+    return Move(face, turns, 1, depth or 1)
+
+
+def tokenize(scramble: str) -> tuple[Move, ...]:
+    """
+    Tokenizes a scramble and merges consecutive turns of the same layers.
+
+    Args:
+        scramble (str): A space-separated string of moves; parentheses are ignored.
+
+    Returns:
+        tuple[Move, ...]: The simplified move sequence.
+    """
+    moves: list[Move] = []
+    for command in scramble.replace("(", " ").replace(")", " ").split():
+        move = parse_move(command)
+        if moves and moves[-1]._replace(turns=0) == move._replace(turns=0):
+            move = move._replace(turns=(moves.pop().turns + move.turns) % 4)
+        if move.turns:
+            moves.append(move)
+    return tuple(moves)
+
+
+class MoveCounts(NamedTuple):
+    """
+    Length of a move sequence in the common metrics.
+
+    htm: half-turn metric, any outer-block turn counts 1 (inner slices 2).
+    qtm: quarter-turn metric, every quarter turn of an outer block counts 1.
+    stm: slice-turn metric, any turn of any block of layers counts 1.
+    Whole-cube rotations count 0 in every metric.
+    """
+
+    htm: int
+    qtm: int
+    stm: int
+
+
+def count_moves(scramble: str) -> MoveCounts:
+    """
+    Counts the moves of a sequence in HTM, QTM and STM (after merging repeated turns).
+
+    Args:
+        scramble (str): A space-separated string of moves.
+
+    Returns:
+        MoveCounts: The move counts.
+    """
+    htm = qtm = stm = 0
+    for move in tokenize(scramble):
+        if move.face in SLICE_MOVES and SLICE_MOVES[move.face][1] == "all":
+            continue
+        quarters = 2 if move.turns == 2 else 1
+        # Slices and inner layers equal two outer turns (plus a rotation)
+        blocks = 2 if move.face in SLICE_MOVES or move.first_layer > 1 else 1
+        htm += blocks
+        qtm += blocks * quarters
+        stm += 1
+    return MoveCounts(htm, qtm, stm)
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def compile_scramble(size: int, scramble: str) -> np.ndarray:
+    """
+    Compiles a whole scramble into one cached sticker permutation.
+
+    Args:
+        size (int): The dimensions of the cube.
+        scramble (str): A space-separated string of moves.
+
+    Returns:
+        np.ndarray: Read-only gather indices such that new_state = state[permutation].
+    """
+    permutation = np.arange(6 * size * size, dtype=np.intp)
+    for move in tokenize(scramble):
+        permutation = permutation[move_permutation(size, *move)]
+    permutation.setflags(write=False)
+    return permutation
@@ -1,11 +1,18 @@
-from rubik.utils import rotate_face
+import numpy as np
+
 from rubik.draw import draw_rubiks_cube
+from rubik.moves import FACES, COLORS, solved_state, move_permutation
+from rubik.compiler import compile_scramble, tokenize
+from rubik.encoding import pack_state, unpack_state
 
 
 class Cube:
     """
     Represents a Rubik's Cube with a variable size (default 3x3).
     Handles the internal state of the cube faces and performs scrambling moves.
+
+    The state is a flat uint8 array of 6 * size * size stickers (see rubik.moves),
+    so every move is a single gather through a cached permutation table.
     """
 
     def __init__(self, size=3) -> None:
@@ -16,27 +23,22 @@ class Cube:
             size (int): The dimensions of the cube (e.g., 3 for 3x3x3).
         """
         self.size = size
-        self.faces = {
-            "white": self.__createFace("white"),
-            "green": self.__createFace("green"),
-            "red": self.__createFace("red"),
-            "blue": self.__createFace("blue"),
-            "yellow": self.__createFace("yellow"),
-            "orange": self.__createFace("orange"),
-        }
+        self.state = solved_state(size)
         self.sides = ("F", "D", "U", "R", "L", "B")
 
-    def __createFace(self, color) -> list[list[str]]:
+    @property
+    def faces(self) -> dict[str, list[list[str]]]:
         """
-        Creates a 2D array representing a cube face, initialized with a single color.
-
-        Args:
-            color (str): The color name to fill the face with.
+        Returns the faces as 2D lists of color names, keyed by the color of each face when solved.
 
         Returns:
-            list[list[str]]: A 2D list of size self.size x self.size.
+            dict[str, list[list[str]]]: e.g. faces["white"][row][col] for the U face.
         """
-        return [[color for _ in range(self.size)] for _ in range(self.size)]
+        stickers = self.state.reshape(6, self.size, self.size).tolist()
+        return {
+            COLORS[index]: [[COLORS[color] for color in row] for row in stickers[index]]
+            for index in range(len(FACES))
+        }
 
     def scrambleCube(self, scrambleLine: str) -> None:
         """
@@ -45,28 +47,68 @@ class Cube:
         Args:
             scrambleLine (str): A space-separated string of WCA scramble notations (e.g., "R U R' U'").
         """
-        commandList = scrambleLine.split()
-        for command in commandList:
-            # Default parameters for single character scramble
-            seen_3 = False  # Track if '3' exists in the command for wide moves
-            rotations = 1
-            clockwise = True
-            extra_layer = 0
-
-            # Parse each command for face, direction, and layer depth
-            for element in command:
-                if element in self.sides:
-                    face = element
-                if element == "'":
-                    clockwise = False
-                if element == "2":
-                    rotations = 2
-                if element == "w" and not seen_3:
-                    extra_layer = 1
-                if element == "3":
-                    extra_layer = 2
-                    seen_3 = True
-
-            # Execute the rotation move
-            for _ in range(rotations):
-                rotate_face(self, face, clockwise, extra_layer)
\ No newline at end of file
+        # The whole scramble is compiled (and cached) into a single gather
+        self.state = self.state[compile_scramble(self.size, scrambleLine)]
+
+    def to_bytes(self) -> bytes:
+        """
+        Encodes the cube state compactly (3 bits per sticker, see rubik.encoding).
+
+        Returns:
+            bytes: The packed state, e.g. 21 bytes for a 3x3.
+        """
+        return pack_state(self.state)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, size: int = 3) -> "Cube":
+        """
+        Rebuilds a cube from the output of to_bytes.
+
+        Args:
+            data (bytes): The packed state.
+            size (int): The dimensions of the cube.
+
+        Returns:
+            Cube: A cube in the encoded state.
+        """
+        cube = cls(size)
+        cube.state = unpack_state(data, size)
+        return cube
+
+
+def scramble_batch(size: int, scrambles: list[str]) -> np.ndarray:
+    """
+    Applies many scrambles of the same puzzle size to solved cubes at once.
+
+    All cubes advance together: at each step one (N, 6 * size * size) gather applies
+    the next move of every scramble, with the identity padding shorter scrambles.
+
+    Args:
+        size (int): The dimensions of the cubes.
+        scrambles (list[str]): N space-separated strings of WCA moves.
+
+    Returns:
+        np.ndarray: An (N, 6 * size * size) uint8 matrix, one sticker state per row.
+    """
+    sequences = [tokenize(scramble) for scramble in scrambles]
+    sticker_count = 6 * size * size
+
+    # Stack every distinct move table once; row 0 is the identity used as padding
+    distinct_moves = list(dict.fromkeys(move for moves in sequences for move in moves))
+    tables = np.empty((len(distinct_moves) + 1, sticker_count), dtype=np.intp)
+    tables[0] = np.arange(sticker_count)
+    for index, move in enumerate(distinct_moves, start=1):
+        tables[index] = move_permutation(size, *move)
+
+    # Opcode matrix: opcodes[i, t] is the table row of move t of scramble i
+    move_ids = {move: index for index, move in enumerate(distinct_moves, start=1)}
+    length = max((len(moves) for moves in sequences), default=0)
+    opcodes = np.zeros((len(sequences), length), dtype=np.intp)
+    for row, moves in enumerate(sequences):
+        opcodes[row, : len(moves)] = [move_ids[move] for move in moves]
+
+    permutations = np.tile(tables[0], (len(sequences), 1))
+    for step in range(length):
+        permutations = np.take_along_axis(permutations, tables[opcodes[:, step]], axis=1)
+
+    return solved_state(size)[permutations]
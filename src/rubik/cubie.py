@@ -0,0 +1,261 @@
+"""
+Cubie-level representation of a 3x3 cube and the coordinates used by the solvers.
+
+A cubie state lists, for each corner and edge position, which piece sits there and
+how it is twisted or flipped, following Kociemba's conventions (corners URF, UFL,
+ULB, UBR, DFR, DLF, DBL, DRB and edges UR, UF, UL, UB, DR, DF, DL, DB, FR, FL, BL, BR).
+The coordinate helpers are vectorized: they take (N, k) arrays and return N values.
+"""
+
+from functools import lru_cache
+from itertools import combinations, permutations
+from math import factorial
+from typing import NamedTuple
+
+import numpy as np
+
+from rubik.moves import FACES, move_permutation, solved_state
+
+# Sticker indices (into a 3x3 Cube.state) of every corner and edge position,
+# starting with the U/D sticker for corners and the U/D or F/B sticker for edges
+CORNER_FACELETS = (
+    (8, 9, 20), (6, 18, 38), (0, 36, 47), (2, 45, 11),
+    (29, 26, 15), (27, 44, 24), (33, 53, 42), (35, 17, 51),
+)
+EDGE_FACELETS = (
+    (5, 10), (7, 19), (3, 37), (1, 46), (32, 16), (28, 25),
+    (30, 43), (34, 52), (23, 12), (21, 41), (50, 39), (48, 14),
+)
+
+# Face indices (U=0, R=1, F=2, D=3, L=4, B=5) of the stickers of each solved piece
+_U, _R, _F, _D, _L, _B = range(6)
+CORNER_COLORS = (
+    (_U, _R, _F), (_U, _F, _L), (_U, _L, _B), (_U, _B, _R),
+    (_D, _F, _R), (_D, _L, _F), (_D, _B, _L), (_D, _R, _B),
+)
+EDGE_COLORS = (
+    (_U, _R), (_U, _F), (_U, _L), (_U, _B), (_D, _R), (_D, _F),
+    (_D, _L), (_D, _B), (_F, _R), (_F, _L), (_B, _L), (_B, _R),
+)
+
+# Names of the 18 face moves, indexed 3 * face + (quarter turns - 1)
+MOVE_NAMES = tuple(f"{face}{suffix}" for face in FACES for suffix in ("", "2", "'"))
+
+
+class CubieCube(NamedTuple):
+    """
+    Corner permutation/orientation and edge permutation/orientation of a 3x3 cube.
+    """
+
+    cp: tuple[int, ...]
+    co: tuple[int, ...]
+    ep: tuple[int, ...]
+    eo: tuple[int, ...]
+
+
+def _parity(permutation: tuple[int, ...]) -> int:
+    """
+    Returns 0 for an even permutation and 1 for an odd one.
+    """
+    inversions = sum(
+        1 for i, j in combinations(range(len(permutation)), 2) if permutation[i] > permutation[j]
+    )
+    return inversions % 2
+
+
+def corner_cubies(
+    facelets: list[int], corner_facelets: tuple[tuple[int, ...], ...]
+) -> tuple[list[int], list[int]]:
+    """
+    Reads the corner permutation and orientation from stickers labelled by face.
+
+    Args:
+        facelets (list[int]): The face (U=0 ... B=5) each sticker belongs to.
+        corner_facelets (tuple): Sticker indices of every corner position, U/D sticker first.
+
+    Returns:
+        tuple[list[int], list[int]]: The corner permutation and orientation.
+
+    Raises:
+        ValueError: If a corner's stickers do not form a known piece.
+    """
+    cp, co = [], []
+    for positions in corner_facelets:
+        colors = [facelets[p] for p in positions]
+        twist = next((o for o in range(3) if colors[o] in (_U, _D)), None)
+        piece = None
+        if twist is not None:
+            key = (colors[(twist + 1) % 3], colors[(twist + 2) % 3])
+            piece = next((j for j, c in enumerate(CORNER_COLORS) if c[1:] == key), None)
+        if piece is None:
+            raise ValueError("Invalid cube: unknown corner piece")
+        cp.append(piece)
+        co.append(twist)
+    return cp, co
+
+
+def from_facelets(state: np.ndarray) -> CubieCube:
+    """
+    Converts a 3x3 sticker state into its cubie representation.
+
+    Colors are matched against the center stickers, so whole-cube rotations of the
+    state are accepted and solved relative to the current orientation.
+
+    Args:
+        state (np.ndarray): A flat sticker array of 54 entries, as in Cube.state.
+
+    Returns:
+        CubieCube: The corresponding cubie state.
+
+    Raises:
+        ValueError: If the stickers do not describe a solvable cube.
+    """
+    state = np.asarray(state)
+    if state.shape != (54,):
+        raise ValueError("Only 3x3 cubes can be converted to cubies")
+
+    centers = state[4::9].tolist()
+    if sorted(centers) != list(range(6)):
+        raise ValueError("Invalid cube: centers must all have different colors")
+    face_of = {color: face for face, color in enumerate(centers)}
+    facelets = [face_of.get(color) for color in state.tolist()]
+    if any(facelets.count(face) != 9 for face in range(6)):
+        raise ValueError("Invalid cube: every color must appear exactly 9 times")
+
+    cp, co = corner_cubies(facelets, CORNER_FACELETS)
+
+    ep, eo = [], []
+    for positions in EDGE_FACELETS:
+        colors = tuple(facelets[p] for p in positions)
+        if colors in EDGE_COLORS:
+            ep.append(EDGE_COLORS.index(colors))
+            eo.append(0)
+        elif colors[::-1] in EDGE_COLORS:
+            ep.append(EDGE_COLORS.index(colors[::-1]))
+            eo.append(1)
+        else:
+            raise ValueError("Invalid cube: unknown edge piece")
+
+    if len(set(cp)) != 8 or len(set(ep)) != 12:
+        raise ValueError("Invalid cube: duplicated pieces")
+    if sum(co) % 3:
+        raise ValueError("Invalid cube: a corner is twisted")
+    if sum(eo) % 2:
+        raise ValueError("Invalid cube: an edge is flipped")
+    if _parity(tuple(cp)) != _parity(tuple(ep)):
+        raise ValueError("Invalid cube: two pieces are swapped")
+
+    return CubieCube(tuple(cp), tuple(co), tuple(ep), tuple(eo))
+
+
+@lru_cache(maxsize=None)
+def move_cubies() -> tuple[CubieCube, ...]:
+    """
+    Derives the cubie effect of the 18 face moves from the sticker permutation tables.
+
+    Returns:
+        tuple[CubieCube, ...]: One cubie state per move, indexed like MOVE_NAMES.
+    """
+    return tuple(
+        from_facelets(solved_state(3)[move_permutation(3, face, turns)])
+        for face in FACES
+        for turns in (1, 2, 3)
+    )
+
+
+# --- Vectorized coordinates -------------------------------------------------
+
+
+def perm_rank(perms: np.ndarray) -> np.ndarray:
+    """
+    Ranks permutations of 0..k-1 in lexicographic order (the identity ranks 0).
+
+    Args:
+        perms (np.ndarray): An (N, k) array of permutations.
+
+    Returns:
+        np.ndarray: N ranks in [0, k!).
+    """
+    perms = np.asarray(perms)
+    k = perms.shape[1]
+    rank = np.zeros(len(perms), dtype=np.int64)
+    for i in range(k - 1):
+        smaller_after = (perms[:, i + 1 :] < perms[:, i : i + 1]).sum(axis=1)
+        rank += smaller_after * factorial(k - 1 - i)
+    return rank
+
+
+@lru_cache(maxsize=None)
+def all_perms(k: int) -> np.ndarray:
+    """
+    Lists every permutation of 0..k-1, so that all_perms(k)[perm_rank(p)] == p.
+    """
+    return np.array(list(permutations(range(k))), dtype=np.int8)
+
+
+def twist_coord(co: np.ndarray) -> np.ndarray:
+    """
+    Encodes corner orientations (N, 8) as a twist in [0, 2187).
+    """
+    return np.asarray(co)[:, :7].astype(np.int64) @ (3 ** np.arange(6, -1, -1))
+
+
+def twist_orientations() -> np.ndarray:
+    """
+    Decodes every twist coordinate into its (2187, 8) corner orientations.
+    """
+    digits = (np.arange(2187)[:, None] // 3 ** np.arange(6, -1, -1)) % 3
+    return np.hstack((digits, (-digits.sum(axis=1) % 3)[:, None]))
+
+
+def flip_coord(eo: np.ndarray) -> np.ndarray:
+    """
+    Encodes edge orientations (N, 12) as a flip in [0, 2048).
+    """
+    return np.asarray(eo)[:, :11].astype(np.int64) @ (2 ** np.arange(10, -1, -1))
+
+
+def flip_orientations() -> np.ndarray:
+    """
+    Decodes every flip coordinate into its (2048, 12) edge orientations.
+    """
+    digits = (np.arange(2048)[:, None] >> np.arange(10, -1, -1)) & 1
+    return np.hstack((digits, (digits.sum(axis=1) % 2)[:, None]))
+
+
+@lru_cache(maxsize=None)
+def slice_combinations() -> np.ndarray:
+    """
+    Lists the 495 ways to place the four UD-slice edges, solved (positions 8-11) first.
+
+    Returns:
+        np.ndarray: A (495, 12) boolean occupancy array.
+    """
+    combos = list(combinations(range(12), 4))[::-1]
+    occupancy = np.zeros((len(combos), 12), dtype=bool)
+    for index, combo in enumerate(combos):
+        occupancy[index, list(combo)] = True
+    return occupancy
+
+
+@lru_cache(maxsize=None)
+def _slice_index_by_mask() -> np.ndarray:
+    weights = 1 << np.arange(12)
+    lookup = np.full(1 << 12, -1, dtype=np.int64)
+    lookup[slice_combinations() @ weights] = np.arange(495)
+    return lookup
+
+
+def slice_coord(ep: np.ndarray) -> np.ndarray:
+    """
+    Encodes where the UD-slice edges are (ignoring their order) as a value in [0, 495).
+    """
+    occupancy = np.asarray(ep) >= 8
+    return _slice_index_by_mask()[occupancy @ (1 << np.arange(12))]
+
+
+def slice_occupancy_coord(occupancy: np.ndarray) -> np.ndarray:
+    """
+    Encodes (N, 12) boolean slice-edge occupancy arrays as values in [0, 495).
+    """
+    return _slice_index_by_mask()[np.asarray(occupancy) @ (1 << np.arange(12))]
@@ -1,77 +1,139 @@
-from PIL import Image, ImageDraw
+from functools import lru_cache
 from io import BytesIO
 
+import numpy as np
+from PIL import Image
 
-def draw_rubiks_cube(rubik) -> BytesIO:
+from rubik.moves import COLORS
+from rubik.render_cache import RenderCache, render_cache
+
+# RGB value of each sticker color, indexed like rubik.moves.COLORS
+COLOR_MAP = {
+    "white": (255, 255, 255),
+    "green": (0, 255, 0),
+    "red": (255, 0, 0),
+    "blue": (0, 0, 255),
+    "yellow": (255, 255, 0),
+    "orange": (255, 165, 0),
+}
+
+# Color LUT: the six sticker colors, then the canvas background and the grid lines
+PALETTE = np.array(
+    [COLOR_MAP[color] for color in COLORS] + [(255, 255, 255), (0, 0, 0)], dtype=np.uint8
+)
+BACKGROUND = len(COLORS)
+GRID = len(COLORS) + 1
+
+# Drawing configuration parameters
+DEFAULT_TOTAL_SIZE = 150
+GAP = 5
+BORDER_THICKNESS = 5
+
+
+@lru_cache(maxsize=None)
+def _pixel_map(cube_size: int, total_size: int) -> np.ndarray:
     """
-    Generates a 2D net representation of the Rubik's Cube as a PNG image.
+    Precomputes, for every pixel of the net, which sticker it shows.
+
+    Each pixel holds a sticker index into Cube.state, or an index past the end of the
+    state for the background and the grid lines, so a whole image is one gather.
 
     Args:
-        rubik (Cube): The Cube instance containing the current face states.
+        cube_size (int): The dimensions of the cube.
+        total_size (int): Width in pixels of one face.
 
     Returns:
-        BytesIO: A binary stream containing the generated PNG image.
+        np.ndarray: A read-only (height, width) integer array.
     """
-    cube_size = rubik.size
-
-    # Map color names to RGB tuples for Pillow drawing
-    color_map = {
-        "white": (255, 255, 255),
-        "green": (0, 255, 0),
-        "red": (255, 0, 0),
-        "blue": (0, 0, 255),
-        "yellow": (255, 255, 0),
-        "orange": (255, 165, 0),
-    }
-
-    # Drawing configuration parameters
-    total_size = 150
+    sticker_count = 6 * cube_size * cube_size
     block_size = int(total_size / cube_size)
-    gap = 5
-    border_thickness = 5
+    face_size = block_size * cube_size
 
     # Calculate image dimensions based on cube size and gaps
-    img_width = block_size * cube_size * 4 + gap * 3
-    img_height = block_size * cube_size * 3 + gap * 2
-
-    # Create a new white canvas
-    img = Image.new("RGB", (img_width, img_height), "white")
-    draw = ImageDraw.Draw(img)
+    img_width = face_size * 4 + GAP * 3
+    img_height = face_size * 3 + GAP * 2
 
     # Define the 2D layout positions for each face in the net
     layout_positions = {
-        "white": (block_size * cube_size + gap, 0),
-        "blue": (block_size * cube_size * 3 + gap * 3, block_size * cube_size + gap),
-        "red": (block_size * cube_size * 2 + gap * 2, block_size * cube_size + gap),
-        "green": (block_size * cube_size + gap, block_size * cube_size + gap),
-        "orange": (0, block_size * cube_size + gap),
-        "yellow": (block_size * cube_size + gap, block_size * cube_size * 2 + gap * 2),
+        "white": (face_size + GAP, 0),
+        "blue": (face_size * 3 + GAP * 3, face_size + GAP),
+        "red": (face_size * 2 + GAP * 2, face_size + GAP),
+        "green": (face_size + GAP, face_size + GAP),
+        "orange": (0, face_size + GAP),
+        "yellow": (face_size + GAP, face_size * 2 + GAP * 2),
     }
 
-    def draw_face(face, start_x, start_y) -> None:
-        """
-        Draws an individual face on the canvas at the specified coordinates.
-        """
+    # One sticker covers block_size + 1 pixels (outline included), sharing its edge
+    # with the next sticker; the outer BORDER_THICKNESS pixels of it are grid lines.
+    offsets = np.arange(block_size + 1)
+    inner = (offsets >= BORDER_THICKNESS) & (offsets <= block_size - BORDER_THICKNESS)
+    inner_mask = np.outer(inner, inner)
+
+    # Background pixels point just past the state, grid pixels one further (see render_net).
+    # Pad by one pixel so the last face's closing edge can be written, then crop.
+    pixel_map = np.full((img_height + 1, img_width + 1), sticker_count)
+    for face, (start_x, start_y) in layout_positions.items():
+        face_offset = COLORS.index(face) * cube_size * cube_size
         for row in range(cube_size):
             for col in range(cube_size):
                 x0 = start_x + col * block_size
                 y0 = start_y + row * block_size
-                x1 = x0 + block_size
-                y1 = y0 + block_size
-                color = rubik.faces[face][row][col]
-                draw.rectangle(
-                    [x0, y0, x1, y1],
-                    fill=color_map[color],
-                    outline="black",
-                    width=border_thickness,
-                )
-
-    # Draw all faces of the cube
-    for face, (start_x, start_y) in layout_positions.items():
-        draw_face(face, start_x, start_y)
+                block = pixel_map[y0 : y0 + block_size + 1, x0 : x0 + block_size + 1]
+                block[...] = sticker_count + 1
+                block[inner_mask] = face_offset + row * cube_size + col
+
+    pixel_map = np.ascontiguousarray(pixel_map[:img_height, :img_width])
+    pixel_map.setflags(write=False)
+    return pixel_map
+
+
+def render_net(state: np.ndarray, cube_size: int, total_size: int = DEFAULT_TOTAL_SIZE) -> Image.Image:
+    """
+    Renders a sticker state as a palette image of the 2D net.
+
+    The image stores one color index per pixel with PALETTE attached, which keeps the
+    render to a single gather and the PNG small and quick to encode.
+
+    Args:
+        state (np.ndarray): Flat sticker array, as stored in Cube.state.
+        cube_size (int): The dimensions of the cube.
+        total_size (int): Width in pixels of one face.
+
+    Returns:
+        Image.Image: The rendered net in "P" mode.
+    """
+    pixel_map = _pixel_map(cube_size, total_size)
+    colors = np.concatenate((state, (BACKGROUND, GRID))).astype(np.uint8)
+    pixels = colors[pixel_map]
+    height, width = pixel_map.shape
+    image = Image.frombuffer("P", (width, height), pixels, "raw", "P", 0, 1)
+    image.putpalette(PALETTE.tobytes())
+    return image
+
+
+def draw_rubiks_cube(rubik, total_size: int = DEFAULT_TOTAL_SIZE, compress_level: int = 1) -> BytesIO:
+    """
+    Generates a 2D net representation of the Rubik's Cube as a PNG image.
+
+    Args:
+        rubik (Cube): The Cube instance containing the current face states.
+        total_size (int): Width in pixels of one face.
+        compress_level (int): PNG zlib level, from 0 (none) to 9 (smallest, slowest).
+
+    Returns:
+        BytesIO: A binary stream containing the generated PNG image, served from
+        rubik.render_cache when the same state was drawn before.
+    """
+    state = np.ascontiguousarray(rubik.state, dtype=np.uint8)
+    key = RenderCache.make_key("net", rubik.size, total_size, compress_level, state.tobytes())
+
+    def render() -> bytes:
+        img = render_net(state, rubik.size, total_size)
+
+        # Save the final image to a bytes buffer
+        img_bytes = BytesIO()
+        img.save(img_bytes, format="PNG", compress_level=compress_level)
+        return img_bytes.getvalue()
 
-    # Save the final image to a bytes buffer
-    img_bytes = BytesIO()
-    img.save(img_bytes, format="PNG")
-    img_bytes.seek(0)
-    return img_bytes
\ No newline at end of file
+    # Identical states (daily scramble, solved previews, algorithm cases) render once
+    return render_cache.get_or_render(key, render)
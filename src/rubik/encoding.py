@@ -0,0 +1,150 @@
+"""
+Compact byte encoding of sticker states, and canonical forms under cube symmetry.
+
+Every sticker color fits in 3 bits, so a state packs into ceil(18 * N * N / 8) bytes:
+21 for a 3x3, 111 for a 7x7. The bytes compare and hash like any bytes object,
+which makes them cheap dictionary and cache keys.
+
+Two states are symmetric if one is the other seen from a different side: rotated
+(24 rotations) or also mirrored (48 symmetries), with the colors relabelled so that
+the result is again in the standard orientation. The canonical form of a state is the
+smallest encoding among all of its symmetric variants.
+"""
+
+from functools import lru_cache
+from itertools import permutations, product
+
+import numpy as np
+
+from rubik.moves import FACE_NORMALS, FACES, sticker_positions
+
+BITS_PER_STICKER = 3
+
+# The bit pattern of every color, most significant bit first
+_BIT_WEIGHTS = 1 << np.arange(BITS_PER_STICKER - 1, -1, -1)
+
+
+def encoded_size(size: int) -> int:
+    """
+    Returns the number of bytes pack_state produces for an NxN cube.
+    """
+    return -(-6 * size * size * BITS_PER_STICKER // 8)
+
+
+def _pack_rows(states: np.ndarray) -> np.ndarray:
+    """
+    Packs an (M, stickers) array of states into an (M, bytes) uint8 array.
+    """
+    states = np.asarray(states, dtype=np.uint8)
+    bits = np.unpackbits(states[..., None], axis=-1)[..., 8 - BITS_PER_STICKER :]
+    return np.packbits(bits.reshape(len(states), -1), axis=1)
+
+
+def pack_state(state: np.ndarray) -> bytes:
+    """
+    Encodes a sticker state with 3 bits per sticker.
+
+    Args:
+        state (np.ndarray): Flat sticker array, as stored in Cube.state.
+
+    Returns:
+        bytes: The packed state.
+    """
+    return _pack_rows(np.asarray(state)[None, :])[0].tobytes()
+
+
+def unpack_state(data: bytes, size: int) -> np.ndarray:
+    """
+    Decodes a state written by pack_state.
+
+    Args:
+        data (bytes): The packed state.
+        size (int): The dimensions of the cube.
+
+    Returns:
+        np.ndarray: A flat uint8 sticker array.
+
+    Raises:
+        ValueError: If data does not have the length of a packed NxN state.
+    """
+    if len(data) != encoded_size(size):
+        raise ValueError(f"Expected {encoded_size(size)} bytes for a {size}x{size} cube, got {len(data)}")
+    sticker_count = 6 * size * size
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))[: sticker_count * BITS_PER_STICKER]
+    return (bits.reshape(sticker_count, BITS_PER_STICKER) @ _BIT_WEIGHTS).astype(np.uint8)
+
+
+@lru_cache(maxsize=None)
+def symmetries(size: int, mirror: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Builds the sticker and color permutations of the cube's symmetries.
+
+    Symmetry k maps a state to color_maps[k][state[sticker_perms[k]]]. The identity
+    comes first.
+
+    Args:
+        size (int): The dimensions of the cube.
+        mirror (bool): Include the 24 mirrored symmetries as well as the 24 rotations.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Read-only (k, 6 * size * size) sticker_perms and
+        (k, 6) color maps, with k = 24 or 48.
+    """
+    positions = sticker_positions(size)
+    index_of = {tuple(p): i for i, p in enumerate(positions.tolist())}
+    face_of = {FACE_NORMALS[face]: index for index, face in enumerate(FACES)}
+
+    sticker_perms, color_maps = [], []
+    for axes, signs in product(permutations(range(3)), product((1, -1), repeat=3)):
+        matrix = np.zeros((3, 3), dtype=np.int64)
+        matrix[range(3), axes] = signs
+        if round(np.linalg.det(matrix)) != 1 and not mirror:
+            continue
+
+        permutation = np.empty(len(positions), dtype=np.intp)
+        for source, target in enumerate((positions @ matrix.T).tolist()):
+            permutation[index_of[tuple(target)]] = source
+        # The color of each face's center moves to wherever that face's normal points
+        color_map = [face_of[tuple((matrix @ FACE_NORMALS[face]).tolist())] for face in FACES]
+
+        sticker_perms.append(permutation)
+        color_maps.append(color_map)
+
+    # permutations() and product() start with the identity axes and positive signs
+    result = (np.array(sticker_perms), np.array(color_maps, dtype=np.uint8))
+    for array in result:
+        array.setflags(write=False)
+    return result
+
+
+def symmetric_states(state: np.ndarray, size: int, mirror: bool = False) -> np.ndarray:
+    """
+    Lists every symmetric variant of a state, the state itself first.
+
+    Returns:
+        np.ndarray: A (24 or 48, 6 * size * size) uint8 array, indexed like symmetries().
+    """
+    sticker_perms, color_maps = symmetries(size, mirror)
+    state = np.asarray(state)
+    return np.take_along_axis(color_maps, state[sticker_perms], axis=1)
+
+
+def canonical_key(state: np.ndarray, size: int, mirror: bool = False) -> tuple[bytes, int]:
+    """
+    Encodes a state as the smallest packing among its symmetric variants.
+
+    Symmetric states share the same key, so caches keyed on it hit for every
+    orientation of a case.
+
+    Args:
+        state (np.ndarray): Flat sticker array, as stored in Cube.state.
+        size (int): The dimensions of the cube.
+        mirror (bool): Also treat mirror images as equivalent (48 symmetries, not 24).
+
+    Returns:
+        tuple[bytes, int]: The canonical key, and the index (into symmetries()) of a
+        symmetry that maps the state onto the key.
+    """
+    packed = [row.tobytes() for row in _pack_rows(symmetric_states(state, size, mirror))]
+    index = min(range(len(packed)), key=packed.__getitem__)
+    return packed[index], index
@@ -0,0 +1,173 @@
+"""
+Geometric description of the cube and the sticker permutation tables built from it.
+
+Every sticker of an NxN cube lives in one flat array of 6 * N * N entries, ordered
+face by face (U, R, F, D, L, B) and row-major inside each face, using the same
+orientation as the 2D net drawn by rubik.draw. A move is a permutation of that
+array: new_state = state[permutation].
+
+Every move, whether a face turn, a wide or inner-slice turn, a slice (M, E, S) or a
+whole-cube rotation (x, y, z), is a clockwise turn of a block of layers about one of
+the face normals, so all permutation tables come from the same geometry.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+# Face order of the flat sticker array, and the color of each face when solved
+FACES = ("U", "R", "F", "D", "L", "B")
+COLORS = ("white", "red", "green", "yellow", "orange", "blue")
+
+# Per face: (outward normal, direction of increasing row, direction of increasing column).
+# Positions use doubled coordinates so that sticker centers are integers.
+_FACE_FRAMES = {
+    "U": ((0, 1, 0), (0, 0, 1), (1, 0, 0)),
+    "R": ((1, 0, 0), (0, -1, 0), (0, 0, -1)),
+    "F": ((0, 0, 1), (0, -1, 0), (1, 0, 0)),
+    "D": ((0, -1, 0), (0, 0, -1), (1, 0, 0)),
+    "L": ((-1, 0, 0), (0, -1, 0), (0, 0, 1)),
+    "B": ((0, 0, -1), (0, -1, 0), (-1, 0, 0)),
+}
+
+# Slices and whole-cube rotations: the face whose direction they follow, and whether
+# they turn the middle layer (odd cubes only) or all layers
+SLICE_MOVES = {
+    "M": ("L", "middle"),
+    "E": ("D", "middle"),
+    "S": ("F", "middle"),
+    "x": ("R", "all"),
+    "y": ("U", "all"),
+    "z": ("F", "all"),
+}
+
+# Outward normal of every face, e.g. FACE_NORMALS["U"] == (0, 1, 0)
+FACE_NORMALS = {face: frame[0] for face, frame in _FACE_FRAMES.items()}
+
+
+def solved_state(size: int) -> np.ndarray:
+    """
+    Builds the sticker array of a solved cube.
+
+    Args:
+        size (int): The dimensions of the cube (e.g., 3 for 3x3x3).
+
+    Returns:
+        np.ndarray: A flat uint8 array where each sticker holds the index of its face color.
+    """
+    return np.repeat(np.arange(6, dtype=np.uint8), size * size)
+
+
+@lru_cache(maxsize=None)
+def sticker_positions(size: int) -> np.ndarray:
+    """
+    Computes the 3D position of every sticker, in flat array order.
+
+    Args:
+        size (int): The dimensions of the cube.
+
+    Returns:
+        np.ndarray: A (6 * size * size, 3) integer array of doubled coordinates.
+    """
+    offsets = 2 * np.arange(size) - (size - 1)
+    rows, cols = np.meshgrid(offsets, offsets, indexing="ij")
+    positions = []
+    for face in FACES:
+        normal, row_dir, col_dir = (np.array(v) for v in _FACE_FRAMES[face])
+        face_pos = (
+            size * normal
+            + rows.reshape(-1, 1) * row_dir
+            + cols.reshape(-1, 1) * col_dir
+        )
+        positions.append(face_pos)
+    result = np.concatenate(positions)
+    result.setflags(write=False)
+    return result
+
+
+def _quarter_turn(size: int, face: str, first_layer: int, last_layer: int) -> np.ndarray:
+    """
+    Builds the permutation of one clockwise quarter turn of a block of layers.
+
+    Args:
+        size (int): The dimensions of the cube.
+        face (str): The face the turn is seen from (U, R, F, D, L or B).
+        first_layer (int): The first turned layer, counted from the face (0 = outer layer).
+        last_layer (int): The last turned layer, inclusive.
+
+    Returns:
+        np.ndarray: The gather indices for one clockwise quarter turn.
+    """
+    positions = sticker_positions(size)
+    axis = np.array(_FACE_FRAMES[face][0])
+
+    # Layer k (from the face) sits at depth size - 1 - 2k along the normal; the face
+    # stickers themselves sit at depth size, so they belong to the outer layer.
+    depth = positions @ axis
+    upper = size if first_layer == 0 else size - 1 - 2 * first_layer
+    lower = -size if last_layer == size - 1 else size - 1 - 2 * last_layer
+    moving = (depth <= upper) & (depth >= lower)
+
+    # Clockwise when looking at the face is a -90 degree rotation about its normal:
+    # v' = a(a.v) - a x v
+    rotated = positions.copy()
+    rotated[moving] = (
+        np.outer(depth[moving], axis) - np.cross(axis, positions[moving])
+    )
+
+    index_of = {tuple(p): i for i, p in enumerate(positions.tolist())}
+    permutation = np.empty(len(positions), dtype=np.intp)
+    for source, target in enumerate(rotated.tolist()):
+        permutation[index_of[tuple(target)]] = source
+    return permutation
+
+
+def _layer_span(size: int, face: str, layers: int, first_layer: int) -> tuple[str, int, int]:
+    """
+    Resolves a move into the face it turns like and its first and last layer (0-based).
+    """
+    if face in SLICE_MOVES:
+        base, span = SLICE_MOVES[face]
+        if span == "all":
+            return base, 0, size - 1
+        if size % 2 == 0:
+            raise ValueError(f"{face} turns the middle layer, which a {size}x{size} cube does not have")
+        return base, size // 2, size // 2
+
+    if face not in _FACE_FRAMES:
+        raise ValueError(f"Unknown face: {face}")
+    if layers < 1 or first_layer < 1 or first_layer + layers - 1 > size:
+        raise ValueError(f"Cannot turn layers {first_layer}-{first_layer + layers - 1} on a {size}x{size} cube")
+    return face, first_layer - 1, first_layer + layers - 2
+
+
+@lru_cache(maxsize=None)
+def move_permutation(
+    size: int, face: str, turns: int = 1, layers: int = 1, first_layer: int = 1
+) -> np.ndarray:
+    """
+    Returns the cached sticker permutation of a move, building it on first use.
+
+    Args:
+        size (int): The dimensions of the cube.
+        face (str): The face to turn (U, R, F, D, L or B), or a slice (M, E, S) or
+            whole-cube rotation (x, y, z), for which layers and first_layer are ignored.
+        turns (int): Number of clockwise quarter turns (1, 2 or 3).
+        layers (int): Number of layers turned together (1 = one layer, 2 = wide, ...).
+        first_layer (int): The outermost turned layer, counted from the face (1 = the face itself).
+
+    Returns:
+        np.ndarray: Read-only gather indices such that new_state = state[permutation].
+    """
+    base, first, last = _layer_span(size, face, layers, first_layer)
+
+    turns %= 4
+    if turns == 0:
+        permutation = np.arange(6 * size * size, dtype=np.intp)
+    elif turns == 1:
+        permutation = _quarter_turn(size, base, first, last)
+    else:
+        quarter = move_permutation(size, face, 1, layers, first_layer)
+        permutation = quarter[move_permutation(size, face, turns - 1, layers, first_layer)]
+    permutation.setflags(write=False)
+    return permutation
@@ -0,0 +1,259 @@
+"""
+Random-state scrambles and optimal solutions for the 2x2 cube.
+
+With the DBL corner held fixed, a 2x2 has 7! * 3^6 = 3,674,160 states, reachable with
+U, R and F turns alone. A breadth-first search from the solved state stores the
+distance of every one of them, packed two states per byte (no state is more than 11
+moves away). Solving then walks downhill: at each step one of the nine moves lowers
+the distance by one, so a solution costs at most 11 * 9 lookups.
+
+The tables are built once by the offline step
+
+    python -m rubik.pocket
+
+into DATA_DIR / "pocket.tbl", and memory-mapped from there at startup.
+"""
+
+import logging
+import random
+import time
+
+import numpy as np
+
+from paths import DATA_DIR
+from rubik import cubie
+from rubik.cubie import MOVE_NAMES, all_perms, corner_cubies, move_cubies, perm_rank
+from rubik.tables import load_tables, pruning_table, save_tables
+
+logger = logging.getLogger(__name__)
+
+TABLES_PATH = DATA_DIR / "pocket.tbl"
+
+# Random states closer to solved than this are redrawn, as the official scrambler does
+MIN_SCRAMBLE_DISTANCE = 4
+
+# U, U2, U', R, R2, R', F, F2, F' (the first nine entries of MOVE_NAMES)
+MOVES = np.arange(9)
+
+_N_PERM, _N_TWIST = 5040, 729
+N_STATES = _N_PERM * _N_TWIST
+
+# Corner positions that move (DBL, position 6, stays put) and the pieces found there
+_POSITIONS = np.array([0, 1, 2, 3, 4, 5, 7])
+_PIECE_INDEX = np.array([0, 1, 2, 3, 4, 5, -1, 6])
+
+# Face indices of the stickers of the fixed DBL corner, in CORNER_FACELETS order
+_DBL_FACES = (3, 5, 4)
+
+_system_random = random.SystemRandom()
+
+
+def _to_2x2(index: int) -> int:
+    """
+    Maps a 3x3 corner sticker index to the same sticker of a 2x2 state.
+    """
+    face, offset = divmod(index, 9)
+    row, col = divmod(offset, 3)
+    return face * 4 + (row // 2) * 2 + col // 2
+
+
+# Sticker indices (into a 2x2 Cube.state) of every corner position
+CORNER_FACELETS = tuple(tuple(_to_2x2(i) for i in corner) for corner in cubie.CORNER_FACELETS)
+
+
+# --- Coordinates -------------------------------------------------------------
+
+
+def _perm_coord(cp: np.ndarray) -> np.ndarray:
+    """
+    Encodes (N, 8) corner permutations with DBL solved as values in [0, 5040).
+    """
+    return perm_rank(_PIECE_INDEX[np.asarray(cp)[:, _POSITIONS]])
+
+
+def _twist_coord(co: np.ndarray) -> np.ndarray:
+    """
+    Encodes (N, 8) corner orientations with DBL solved as values in [0, 729).
+    """
+    return np.asarray(co)[:, :6].astype(np.int64) @ (3 ** np.arange(5, -1, -1))
+
+
+def _decode_perms() -> np.ndarray:
+    """
+    Decodes every permutation coordinate into its (5040, 8) corner permutation.
+    """
+    cp = np.full((_N_PERM, 8), 6, dtype=np.intp)
+    cp[:, _POSITIONS] = _POSITIONS[all_perms(7)]
+    return cp
+
+
+def _decode_twists() -> np.ndarray:
+    """
+    Decodes every twist coordinate into its (729, 8) corner orientations.
+    """
+    digits = (np.arange(_N_TWIST)[:, None] // 3 ** np.arange(5, -1, -1)) % 3
+    co = np.zeros((_N_TWIST, 8), dtype=np.int64)
+    co[:, :6] = digits
+    co[:, 7] = -digits.sum(axis=1) % 3
+    return co
+
+
+# --- Tables ------------------------------------------------------------------
+
+
+def build_tables() -> dict[str, np.ndarray]:
+    """
+    Computes the move tables and the packed distance table.
+
+    Returns:
+        dict[str, np.ndarray]: The tables, by name.
+    """
+    perms, twists = _decode_perms(), _decode_twists()
+    perm_move = np.empty((_N_PERM, len(MOVES)), dtype=np.uint16)
+    twist_move = np.empty((_N_TWIST, len(MOVES)), dtype=np.uint16)
+    for m in MOVES:
+        move = move_cubies()[m]
+        perm_move[:, m] = _perm_coord(perms[:, list(move.cp)])
+        twist_move[:, m] = _twist_coord((twists[:, list(move.cp)] + move.co) % 3)
+
+    distance = pruning_table(perm_move, twist_move)
+    return {
+        "perm_move": perm_move,
+        "twist_move": twist_move,
+        # Two 4-bit distances per byte: even states in the low nibble, odd in the high
+        "distance": distance[0::2] | (distance[1::2] << 4),
+    }
+
+
+_tables: dict[str, np.ndarray] | None = None
+
+
+def get_tables() -> dict[str, np.ndarray]:
+    """
+    Returns the memory-mapped 2x2 tables, building the table file if it is missing.
+    """
+    global _tables
+    if _tables is None:
+        if not TABLES_PATH.exists():
+            logger.warning(f"{TABLES_PATH} not found, building 2x2 tables...")
+            save_tables(TABLES_PATH, build_tables())
+        _tables = load_tables(TABLES_PATH)
+    return _tables
+
+
+def distance(index: np.ndarray | int) -> np.ndarray | int:
+    """
+    Looks up the optimal solution length of states by index (perm * 729 + twist).
+    """
+    index = np.asarray(index)
+    return (get_tables()["distance"][index >> 1] >> ((index & 1) << 2)) & 0xF
+
+
+# --- Solving -----------------------------------------------------------------
+
+
+def _solve_index(index: int) -> list[int]:
+    """
+    Finds an optimal solution of a state by always moving to a closer neighbour.
+
+    Returns:
+        list[int]: Move indices into MOVE_NAMES.
+    """
+    tables = get_tables()
+    perm_move, twist_move = tables["perm_move"], tables["twist_move"]
+    moves = []
+    perm, twist = divmod(index, _N_TWIST)
+    remaining = int(distance(index))
+    while remaining:
+        children = perm_move[perm].astype(np.int64) * _N_TWIST + twist_move[twist]
+        m = int(np.argmax(distance(children) == remaining - 1))
+        moves.append(m)
+        perm, twist = divmod(int(children[m]), _N_TWIST)
+        remaining -= 1
+    return moves
+
+
+def state_index(state: np.ndarray) -> int:
+    """
+    Converts a 2x2 sticker state into its table index.
+
+    Colors are read relative to the DBL corner, so whole-cube rotations of the state
+    are accepted and solved relative to that corner.
+
+    Args:
+        state (np.ndarray): A flat sticker array of 24 entries, as in Cube.state.
+
+    Returns:
+        int: The state's index, perm * 729 + twist.
+
+    Raises:
+        ValueError: If the stickers do not describe a solvable cube.
+    """
+    state = np.asarray(state)
+    if state.shape != (24,):
+        raise ValueError("Only 2x2 cubes can be solved by the 2x2 solver")
+
+    colors = state.tolist()
+    face_of = {}
+    for face, position in zip(_DBL_FACES, CORNER_FACELETS[6]):
+        # A color's opposite color belongs on the opposite face
+        face_of[colors[position]] = face
+        face_of[(colors[position] + 3) % 6] = (face + 3) % 6
+    if sorted(face_of) != list(range(6)):
+        raise ValueError("Invalid cube: unknown corner piece")
+    facelets = [face_of.get(color) for color in colors]
+    if any(facelets.count(face) != 4 for face in range(6)):
+        raise ValueError("Invalid cube: every color must appear exactly 4 times")
+
+    cp, co = corner_cubies(facelets, CORNER_FACELETS)
+    if len(set(cp)) != 8:
+        raise ValueError("Invalid cube: duplicated pieces")
+    if sum(co) % 3:
+        raise ValueError("Invalid cube: a corner is twisted")
+
+    return int(_perm_coord([cp])[0]) * _N_TWIST + int(_twist_coord([co])[0])
+
+
+def solve(cube) -> str:
+    """
+    Finds an optimal (fewest face turns) solution of a 2x2 Cube.
+
+    Args:
+        cube (Cube): The cube to solve (size 2).
+
+    Returns:
+        str: A space-separated solution in WCA notation ("" if already solved).
+    """
+    if cube.size != 2:
+        raise ValueError("The 2x2 solver only supports 2x2 cubes")
+    return " ".join(MOVE_NAMES[m] for m in _solve_index(state_index(cube.state)))
+
+
+def random_state_scramble(rng: random.Random | None = None) -> str:
+    """
+    Generates a random-state 2x2 scramble.
+
+    Every state at least MIN_SCRAMBLE_DISTANCE moves from solved is equally likely;
+    the scramble is the inverse of its optimal solution.
+
+    Args:
+        rng (random.Random, optional): Random source; defaults to the system CSPRNG.
+
+    Returns:
+        str: A space-separated scramble string.
+    """
+    rng = rng or _system_random
+    while True:
+        index = rng.randrange(N_STATES)
+        if distance(index) >= MIN_SCRAMBLE_DISTANCE:
+            break
+    # Undo the solution: reverse it and turn every move the other way
+    moves = _solve_index(index)[::-1]
+    return " ".join(MOVE_NAMES[m - m % 3 + 2 - m % 3] for m in moves)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format="%(asctime)s %(levelname)s:%(name)s: %(message)s", level=logging.INFO)
+    started = time.perf_counter()
+    save_tables(TABLES_PATH, build_tables())
+    logger.info(f"Wrote {TABLES_PATH} in {time.perf_counter() - started:.1f}s")
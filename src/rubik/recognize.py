@@ -0,0 +1,125 @@
+"""
+Recognition of OLL and PLL cases on a 3x3 whose first two layers are solved.
+
+The last layer is read as 21 stickers (the U face and the top row of the four sides),
+with colors relabelled by the center they belong to, so any color scheme held any way
+up is read the same. A table built once from algorithms.json maps every such pattern,
+for every case under every AUF (adjust-U-face turn) before and after its algorithm, to
+the case, so recognition is one dictionary lookup.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from rubik.cases import case_state, load_algorithms
+
+# U turns that can be done before (pre-AUF) or after (post-AUF) an algorithm
+AUFS = ("", "U", "U2", "U'")
+
+# The U face, then the top row (stickers 0-2) of the R, F, L and B faces
+_LAST_LAYER = np.concatenate([np.arange(9)] + [face * 9 + np.arange(3) for face in (1, 2, 4, 5)])
+_U, _D = 0, 3
+_SIDES = np.array([1, 2, 4, 5])
+
+
+class Recognition(NamedTuple):
+    """
+    A recognized last-layer case: do pre_auf, then the case's algorithm, then post_auf.
+
+    alg_id is "skip" when the step is already done (oriented for OLL, solved but for an
+    AUF for PLL).
+    """
+
+    mode: str
+    alg_id: str
+    pre_auf: str
+    post_auf: str
+
+
+def _relabel(state: np.ndarray) -> np.ndarray | None:
+    """
+    Replaces each sticker color by the index of the face whose center has that color.
+    """
+    centers = state[4::9]
+    if len(set(centers.tolist())) != 6:
+        return None
+    lookup = np.zeros(256, dtype=np.uint8)
+    lookup[centers] = np.arange(6)
+    return lookup[state]
+
+
+def _oll_key(faces: np.ndarray) -> bytes:
+    return (faces[_LAST_LAYER] == _U).tobytes()
+
+
+def _pll_key(faces: np.ndarray) -> bytes:
+    return faces[_LAST_LAYER].tobytes()
+
+
+@lru_cache(maxsize=None)
+def get_tables() -> tuple[dict[bytes, Recognition], dict[bytes, Recognition]]:
+    """
+    Builds the OLL (orientation pattern) and PLL (full pattern) lookup tables.
+    """
+    algorithms = load_algorithms()
+    oll, pll = {}, {}
+
+    # Earlier entries win, so the fewest extra U turns are reported for symmetric cases
+    for pre in AUFS:
+        oll.setdefault(_oll_key(_relabel(case_state(pre))), Recognition("oll", "skip", "", ""))
+        for alg_id, algorithm in algorithms.get("oll", {}).items():
+            faces = _relabel(case_state(f"{pre} {algorithm}"))
+            oll.setdefault(_oll_key(faces), Recognition("oll", alg_id, pre, ""))
+
+    for pre in AUFS:
+        pll.setdefault(_pll_key(_relabel(case_state("", pre))), Recognition("pll", "skip", "", pre))
+    for pre in AUFS:
+        for post in AUFS:
+            for alg_id, algorithm in algorithms.get("pll", {}).items():
+                faces = _relabel(case_state(f"{pre} {algorithm}", post))
+                pll.setdefault(_pll_key(faces), Recognition("pll", alg_id, pre, post))
+
+    return oll, pll
+
+
+def recognize(state: np.ndarray) -> Recognition | None:
+    """
+    Identifies the OLL or PLL case showing on a 3x3 state.
+
+    Args:
+        state (np.ndarray): A flat 3x3 sticker array, as in Cube.state.
+
+    Returns:
+        Recognition | None: The OLL case if the last layer is not oriented, else the PLL
+        case; None if the first two layers are not solved (or the state is invalid).
+    """
+    state = np.asarray(state)
+    if state.shape != (54,):
+        return None
+    faces = _relabel(state)
+    if faces is None:
+        return None
+
+    stickers = faces.reshape(6, 9)
+    if (stickers[_D] != _D).any() or (stickers[_SIDES, 3:] != _SIDES[:, None]).any():
+        return None
+
+    oll, pll = get_tables()
+    if not (faces[:9] == _U).all():
+        return oll.get(_oll_key(faces))
+    return pll.get(_pll_key(faces))
+
+
+def describe(recognition: Recognition) -> str:
+    """
+    Formats a recognition for display, e.g. "PLL T (U' before, U2 after)".
+    """
+    name = f"{recognition.mode.upper()} {recognition.alg_id}"
+    aufs = []
+    if recognition.pre_auf:
+        aufs.append(f"{recognition.pre_auf} before")
+    if recognition.post_auf:
+        aufs.append(f"{recognition.post_auf} after")
+    return f"{name} ({', '.join(aufs)})" if aufs else name
@@ -0,0 +1,142 @@
+"""
+Content-addressed cache for rendered PNG images.
+
+Entries are keyed by a hash of what was rendered (a sticker state or source image
+bytes) plus the render parameters, store the finished PNG bytes, and are evicted
+least-recently-used first once their total size exceeds a byte budget. Every lookup
+hands out a fresh BytesIO over the same immutable bytes object, so nothing is copied
+per send.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from io import BytesIO
+
+# Default byte budget for cached PNGs
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+class RenderCache:
+    """
+    A thread-safe LRU cache of PNG bytes bounded by their total size.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_bytes (int): Maximum total size of the cached images.
+        """
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: bytes | str | int) -> bytes:
+        """
+        Hashes the content and render parameters of an image into a cache key.
+
+        Args:
+            *parts: Source bytes (e.g. a sticker state) and render parameters.
+
+        Returns:
+            bytes: A 16-byte BLAKE2b digest.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode("utf-8")
+            elif isinstance(part, int):
+                part = str(part).encode("ascii")
+            # Length-prefix every part so different splits can never collide
+            digest.update(len(part).to_bytes(8, "little"))
+            digest.update(part)
+        return digest.digest()
+
+    def get(self, key: bytes) -> BytesIO | None:
+        """
+        Looks up a cached image.
+
+        Args:
+            key (bytes): A key from make_key.
+
+        Returns:
+            BytesIO | None: A fresh stream at position 0, or None on a miss.
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return BytesIO(data)
+
+    def put(self, key: bytes, data: bytes) -> BytesIO:
+        """
+        Stores an image, evicting the least recently used ones if over budget.
+
+        Args:
+            key (bytes): A key from make_key.
+            data (bytes): The finished PNG bytes.
+
+        Returns:
+            BytesIO: A fresh stream over the stored bytes.
+        """
+        with self._lock:
+            if len(data) <= self.max_bytes:
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self.total_bytes -= len(previous)
+                self._entries[key] = data
+                self.total_bytes += len(data)
+                while self.total_bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.total_bytes -= len(evicted)
+        return BytesIO(data)
+
+    def get_or_render(self, key: bytes, render: Callable[[], bytes]) -> BytesIO:
+        """
+        Returns the cached image for key, rendering and storing it on a miss.
+
+        Args:
+            key (bytes): A key from make_key.
+            render (Callable[[], bytes]): Produces the PNG bytes on a miss.
+
+        Returns:
+            BytesIO: A fresh stream at position 0.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        return self.put(key, render())
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters, e.g. for logging.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def clear(self) -> None:
+        """
+        Drops every cached image (counters are kept).
+        """
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+# Process-wide cache shared by the cube renderer and the scramble image processing
+render_cache = RenderCache()
@@ -0,0 +1,94 @@
+"""
+In-process scrambler for 2x2 through 7x7 cubes.
+
+2x2 scrambles are random-state (see rubik.pocket); the bigger cubes get random-move
+scrambles. Scrambles use the same notation as the rest of the rubik package ("R", "U'", "Fw2",
+"3Rw'"), follow the WCA random-move lengths, and never turn the same layers twice in a
+row on one axis, so no two consecutive moves can cancel or merge.
+"""
+
+import random
+
+from rubik.pocket import random_state_scramble
+
+# Scrambler API puzzle values that can be generated locally, mapped to cube size
+PUZZLE_SIZES = {"TWO": 2, "THREE": 3, "FOUR": 4, "FIVE": 5, "SIX": 6, "SEVEN": 7}
+
+# WCA random-move scramble lengths (2x2 scrambles are random-state instead)
+SCRAMBLE_LENGTHS = {3: 25, 4: 40, 5: 60, 6: 80, 7: 100}
+
+# Opposite faces share an axis; moves on one axis commute with each other
+_AXES = {"U": 0, "D": 0, "R": 1, "L": 1, "F": 2, "B": 2}
+_SUFFIXES = ("", "'", "2")
+
+_system_random = random.SystemRandom()
+
+
+def _move_set(size: int) -> list[tuple[str, int]]:
+    """
+    Lists the (face, layers) pairs a scramble of the given size may use.
+
+    Turning half of an even cube from one side is the same as turning the other half
+    from the opposite side plus a rotation, so those moves only use U, R and F.
+    """
+    moves = []
+    for layers in range(1, size // 2 + 1):
+        faces = "URF" if 2 * layers == size else "UDRLFB"
+        moves.extend((face, layers) for face in faces)
+    return moves
+
+
+def format_move(face: str, layers: int, suffix: str = "") -> str:
+    """
+    Formats a move in WCA notation.
+
+    Args:
+        face (str): The face letter.
+        layers (int): Number of layers turned (1 = face, 2 = wide, 3 = "3Xw").
+        suffix (str): "", "'" or "2".
+
+    Returns:
+        str: e.g. "R", "Uw'" or "3Fw2".
+    """
+    if layers == 1:
+        return f"{face}{suffix}"
+    if layers == 2:
+        return f"{face}w{suffix}"
+    return f"{layers}{face}w{suffix}"
+
+
+def generate_scramble(size: int, rng: random.Random | None = None) -> str:
+    """
+    Generates a scramble for an NxN cube: random-state for 2x2, random-move otherwise.
+
+    Args:
+        size (int): The dimensions of the cube (2 to 7).
+        rng (random.Random, optional): Random source; defaults to the system CSPRNG.
+
+    Returns:
+        str: A space-separated scramble string.
+    """
+    if size == 2:
+        return random_state_scramble(rng)
+    if size not in SCRAMBLE_LENGTHS:
+        raise ValueError(f"No local scrambler for {size}x{size}")
+    rng = rng or _system_random
+
+    move_set = _move_set(size)
+    moves = []
+    current_axis = None
+    used_on_axis = set()  # (face, layers) already turned since the axis last changed
+
+    while len(moves) < SCRAMBLE_LENGTHS[size]:
+        face, layers = rng.choice(move_set)
+        axis = _AXES[face]
+        if axis != current_axis:
+            current_axis = axis
+            used_on_axis = set()
+        elif (face, layers) in used_on_axis:
+            continue
+
+        used_on_axis.add((face, layers))
+        moves.append(format_move(face, layers, rng.choice(_SUFFIXES)))
+
+    return " ".join(moves)
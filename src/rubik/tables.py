@@ -0,0 +1,111 @@
+"""
+Precomputed solver tables: their on-disk format and the breadth-first search that
+fills the distance tables.
+
+Several named NumPy arrays are stored in one file: a magic string, the length of a
+JSON header, the header (dtype, shape and offset of every array) and the raw array
+data, each aligned to 64 bytes. Loading memory-maps the arrays read-only, so every
+bot process on a host shares the same pages and startup does no work.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b"RUBIKTBL"
+_ALIGNMENT = 64
+
+
+def save_tables(path: Path, tables: dict[str, np.ndarray]) -> None:
+    """
+    Writes named arrays to a single table file (atomically replacing any old one).
+
+    Args:
+        path (Path): Destination file.
+        tables (dict[str, np.ndarray]): The arrays to store, by name.
+    """
+    entries = {}
+    offset = 0
+    for name, array in tables.items():
+        offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+        entries[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+
+    header = json.dumps(entries).encode("utf-8")
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // _ALIGNMENT) * _ALIGNMENT
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        for name, array in tables.items():
+            f.seek(data_start + entries[name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+    os.replace(tmp_path, path)
+
+
+def load_tables(path: Path) -> dict[str, np.ndarray]:
+    """
+    Memory-maps every array of a table file read-only.
+
+    Args:
+        path (Path): A file written by save_tables.
+
+    Returns:
+        dict[str, np.ndarray]: The arrays, by name.
+
+    Raises:
+        ValueError: If the file is not a table file.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a table file")
+        header_length = int.from_bytes(f.read(8), "little")
+        entries = json.loads(f.read(header_length))
+
+    data_start = -(-(len(MAGIC) + 8 + header_length) // _ALIGNMENT) * _ALIGNMENT
+    return {
+        name: np.memmap(
+            path,
+            dtype=np.dtype(entry["dtype"]),
+            mode="r",
+            offset=data_start + entry["offset"],
+            shape=tuple(entry["shape"]),
+        )
+        for name, entry in entries.items()
+    }
+
+
+def pruning_table(move_a: np.ndarray, move_b: np.ndarray) -> np.ndarray:
+    """
+    Breadth-first search of the product of two coordinates from the solved state.
+
+    Every level is expanded at once: all frontier nodes are pushed through all moves
+    with one gather per coordinate, and unseen children become the next frontier.
+
+    Args:
+        move_a (np.ndarray): Move table of the first coordinate, (size_a, moves).
+        move_b (np.ndarray): Move table of the second coordinate, (size_b, moves).
+
+    Returns:
+        np.ndarray: uint8 distance to solved of every (a, b) pair, indexed a * size_b + b
+        (255 for pairs that cannot be reached).
+    """
+    size_b = len(move_b)
+    depth = np.full(len(move_a) * size_b, 255, dtype=np.uint8)
+    depth[0] = 0
+    frontier = np.array([0])
+    level = 0
+    while frontier.size:
+        a, b = np.divmod(frontier, size_b)
+        children = move_a[a].astype(np.int64) * size_b + move_b[b]
+        children = children[depth[children] == 255]
+        depth[children] = level + 1
+        level += 1
+        frontier = np.flatnonzero(depth == level)
+    return depth
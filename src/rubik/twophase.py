@@ -0,0 +1,408 @@
+"""
+Kociemba two-phase solver for the 3x3 cube.
+
+Phase 1 brings the cube into the subgroup G1 = <U, D, R2, L2, F2, B2> (no twisted
+corners, no flipped edges, UD-slice edges in the slice); phase 2 solves it inside G1.
+Both phases are iterative-deepening depth-first searches guided by pruning tables,
+expanding batches of up to FRONTIER_SIZE nodes at a time with NumPy, so memory stays
+bounded while each move is still applied to many nodes at once.
+
+The move and pruning tables are built once by the offline step
+
+    python -m rubik.twophase
+
+into DATA_DIR / "twophase.tbl", and memory-mapped from there at startup.
+"""
+
+import logging
+import time
+from typing import Iterator
+
+import numpy as np
+
+from paths import DATA_DIR
+from rubik.cubie import (
+    MOVE_NAMES,
+    all_perms,
+    flip_coord,
+    flip_orientations,
+    from_facelets,
+    move_cubies,
+    perm_rank,
+    slice_combinations,
+    slice_coord,
+    slice_occupancy_coord,
+    twist_coord,
+    twist_orientations,
+)
+from rubik.tables import load_tables, pruning_table, save_tables
+
+logger = logging.getLogger(__name__)
+
+TABLES_PATH = DATA_DIR / "twophase.tbl"
+
+# Default upper bound on the solution length (in face turns)
+DEFAULT_MAX_LENGTH = 24
+
+# Phase 1 never needs more than 12 moves. Deep phase-2 searches are the expensive part,
+# so a first pass only accepts phase-2 solutions up to PHASE2_SOFT_LIMIT moves and lets
+# phase 1 go deeper instead; a second pass lifts the limit.
+MAX_PHASE1_LENGTH = 12
+PHASE2_SOFT_LIMIT = 12
+
+# Nodes expanded at once by the depth-first searches, which bounds their memory
+FRONTIER_SIZE = 1024
+
+# Seconds a solve may take, of which the first pass gets SOFT_PASS_SHARE
+SOLVE_TIMEOUT = 10.0
+SOFT_PASS_SHARE = 0.5
+
+# Moves that keep the cube in G1: U, U2, U', R2, F2, D, D2, D', L2, B2
+PHASE2_MOVES = np.array([0, 1, 2, 4, 7, 9, 10, 11, 13, 16])
+
+# Coordinate sizes used to index the pruning tables
+_N_FLIP, _N_SLICE, _N_SLICE_PERM = 2048, 495, 24
+
+# Per move: its face (U=0 ... B=5) and its cubie permutations
+_MOVE_FACE = np.arange(18) // 3
+_MOVE_CP = np.array([m.cp for m in move_cubies()], dtype=np.intp)
+_MOVE_EP = np.array([m.ep for m in move_cubies()], dtype=np.intp)
+
+
+# --- Table generation --------------------------------------------------------
+
+
+def _orientation_move_table(orientations: np.ndarray, modulus: int, corners: bool) -> np.ndarray:
+    """
+    Builds the twist or flip move table from all decoded orientations.
+    """
+    encode = twist_coord if corners else flip_coord
+    table = np.empty((len(orientations), 18), dtype=np.uint16)
+    for m, move in enumerate(move_cubies()):
+        perm, twist = (move.cp, move.co) if corners else (move.ep, move.eo)
+        table[:, m] = encode((orientations[:, list(perm)] + twist) % modulus)
+    return table
+
+
+def _permutation_move_table(perms: np.ndarray, embed, extract, moves: np.ndarray) -> np.ndarray:
+    """
+    Builds a permutation-coordinate move table for the given moves.
+
+    Args:
+        perms (np.ndarray): Every permutation of the coordinate, in rank order.
+        embed: Turns those permutations into full (N, 8) corner or (N, 12) edge arrays.
+        extract: Turns full arrays back into the coordinate's permutations.
+        moves (np.ndarray): The move indices to tabulate.
+    """
+    full = embed(perms)
+    table = np.empty((len(perms), len(moves)), dtype=np.uint16)
+    for column, m in enumerate(moves):
+        move_perm = _MOVE_CP[m] if full.shape[1] == 8 else _MOVE_EP[m]
+        table[:, column] = perm_rank(extract(full[:, move_perm]))
+    return table
+
+
+def build_tables() -> dict[str, np.ndarray]:
+    """
+    Computes every move and pruning table of the solver.
+
+    Returns:
+        dict[str, np.ndarray]: The tables, by name.
+    """
+    twist_move = _orientation_move_table(twist_orientations(), 3, corners=True)
+    flip_move = _orientation_move_table(flip_orientations(), 2, corners=False)
+
+    slice_move = np.empty((_N_SLICE, 18), dtype=np.uint16)
+    for m in range(18):
+        slice_move[:, m] = slice_occupancy_coord(slice_combinations()[:, _MOVE_EP[m]])
+
+    perms8 = all_perms(8).astype(np.intp)
+    perms4 = all_perms(4).astype(np.intp)
+    identity = np.arange(12)
+    corners_move = _permutation_move_table(perms8, lambda p: p, lambda p: p, PHASE2_MOVES)
+    ud_edges_move = _permutation_move_table(
+        perms8,
+        lambda p: np.hstack((p, np.tile(identity[8:], (len(p), 1)))),
+        lambda p: p[:, :8],
+        PHASE2_MOVES,
+    )
+    slice_perm_move = _permutation_move_table(
+        perms4,
+        lambda p: np.hstack((np.tile(identity[:8], (len(p), 1)), p + 8)),
+        lambda p: p[:, 8:] - 8,
+        PHASE2_MOVES,
+    )
+
+    return {
+        "twist_move": twist_move,
+        "flip_move": flip_move,
+        "slice_move": slice_move,
+        "corners_move": corners_move,
+        "ud_edges_move": ud_edges_move,
+        "slice_perm_move": slice_perm_move,
+        "twist_slice_prune": pruning_table(twist_move, slice_move),
+        "flip_slice_prune": pruning_table(flip_move, slice_move),
+        "twist_flip_prune": pruning_table(twist_move, flip_move),
+        "corners_slice_prune": pruning_table(corners_move, slice_perm_move),
+        "edges_slice_prune": pruning_table(ud_edges_move, slice_perm_move),
+    }
+
+
+_tables: dict[str, np.ndarray] | None = None
+
+
+def get_tables() -> dict[str, np.ndarray]:
+    """
+    Returns the memory-mapped solver tables, building the table file if it is missing.
+    """
+    global _tables
+    if _tables is None:
+        if not TABLES_PATH.exists():
+            logger.warning(f"{TABLES_PATH} not found, building two-phase tables...")
+            save_tables(TABLES_PATH, build_tables())
+        _tables = load_tables(TABLES_PATH)
+    return _tables
+
+
+# --- Search ------------------------------------------------------------------
+
+
+def _allowed(last_face: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """
+    Masks out redundant successors: the same face twice, or opposite faces out of order.
+
+    Args:
+        last_face (np.ndarray): (N,) face of each node's last move, -1 for none.
+        faces (np.ndarray): (M,) face of each candidate move.
+
+    Returns:
+        np.ndarray: (N, M) boolean mask of moves worth trying.
+    """
+    last = last_face[:, None]
+    same_axis = (faces[None, :] % 3) == (last % 3)
+    return (last < 0) | ~(same_axis & (faces[None, :] <= last))
+
+
+def _take(nodes: dict, index) -> dict:
+    return {key: value[index] for key, value in nodes.items()}
+
+
+def _depth_first(roots: dict, depth: int, expand, deadline: float) -> Iterator[dict]:
+    """
+    Expands nodes depth-first, at most FRONTIER_SIZE of them at a time, and yields the
+    nodes reached after `depth` moves.
+
+    Only one partly expanded batch is kept per level, so memory stays bounded by the
+    depth however many nodes a full level of the tree would hold.
+
+    Args:
+        roots (dict): The starting nodes, as coordinate arrays with a "path" of moves so far.
+        depth (int): Moves to add to every path.
+        expand: Called as expand(nodes, remaining); returns the children that can still
+            reach the goal in remaining - 1 moves.
+        deadline (float): time.perf_counter() value after which the search gives up.
+
+    Raises:
+        TimeoutError: If the deadline passes.
+    """
+    stack = [(roots, depth)]
+    while stack:
+        if time.perf_counter() > deadline:
+            raise TimeoutError("The two-phase search ran out of time")
+        nodes, remaining = stack.pop()
+        if len(nodes["path"]) > FRONTIER_SIZE:
+            stack.append((_take(nodes, slice(FRONTIER_SIZE, None)), remaining))
+            nodes = _take(nodes, slice(None, FRONTIER_SIZE))
+        if remaining == 0:
+            yield nodes
+            continue
+        children = expand(nodes, remaining)
+        if len(children["path"]):
+            stack.append((children, remaining - 1))
+
+
+def _child_path(path: np.ndarray, parents: np.ndarray, moves: np.ndarray) -> np.ndarray:
+    return np.hstack((path[parents], moves[:, None].astype(np.uint8)))
+
+
+def _phase1(tables, start: dict, depth: int, deadline: float) -> Iterator[dict]:
+    """
+    Yields, in batches, the phase-1 sequences of exactly `depth` moves that reach G1.
+
+    Returns:
+        Iterator[dict]: Batches of end nodes: their move sequences ("path") and last faces.
+    """
+    twist_move, flip_move, slice_move = tables["twist_move"], tables["flip_move"], tables["slice_move"]
+    twist_prune, flip_prune = tables["twist_slice_prune"], tables["flip_slice_prune"]
+    twist_flip_prune = tables["twist_flip_prune"]
+
+    def expand(nodes: dict, remaining: int) -> dict:
+        twist = twist_move[nodes["twist"]]
+        flip = flip_move[nodes["flip"]]
+        slc = slice_move[nodes["slice"]]
+        estimate = np.maximum(
+            twist_prune[twist.astype(np.int64) * _N_SLICE + slc],
+            flip_prune[flip.astype(np.int64) * _N_SLICE + slc],
+        )
+        estimate = np.maximum(estimate, twist_flip_prune[twist.astype(np.int64) * _N_FLIP + flip])
+        keep = _allowed(nodes["last_face"], _MOVE_FACE) & (estimate <= remaining - 1)
+        if remaining == 1:
+            # A last move that stays in G1 means a shorter phase 1 already exists
+            keep[:, PHASE2_MOVES] = False
+
+        parents, moves = np.nonzero(keep)
+        return {
+            "twist": twist[parents, moves],
+            "flip": flip[parents, moves],
+            "slice": slc[parents, moves],
+            "last_face": _MOVE_FACE[moves],
+            "path": _child_path(nodes["path"], parents, moves),
+        }
+
+    roots = {
+        "twist": np.array([start["twist"]]),
+        "flip": np.array([start["flip"]]),
+        "slice": np.array([start["slice"]]),
+        "last_face": np.array([-1]),
+        "path": np.empty((1, 0), dtype=np.uint8),
+    }
+    yield from _depth_first(roots, depth, expand, deadline)
+
+
+def _phase2(tables, nodes: dict, max_depth: int, deadline: float) -> np.ndarray | None:
+    """
+    Searches a batch of phase-2 starting positions for the shortest solution.
+
+    Returns:
+        np.ndarray | None: The whole move sequence (the starting node's path followed by
+        the phase-2 moves), or None if none is found within max_depth.
+    """
+    corners_move, edges_move = tables["corners_move"], tables["ud_edges_move"]
+    slice_perm_move = tables["slice_perm_move"]
+    corners_prune, edges_prune = tables["corners_slice_prune"], tables["edges_slice_prune"]
+    faces = _MOVE_FACE[PHASE2_MOVES]
+
+    def estimate(corners, edges, slice_perm):
+        return np.maximum(
+            corners_prune[corners.astype(np.int64) * _N_SLICE_PERM + slice_perm],
+            edges_prune[edges.astype(np.int64) * _N_SLICE_PERM + slice_perm],
+        )
+
+    def expand(nodes: dict, remaining: int) -> dict:
+        corners = corners_move[nodes["corners"]]
+        edges = edges_move[nodes["edges"]]
+        slice_perm = slice_perm_move[nodes["slice_perm"]]
+        keep = _allowed(nodes["last_face"], faces) & (estimate(corners, edges, slice_perm) <= remaining - 1)
+        parents, moves = np.nonzero(keep)
+        return {
+            "corners": corners[parents, moves],
+            "edges": edges[parents, moves],
+            "slice_perm": slice_perm[parents, moves],
+            "last_face": faces[moves],
+            "path": _child_path(nodes["path"], parents, PHASE2_MOVES[moves]),
+        }
+
+    # Every node reached after depth moves has an estimate of 0, i.e. is solved
+    start_estimate = estimate(nodes["corners"], nodes["edges"], nodes["slice_perm"])
+    for depth in range(int(start_estimate.min()), max_depth + 1):
+        roots = _take(nodes, start_estimate <= depth)
+        for solved in _depth_first(roots, depth, expand, deadline):
+            return solved["path"][0]
+    return None
+
+
+def _apply_path(perm: np.ndarray, paths: np.ndarray, move_perms: np.ndarray) -> np.ndarray:
+    """
+    Applies each row of move indices to the same starting cubie permutation.
+    """
+    perms = np.tile(perm, (len(paths), 1))
+    for step in range(paths.shape[1]):
+        perms = np.take_along_axis(perms, move_perms[paths[:, step]], axis=1)
+    return perms
+
+
+def solve_state(state: np.ndarray, max_length: int = DEFAULT_MAX_LENGTH, timeout: float = SOLVE_TIMEOUT) -> str:
+    """
+    Solves a 3x3 sticker state.
+
+    Args:
+        state (np.ndarray): A flat sticker array of 54 entries, as in Cube.state.
+        max_length (int): Longest acceptable solution, in face turns.
+        timeout (float): Seconds to search for before giving up.
+
+    Returns:
+        str: A space-separated solution in WCA notation ("" if already solved).
+
+    Raises:
+        ValueError: If the state is not a solvable 3x3 cube, or no solution of at most
+            max_length moves is found.
+        TimeoutError: If no solution is found within timeout seconds.
+    """
+    cubie = from_facelets(state)
+    tables = get_tables()
+    started = time.perf_counter()
+    deadline = started + timeout
+
+    cp = np.array(cubie.cp, dtype=np.intp)
+    ep = np.array(cubie.ep, dtype=np.intp)
+    start = {
+        "twist": int(twist_coord(np.array([cubie.co]))[0]),
+        "flip": int(flip_coord(np.array([cubie.eo]))[0]),
+        "slice": int(slice_coord(ep[None, :])[0]),
+    }
+    start_estimate = max(
+        tables["twist_slice_prune"][start["twist"] * _N_SLICE + start["slice"]],
+        tables["flip_slice_prune"][start["flip"] * _N_SLICE + start["slice"]],
+        tables["twist_flip_prune"][start["twist"] * _N_FLIP + start["flip"]],
+    )
+
+    # The first pass, limiting phase 2, only gets part of the time: if it runs out, the
+    # second pass still has the rest to find a longer solution
+    passes = ((PHASE2_SOFT_LIMIT, started + timeout * SOFT_PASS_SHARE), (max_length, deadline))
+    for phase2_limit, pass_deadline in passes:
+        try:
+            for phase1_length in range(int(start_estimate), min(max_length, MAX_PHASE1_LENGTH) + 1):
+                phase2_depth = min(max_length - phase1_length, phase2_limit)
+                for nodes in _phase1(tables, start, phase1_length, pass_deadline):
+                    ep_batch = _apply_path(ep, nodes["path"], _MOVE_EP)
+                    phase2_nodes = {
+                        "corners": perm_rank(_apply_path(cp, nodes["path"], _MOVE_CP)),
+                        "edges": perm_rank(ep_batch[:, :8]),
+                        "slice_perm": perm_rank(ep_batch[:, 8:] - 8),
+                        "last_face": nodes["last_face"],
+                        "path": nodes["path"],
+                    }
+                    solution = _phase2(tables, phase2_nodes, phase2_depth, pass_deadline)
+                    if solution is not None:
+                        logger.debug(f"Two-phase solve took {(time.perf_counter() - started) * 1000:.1f} ms")
+                        return " ".join(MOVE_NAMES[m] for m in solution)
+        except TimeoutError:
+            if pass_deadline == deadline:
+                raise TimeoutError(f"No solution found within {timeout:g}s") from None
+            logger.debug("Two-phase search for a short phase 2 ran out of time, lifting the limit")
+
+    raise ValueError(f"No solution found within {max_length} moves")
+
+
+def solve(cube, max_length: int = DEFAULT_MAX_LENGTH, timeout: float = SOLVE_TIMEOUT) -> str:
+    """
+    Solves a 3x3 Cube with the two-phase algorithm.
+
+    Args:
+        cube (Cube): The cube to solve (size 3).
+        max_length (int): Longest acceptable solution, in face turns.
+        timeout (float): Seconds to search for before giving up.
+
+    Returns:
+        str: A space-separated solution in WCA notation ("" if already solved).
+    """
+    if cube.size != 3:
+        raise ValueError("The two-phase solver only supports 3x3 cubes")
+    return solve_state(cube.state, max_length, timeout)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format="%(asctime)s %(levelname)s:%(name)s: %(message)s", level=logging.INFO)
+    started = time.perf_counter()
+    save_tables(TABLES_PATH, build_tables())
+    logger.info(f"Wrote {TABLES_PATH} in {time.perf_counter() - started:.1f}s")
@@ -1,251 +1,15 @@
-def rotate_90_counterClockwise(face) -> list:
-    # Transpose
-    transpose = [[face[row][col] for row in range(len(face))] for col in range(len(face[0]))]
-    # Reverse each col
-    rotated = transpose[::-1]
-    return rotated
+from rubik.moves import move_permutation
 
-def rotate_90_clockwise(face) -> list:
-    # Transpose 
-    transpose = [[face[row][col] for row in range(len(face))] for col in range(len(face[0]))]
-    # Reverse each row
-    rotated = [row[::-1] for row in transpose]
-    return rotated
 
 def rotate_face(cube, face, clockwise, extra_layer) -> None:
-    if face == "U":
-        # Collect rows to be rotated (for U face, row 0)
-        if extra_layer == 0: # For bigger cube
-            rows = [cube.faces['red'][0], cube.faces['blue'][0], cube.faces['orange'][0], cube.faces['green'][0]]
-        else:
-            rows = [
-                [cube.faces['red'][i], cube.faces['blue'][i], cube.faces['orange'][i], cube.faces['green'][i]]
-                for i in range(extra_layer + 1)]
-        if clockwise: #Clockwise
-            # Clockwise 90-degree rotation
-            cube.faces['white'] = rotate_90_clockwise(cube.faces['white'])
-            if extra_layer > 0:
-                for i in range(len(rows)):
-                    cube.faces['red'][i], cube.faces['blue'][i], cube.faces['orange'][i], cube.faces['green'][i] = \
-                    rows[i][1], rows[i][2], rows[i][3], rows[i][0]
-            else:
-                cube.faces['red'][0], cube.faces['blue'][0], cube.faces['orange'][0], cube.faces['green'][0] = \
-                rows[1], rows[2], rows[3], rows[0]
-            
-        else: #CounterClockwise
-            cube.faces['white'] = rotate_90_counterClockwise(cube.faces['white'])
-            if extra_layer > 0:
-                for i in range(len(rows)):
-                    cube.faces['red'][i], cube.faces['blue'][i], cube.faces['orange'][i], cube.faces['green'][i] = \
-                    rows[i][-1], rows[i][0], rows[i][1], rows[i][2]
-            else:
-                cube.faces['red'][0], cube.faces['blue'][0], cube.faces['orange'][0], cube.faces['green'][0] = \
-                rows[-1], rows[0], rows[1], rows[2]
-            
-    elif face == "D":
-        # Collect rows to be rotated (for D face, row 2)
-        if extra_layer == 0: # For bigger cube
-            rows = [cube.faces['green'][cube.size-1], cube.faces['orange'][cube.size-1], cube.faces['blue'][cube.size-1], cube.faces['red'][cube.size-1]]
-        else:
-            rows = [
-                [cube.faces['green'][cube.size-1-i], cube.faces['orange'][cube.size-1-i], cube.faces['blue'][cube.size-1-i], cube.faces['red'][cube.size-1-i]]
-                for i in range(extra_layer + 1)]
-        if clockwise: # Clockwise
-            cube.faces['yellow'] = rotate_90_clockwise(cube.faces['yellow'])
-            if extra_layer > 0:
-                for i in range(len(rows)):
-                    cube.faces['green'][cube.size-1-i], cube.faces['orange'][cube.size-1-i], cube.faces['blue'][cube.size-1-i], cube.faces['red'][cube.size-1-i] = \
-                    rows[i][1], rows[i][2], rows[i][3], rows[i][0]
-            else:
-                cube.faces['green'][cube.size-1], cube.faces['orange'][cube.size-1], cube.faces['blue'][cube.size-1], cube.faces['red'][cube.size-1] = \
-                rows[1], rows[2], rows[3], rows[0]
-        else: # CounterClockwise
-            cube.faces['yellow'] = rotate_90_counterClockwise(cube.faces['yellow'])
-            if extra_layer > 0:
-                for i in range(len(rows)):
-                    cube.faces['green'][cube.size-1-i], cube.faces['orange'][cube.size-1-i], cube.faces['blue'][cube.size-1-i], cube.faces['red'][cube.size-1-i] = \
-                        rows[i][-1], rows[i][0], rows[i][1], rows[i][2]
-            else:
-                cube.faces['green'][cube.size-1], cube.faces['orange'][cube.size-1], cube.faces['blue'][cube.size-1], cube.faces['red'][cube.size-1] = \
-                    rows[-1], rows[0], rows[1], rows[2]
-    
-    if face == "R":
-        if clockwise:
-            cube.faces['red'] = rotate_90_clockwise(cube.faces['red'])
-            if extra_layer > 0: # For bigger cube
-                # Temporary storage for the right column of the green face
-                temp = [[cube.faces['green'][i][cube.size - 1 - j] for i in range(cube.size)] for j in range(extra_layer+1)]
-                
-                #anything have j in is inner/outer layer, i in is each pieces
-                for j in range(extra_layer+1):
-                    for i in range(cube.size):
-                        cube.faces['green'][i][cube.size - 1 - j] = cube.faces['yellow'][i][cube.size - 1 - j]
-                        cube.faces['yellow'][i][cube.size - 1 - j] = cube.faces['blue'][cube.size - 1 - i][j]
-                        cube.faces['blue'][cube.size - 1 - i][j] = cube.faces['white'][i][cube.size - 1 - j]
-                for j in range(extra_layer+1):
-                    for i in range(cube.size):
-                        cube.faces['white'][i][cube.size - 1 - j] = temp[j][i]
-            else:
-                temp = [cube.faces['green'][i][cube.size - 1] for i in range(cube.size)]
-
-                for i in range(cube.size):
-                    cube.faces['green'][i][cube.size - 1] = cube.faces['yellow'][i][cube.size - 1]
-                    cube.faces['yellow'][i][cube.size - 1] = cube.faces['blue'][cube.size - 1 - i][0]
-                    cube.faces['blue'][cube.size - 1 - i][0] = cube.faces['white'][i][cube.size - 1]
-                for i in range(cube.size):
-                    cube.faces['white'][i][cube.size - 1] = temp[i]
-
-        else: # Counterclockwise rotation: reverse the order of rotations
-            cube.faces['red'] = rotate_90_counterClockwise(cube.faces['red'])
-            if extra_layer > 0:
-                temp = [[cube.faces['green'][i][cube.size - 1 - j] for i in range(cube.size)] for j in range(extra_layer+1)]
-                for j in range(extra_layer+1):
-                    for i in range(cube.size):
-                        cube.faces['green'][i][cube.size - 1 - j] = cube.faces['white'][i][cube.size - 1 - j]
-                        cube.faces['white'][i][cube.size - 1 - j] = cube.faces['blue'][cube.size - 1 - i][j]
-                        cube.faces['blue'][cube.size - 1 - i][j] = cube.faces['yellow'][i][cube.size - 1 - j]
-                    for i in range(cube.size):
-                        cube.faces['yellow'][i][cube.size - 1 - j] = temp[j][i]
-            else:
-                temp = [cube.faces['green'][i][cube.size - 1] for i in range(cube.size)]
-                
-                for i in range(cube.size):
-                    cube.faces['green'][i][cube.size - 1] = cube.faces['white'][i][cube.size - 1]
-                    cube.faces['white'][i][cube.size - 1] = cube.faces['blue'][cube.size - 1 - i][0]
-                    cube.faces['blue'][cube.size - 1 - i][0] = cube.faces['yellow'][i][cube.size - 1]
-                for i in range(cube.size):
-                    cube.faces['yellow'][i][cube.size - 1] = temp[i]
-
-    if face == "L":
-        if clockwise:
-            cube.faces['orange'] = rotate_90_clockwise(cube.faces['orange'])
-            if extra_layer > 0:
-                temp = [[cube.faces['green'][i][j] for i in range(cube.size)] for j in range(extra_layer+1)]
-
-                for j in range(extra_layer+1):
-                    for i in range(cube.size):
-                        cube.faces['green'][i][j] = cube.faces['white'][i][j]
-                        cube.faces['white'][i][j] = cube.faces['blue'][cube.size - 1 - i][cube.size - 1 - j]
-                        cube.faces['blue'][cube.size - 1 - i][cube.size - 1 - j] = cube.faces['yellow'][i][j]               
-                    for i in range(cube.size):
-                        cube.faces['yellow'][i][j] = temp[j][i]
-            else:
-                # Temporary storage for the right column of the green face
-                temp = [cube.faces['green'][i][0] for i in range(cube.size)]
-
-                for i in range(cube.size):
-                    cube.faces['green'][i][0] = cube.faces['white'][i][0]
-                    cube.faces['white'][i][0] = cube.faces['blue'][cube.size - 1 - i][cube.size - 1]
-                    cube.faces['blue'][cube.size - 1 - i][cube.size - 1] = cube.faces['yellow'][i][0]               
-                for i in range(cube.size):
-                    cube.faces['yellow'][i][0] = temp[i]
-        else:
-            cube.faces['orange'] = rotate_90_counterClockwise(cube.faces['orange'])
-            if extra_layer > 0:
-                temp = [[cube.faces['green'][i][j] for i in range(cube.size)] for j in range(extra_layer+1)]
-                
-                for j in range(extra_layer+1):
-                    for i in range(cube.size):
-                        cube.faces['green'][i][j] = cube.faces['yellow'][i][j]
-                        cube.faces['yellow'][i][j] = cube.faces['blue'][cube.size - 1 - i][cube.size - 1 - j]
-                        cube.faces['blue'][cube.size - 1 - i][cube.size - 1 - j] = cube.faces['white'][i][j]
-                    for i in range(cube.size):
-                        cube.faces['white'][i][j] = temp[j][i]
-            else:
-                # Counterclockwise rotation: reverse the order of rotations
-                temp = [cube.faces['green'][i][0] for i in range(cube.size)]
-                
-                for i in range(cube.size):
-                    cube.faces['green'][i][0] = cube.faces['yellow'][i][0]
-                    cube.faces['yellow'][i][0] = cube.faces['blue'][cube.size - 1 - i][cube.size - 1]
-                    cube.faces['blue'][cube.size - 1 - i][cube.size - 1] = cube.faces['white'][i][0]
-                for i in range(cube.size):
-                    cube.faces['white'][i][0] = temp[i]
-
-    if face == "F":
-        if clockwise:
-            cube.faces['green'] = rotate_90_clockwise(cube.faces['green'])
-            if extra_layer > 0:
-                temp = [[cube.faces['white'][cube.size - 1 - j][i] for i in range(cube.size)] for j in range(extra_layer+1)]
-                for j in range(extra_layer+1):
-                    for i in range(cube.size):
-                        cube.faces['white'][cube.size - 1 - j][i] = cube.faces['orange'][cube.size - 1 - i][cube.size - 1 - j]  
-                        cube.faces['orange'][cube.size - 1 - i][cube.size - 1 - j] = cube.faces['yellow'][j][cube.size - 1 - i] 
-                        cube.faces['yellow'][j][cube.size - 1 - i] = cube.faces['red'][i][j]
-                    for i in range(cube.size):
-                        cube.faces['red'][i][j] = temp[j][i]
-            else:
-                # Temporary storage for the bottom row of the U (Upper) face
-                temp = [cube.faces['white'][cube.size - 1][i] for i in range(cube.size)]
-                
-                for i in range(cube.size):
-                    cube.faces['white'][cube.size - 1][i] = cube.faces['orange'][cube.size - 1 - i][cube.size - 1]  
-                    cube.faces['orange'][cube.size - 1 - i][cube.size - 1] = cube.faces['yellow'][0][cube.size - 1 - i] 
-                    cube.faces['yellow'][0][cube.size - 1 - i] = cube.faces['red'][i][0]
-                for i in range(cube.size):
-                    cube.faces['red'][i][0] = temp[i]    
-        else:
-            cube.faces['green'] = rotate_90_counterClockwise(cube.faces['green'])
-            if extra_layer > 0:
-                temp = [[cube.faces['white'][cube.size - 1 - j][i] for i in range(cube.size)] for j in range(extra_layer+1)]
-                for j in range(extra_layer+1):
-                    for i in range(cube.size):
-                        cube.faces['white'][cube.size - 1 - j][i] = cube.faces['red'][i][j]  
-                        cube.faces['red'][i][j] = cube.faces['yellow'][j][cube.size - 1 - i]  
-                        cube.faces['yellow'][j][cube.size - 1 - i] = cube.faces['orange'][cube.size - 1 - i][cube.size - 1 - j]  
-                    for i in range(cube.size):
-                        cube.faces['orange'][cube.size - 1 - i][cube.size - 1 - j] = temp[j][i] 
-            else:
-                # Temporary storage for the bottom row of the U (Upper) face
-                temp = cube.faces['white'][cube.size - 1][:]
-
-                for i in range(cube.size):
-                    cube.faces['white'][cube.size - 1][i] = cube.faces['red'][i][0]  
-                    cube.faces['red'][i][0] = cube.faces['yellow'][0][cube.size - 1 - i]  
-                    cube.faces['yellow'][0][cube.size - 1 - i] = cube.faces['orange'][cube.size - 1 - i][cube.size - 1]  
-                for i in range(cube.size):
-                    cube.faces['orange'][cube.size - 1 - i][cube.size - 1] = temp[i]  
-    
-    if face == "B":
-        if clockwise:
-            cube.faces['blue'] = rotate_90_clockwise(cube.faces['blue'])
-            if extra_layer > 0:
-                temp = [[cube.faces['white'][j][i] for i in range(cube.size)] for j in range(extra_layer+1)]
-                for j in range(extra_layer+1):
-                    for i in range(cube.size):
-                        cube.faces['white'][j][i] = cube.faces['red'][i][cube.size - 1 - j]
-                        cube.faces['red'][i][cube.size - 1 - j] = cube.faces['yellow'][cube.size - 1 - j][cube.size - 1 - i]
-                        cube.faces['yellow'][cube.size - 1 - j][cube.size - 1 - i] = cube.faces['orange'][cube.size - 1 - i][j]
-                    for i in range(cube.size):
-                        cube.faces['orange'][i][j] = temp[j][cube.size - 1 - i]
-            else: 
-                # Temporary storage for the bottom row of the U (Upper) face
-                temp = cube.faces['white'][0][:]
-
-                for i in range(cube.size):
-                    cube.faces['white'][0][i] = cube.faces['red'][i][cube.size - 1]
-                    cube.faces['red'][i][cube.size - 1] = cube.faces['yellow'][cube.size - 1][cube.size - 1 - i]
-                    cube.faces['yellow'][cube.size - 1][cube.size - 1 - i] = cube.faces['orange'][cube.size - 1 - i][0]
-                for i in range(cube.size):
-                    cube.faces['orange'][i][0] = temp[cube.size - 1 - i]
-        else:
-            cube.faces['blue'] = rotate_90_counterClockwise(cube.faces['blue'])
-            if extra_layer > 0:
-                temp = [[cube.faces['white'][j][i] for i in range(cube.size)] for j in range(extra_layer+1)]
-                for j in range(extra_layer+1):
-                    for i in range(cube.size):
-                        cube.faces['white'][j][i] = cube.faces['orange'][cube.size - 1 - i][j]
-                        cube.faces['orange'][cube.size - 1 - i][j] = cube.faces['yellow'][cube.size - 1 - j][cube.size - 1 - i]
-                        cube.faces['yellow'][cube.size - 1 - j][cube.size - 1 - i] = cube.faces['red'][i][cube.size - 1 - j]
-                    for i in range(cube.size):
-                        cube.faces['red'][i][cube.size - 1 - j] = temp[j][i]
-            else:
-                # Temporary storage for the bottom row of the U (Upper) face
-                temp = cube.faces['white'][0][:]
-
-                for i in range(cube.size):
-                    cube.faces['white'][0][i] = cube.faces['orange'][cube.size - 1 - i][0]
-                    cube.faces['orange'][cube.size - 1 - i][0] = cube.faces['yellow'][cube.size - 1][cube.size - 1 - i]
-                    cube.faces['yellow'][cube.size - 1][cube.size - 1 - i] = cube.faces['red'][i][cube.size - 1]
-                for i in range(cube.size):
-                    cube.faces['red'][i][cube.size - 1] = temp[i]
\ No newline at end of file
+    """
+    Turns one face of the cube (and optionally the layers behind it) by a quarter turn.
+
+    Args:
+        cube (Cube): The cube to modify in place.
+        face (str): The face to turn (U, R, F, D, L or B).
+        clockwise (bool): True for a clockwise turn, False for counterclockwise.
+        extra_layer (int): Number of inner layers turned along with the face (0 for a face turn).
+    """
+    permutation = move_permutation(cube.size, face, 1 if clockwise else 3, extra_layer + 1)
+    cube.state = cube.state[permutation]
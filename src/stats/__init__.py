@@ -1 +1,2 @@
-from .personal_best import *
\ No newline at end of file
+from .personal_best import *
+from .averages import *
\ No newline at end of file
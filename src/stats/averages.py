@@ -0,0 +1,104 @@
+import bisect
+import math
+
+
+def trim_count(size: int) -> int:
+    """
+    Number of times removed from each end of an average of size times under WCA rules:
+    1 below Ao12, then 5% of the times rounded up (1 for Ao12, 3 for Ao50, 5 for Ao100).
+
+    Raises:
+        ValueError: If size is below 3, which leaves nothing to average.
+    """
+    if size < 3:
+        raise ValueError(f"An average needs at least 3 times, got {size}")
+    return 1 if size < 12 else math.ceil(size / 20)
+
+
+def _scale(times: list[float]) -> tuple[list[int], int, int]:
+    """
+    Converts times to integers with one common power-of-two denominator, so that window
+    sums are exact however many times are added and removed.
+
+    Returns:
+        tuple: The scaled times, the denominator, and the value standing for DNF
+            (greater than any scaled time).
+    """
+    ratios = [None if time == math.inf else float(time).as_integer_ratio() for time in times]
+    scale = max((ratio[1] for ratio in ratios if ratio), default=1)
+    scaled = [None if ratio is None else ratio[0] * (scale // ratio[1]) for ratio in ratios]
+    dnf = max((value for value in scaled if value is not None), default=0) + 1
+    return [dnf if value is None else value for value in scaled], scale, dnf
+
+
+def rolling_aoN(times: list[float], n: int) -> list[float]:
+    """
+    Calculates the WCA average of every n consecutive times, e.g. every Ao5 of a session.
+
+    The window is kept sorted as times enter and leave it (a binary search and one list
+    shift each), along with the exact sums of its trim and n - trim smallest times, so
+    no window is ever sorted or summed again. The list shifts make this O(len(times) * n)
+    rather than linear, but for the sizes in use (n up to 100) each one is a small
+    memmove, cheaper in pure Python than the O(log n) steps of heaps with lazy deletion.
+    Results match calculate_wca_avg for Ao5 and Ao12, and are exactly rounded.
+
+    Args:
+        times: Times in solve order. DNF should be represented as float('inf').
+        n: The size of the average (e.g., 5, 12, 50 or 100).
+    Returns:
+        list[float]: The average of times[i:i + n] at index i, float('inf') where the
+            window holds more DNFs than are trimmed; empty if fewer than n times.
+    Raises:
+        ValueError: If n is below 3.
+    """
+    trim = trim_count(n)
+    if len(times) < n:
+        return []
+    scaled, scale, dnf = _scale(times)
+    divisor = scale * (n - 2 * trim)
+
+    window: list[int] = []
+    # Sums of the trim and n - trim smallest times of the window; the average is their
+    # difference, since DNFs sort last and are all trimmed unless the average is DNF
+    low = high = 0
+    dnfs = 0
+    averages = []
+    for i, value in enumerate(scaled):
+        if i >= n:
+            leaving = scaled[i - n]
+            position = bisect.bisect_left(window, leaving)
+            # The next larger time moves into the smallest ones
+            if position < trim:
+                low += window[trim] - leaving
+            if position < n - trim:
+                high += window[n - trim] - leaving
+            del window[position]
+            dnfs -= leaving == dnf
+
+        position = bisect.bisect_right(window, value)
+        window.insert(position, value)
+        dnfs += value == dnf
+        # The entering time pushes the largest of the smallest ones out
+        if position < trim:
+            low += value - (window[trim] if len(window) > trim else 0)
+        if position < n - trim:
+            high += value - (window[n - trim] if len(window) > n - trim else 0)
+
+        if i >= n - 1:
+            averages.append(math.inf if dnfs > trim else (high - low) / divisor)
+    return averages
+
+
+def best_aoN(times: list[float], n: int) -> float | None:
+    """
+    Finds the best WCA average of n consecutive times, e.g. a personal best Ao100.
+
+    Args:
+        times: Times in solve order. DNF should be represented as float('inf').
+        n: The size of the average.
+    Returns:
+        float: The best average.
+        None: If there are fewer than n times or every average is DNF.
+    """
+    averages = [average for average in rolling_aoN(times, n) if average != math.inf]
+    return min(averages) if averages else None
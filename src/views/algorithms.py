@@ -1,8 +1,8 @@
+import asyncio
 import discord
-import json
-import os
-from azure.storage.blob import BlobServiceClient
-from paths import DATA_DIR
+from views.attachment_cache import attachment_urls
+from views.image_cache import case_images
+from views.registry import REGISTRY
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,8 +17,6 @@ class AlgorithmsView(discord.ui.View):
         user_id,
         userName,
         initial_group=None,
-        blob_service_client=None,
-        container=None,
     ) -> None:
         """
         Initialize the AlgorithmsView.
@@ -29,8 +27,6 @@ class AlgorithmsView(discord.ui.View):
             user_id (int): The ID of the user who initiated the command.
             userName (str): The name of the user.
             initial_group (str, optional): The initial group to display. Defaults to None.
-            blob_service_client (BlobServiceClient, optional): The Azure Blob Service Client.
-            container (str, optional): The container name.
         """
         super().__init__(timeout=timeout)
         self.mode = mode
@@ -39,56 +35,9 @@ class AlgorithmsView(discord.ui.View):
         self.current_page = 0
         self.algorithms_list = []  # List of tuples (id, alg_string)
         self.current_group = initial_group
-        self.blob_service_client = blob_service_client
-        self.container = container
-        self.images = {}
-
-        self.OLL_GROUPS = {
-            "Awkward Shape": ["29", "30", "41", "42"],
-            "Big Lightning Bolt": ["39", "40"],
-            "C Shape": ["34", "46"],
-            "Corners Oriented": ["28", "57"],
-            "Cross": ["21", "22", "23", "24", "25", "26", "27"],
-            "Dot": ["1", "2", "3", "4", "17", "18", "19", "20"],
-            "Fish Shape": ["9", "10", "35", "37"],
-            "I Shape": ["51", "52", "55", "56"],
-            "P Shape": ["31", "32", "43", "44"],
-            "Small L Shape": ["47", "48", "49", "50", "53", "54"],
-            "Small Lightning Bolt": ["7", "8", "11", "12"],
-            "W Shape": ["36", "38"],
-            "T Shape": ["33", "45"],
-        }
-        self.PLL_GROUPS = {
-            "Adjacent Corner Swap": [
-                "Aa",
-                "Ab",
-                "F",
-                "Ga",
-                "Gb",
-                "Gc",
-                "Gd",
-                "Ja",
-                "Jb",
-                "Ra",
-                "Rb",
-                "T",
-            ],
-            "Diagonal Corner Swap": ["E", "Na", "Nb", "V", "Y"],
-            "Edges Only": ["H", "Ua", "Ub", "Z"],
-        }
-
-        # Load data
-        # Use DATA_DIR from paths.py for absolute path
-        json_path = DATA_DIR / "algorithms.json"
 
-        try:
-            with open(json_path, "r") as f:
-                self.alg_data = json.load(f)
-        except FileNotFoundError:
-            # Fallback
-            logger.error("Could not find algorithms.json")
-            self.alg_data = {}
-            return
+        # Shared, pre-indexed algorithms of this mode
+        self.algorithm_set = REGISTRY[mode]
 
         # Setup Select Menu
         self.setup_select_menu()
@@ -99,23 +48,14 @@ class AlgorithmsView(discord.ui.View):
 
     def setup_select_menu(self) -> None:
         """
-        Dynamically sets up the select menu options based on the mode (OLL or PLL).
+        Sets up the select menu with the prebuilt group options of the mode (OLL or PLL).
         """
-        options = []
-        groups = self.OLL_GROUPS if self.mode == "oll" else self.PLL_GROUPS
-
-        # Sort keys for consistent order
-        sorted_groups = sorted(groups.keys())
-
-        for group in sorted_groups:
-            options.append(discord.SelectOption(label=group, value=group))
-
         # Create the Select item
         select = discord.ui.Select(
             placeholder="Choose a group...",
             min_values=1,
             max_values=1,
-            options=options,
+            options=list(self.algorithm_set.select_options),
             row=0,
         )
         # Set the callback function for the select menu
@@ -136,7 +76,6 @@ class AlgorithmsView(discord.ui.View):
             return
         # Get the selected group from the interaction data
         selected_group = interaction.data["values"][0]
-        # Defer update to allow time for image downloading
         await interaction.response.defer()
 
         self.load_group(selected_group)
@@ -147,50 +86,17 @@ class AlgorithmsView(discord.ui.View):
 
     def load_group(self, group_name) -> None:
         """
-        Loads the algorithms for the specified group into algorithms_list and fetches images.
+        Loads the algorithms for the specified group into algorithms_list.
 
         Args:
             group_name (str): The name of the group to load.
         """
-        groups = self.OLL_GROUPS if self.mode == "oll" else self.PLL_GROUPS
-        data_key = self.mode
-
-        if group_name not in groups:
+        if group_name not in self.algorithm_set.groups:
             self.algorithms_list = []
             return
 
-        # Get the algorithm IDs for the selected group
-        alg_ids = groups[group_name]
-        # Get the full algorithm data
-        full_data = self.alg_data.get(data_key, {})
-
-        # Load the algorithms into algorithms_list
-        self.algorithms_list = []
-        for alg_id in alg_ids:
-            alg_str = full_data.get(alg_id, "Not found")
-            self.algorithms_list.append((alg_id, alg_str))
-
-        # Download images if client is available
-        if self.blob_service_client and self.container:
-            import io
-
-            for alg_id, alg_str in self.algorithms_list:
-                # Avoid re-downloading if already present
-                if alg_id in self.images:
-                    continue
-
-                try:
-                    blob_name = f"{self.mode}/{alg_id}.png"
-                    blob_client = self.blob_service_client.get_blob_client(
-                        container=self.container, blob=blob_name
-                    )
-
-                    stream = io.BytesIO()
-                    blob_client.download_blob().readinto(stream)
-                    stream.seek(0)
-                    self.add_image(alg_id, stream)
-                except Exception as e:
-                    logger.error(f"Error loading image for {blob_name}: {e}")
+        # (id, alg_string) pairs of the group, indexed once by the registry
+        self.algorithms_list = self.algorithm_set.group_algorithms[group_name]
 
         self.current_page = 0
 
@@ -198,10 +104,16 @@ class AlgorithmsView(discord.ui.View):
         """
         Updates the view with the current embed and button states.
 
+        The interaction is answered without waiting on the network: a case image without
+        an uploaded URL is attached to this page and uploaded in the background.
+
         Args:
             interaction (discord.Interaction): The interaction object.
         """
         self.update_buttons()
+        if self.algorithms_list:
+            alg_id, _ = self.algorithms_list[self.current_page]
+            attachment_urls.ensure_in_background(self.mode, alg_id)
         embed, file = self.get_embed()
         if interaction.response.is_done():
             if file:
@@ -223,17 +135,21 @@ class AlgorithmsView(discord.ui.View):
                     embed=embed, view=self, attachments=[]
                 )
 
-    def add_image(self, alg_id, image_data) -> None:
+    async def prepare_image(self, timeout: float = 2.0) -> None:
         """
-        Adds an image data (bytes) for a specific algorithm ID.
+        Makes sure the current case image has an uploaded CDN URL to reference.
 
         Args:
-            alg_id (str): The algorithm ID.
-            image_data (io.BytesIO): The image data.
+            timeout (float): Seconds to wait for a first upload; it finishes in the
+                background after that, and this page attaches the image instead.
         """
-        if not hasattr(self, "images"):
-            self.images = {}
-        self.images[alg_id] = image_data
+        if not self.algorithms_list:
+            return
+        alg_id, _ = self.algorithms_list[self.current_page]
+        try:
+            await asyncio.wait_for(asyncio.shield(attachment_urls.ensure(self.mode, alg_id)), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Upload of case image {self.mode} {alg_id} is slow, attaching it instead")
 
     def get_embed(self) -> tuple[discord.Embed, discord.File | None]:
         """
@@ -267,9 +183,13 @@ class AlgorithmsView(discord.ui.View):
         )
 
         file = None
-        if hasattr(self, "images") and alg_id in self.images:
-            image_stream = self.images[alg_id]
-            image_stream.seek(0)
+        # Reference the image uploaded once to the asset channel when there is one
+        image_url = attachment_urls.get(self.mode, alg_id)
+        # Otherwise attach it; case images are prefetched into memory and shared by every view
+        image_stream = None if image_url else case_images.get(self.mode, alg_id)
+        if image_url:
+            embed.set_image(url=image_url)
+        elif image_stream is not None:
             file = discord.File(fp=image_stream, filename=f"{alg_id}.png")
             embed.set_image(url=f"attachment://{alg_id}.png")
 
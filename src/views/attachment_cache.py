@@ -0,0 +1,161 @@
+"""
+Upload-once CDN URLs for the case images shown by AlgorithmsView.
+
+Each case image is uploaded a single time, as its own message in an asset channel
+(ASSET_CHANNEL_ID), and the CDN URL Discord returns is remembered. Embeds then
+reference that URL, so paging through a view or opening a new one sends no file.
+Attachment URLs are signed and expire (the hex "ex" query parameter); shortly before
+that, the asset message is fetched again for a freshly signed URL, and the image is
+only uploaded again if that message is gone.
+
+Without an asset channel every lookup misses and views upload the image with each
+page, as before.
+"""
+
+import asyncio
+import logging
+import time
+from urllib.parse import parse_qs, urlparse
+
+import discord
+
+from views.image_cache import case_images
+
+logger = logging.getLogger(__name__)
+
+# Refresh URLs this many seconds before Discord's signature expires
+REFRESH_MARGIN = 60 * 60
+
+
+def url_expiry(url: str) -> float:
+    """
+    Reads the expiry time of a signed Discord CDN URL.
+
+    Args:
+        url (str): An attachment URL.
+
+    Returns:
+        float: The expiry as a UNIX timestamp (infinity for unsigned URLs).
+    """
+    expires = parse_qs(urlparse(url).query).get("ex")
+    try:
+        return float(int(expires[0], 16)) if expires else float("inf")
+    except ValueError:
+        return float("inf")
+
+
+class AttachmentUrlCache:
+    """
+    Maps (mode, case id) to the CDN URL of its image in the asset channel.
+    """
+
+    def __init__(self, refresh_margin: float = REFRESH_MARGIN) -> None:
+        """
+        Initializes an unconfigured cache (every lookup misses until configure()).
+
+        Args:
+            refresh_margin (float): Seconds before expiry at which a URL is refreshed.
+        """
+        self.refresh_margin = refresh_margin
+        self.bot = None
+        self.channel_id = None
+        self._channel = None
+        self._urls: dict[tuple[str, str], tuple[str, float]] = {}  # URL and its expiry
+        self._messages: dict[tuple[str, str], int] = {}  # Asset message holding the image
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+        self._uploads: set[asyncio.Task] = set()  # Background ensure() calls, kept until done
+
+    def configure(self, bot: discord.Client, channel_id: int | None) -> None:
+        """
+        Sets the asset channel images are uploaded to.
+
+        Args:
+            bot (discord.Client): The bot, used to resolve the channel.
+            channel_id (int | None): The asset channel ID, or None to disable uploads.
+        """
+        self.bot = bot
+        self.channel_id = channel_id
+        self._channel = None
+
+    def get(self, mode: str, alg_id: str) -> str | None:
+        """
+        Returns the cached URL of a case image if it is not about to expire.
+        """
+        entry = self._urls.get((mode, alg_id))
+        if entry is None or entry[1] - self.refresh_margin <= time.time():
+            return None
+        return entry[0]
+
+    def _remember(self, key: tuple[str, str], message: discord.Message) -> str | None:
+        if not message.attachments:
+            return None
+        url = message.attachments[0].url
+        self._urls[key] = (url, url_expiry(url))
+        self._messages[key] = message.id
+        return url
+
+    async def _get_channel(self):
+        if self._channel is None:
+            self._channel = self.bot.get_channel(self.channel_id) or await self.bot.fetch_channel(self.channel_id)
+        return self._channel
+
+    async def ensure(self, mode: str, alg_id: str) -> str | None:
+        """
+        Returns a valid URL for a case image, refreshing or uploading it if needed.
+
+        Args:
+            mode (str): "oll" or "pll".
+            alg_id (str): The case id.
+
+        Returns:
+            str | None: The CDN URL, or None if no asset channel is configured or the
+            upload failed (callers then attach the image instead).
+        """
+        if self.bot is None or self.channel_id is None:
+            return None
+        url = self.get(mode, alg_id)
+        if url is not None:
+            return url
+
+        key = (mode, alg_id)
+        # One upload per image, however many views ask for it at once
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            url = self.get(mode, alg_id)
+            if url is not None:
+                return url
+            try:
+                channel = await self._get_channel()
+
+                # A fresh fetch of the asset message re-signs its attachment URL
+                if key in self._messages:
+                    try:
+                        message = await channel.fetch_message(self._messages[key])
+                        url = self._remember(key, message)
+                        if url is not None:
+                            return url
+                    except discord.NotFound:
+                        del self._messages[key]
+
+                image = case_images.get(mode, alg_id)
+                if image is None:
+                    return None
+                message = await channel.send(file=discord.File(fp=image, filename=f"{mode}_{alg_id}.png"))
+                return self._remember(key, message)
+            except discord.HTTPException as e:
+                logger.error(f"Failed to upload case image {mode} {alg_id}: {e}")
+                return None
+
+    def ensure_in_background(self, mode: str, alg_id: str) -> None:
+        """
+        Starts ensure() for a case image without waiting for it, unless its URL is cached,
+        e.g. so a button press is answered at once with the image attached instead.
+        """
+        if self.bot is None or self.channel_id is None or self.get(mode, alg_id) is not None:
+            return
+        task = asyncio.get_running_loop().create_task(self.ensure(mode, alg_id))
+        self._uploads.add(task)
+        task.add_done_callback(self._uploads.discard)
+
+
+# Shared by every AlgorithmsView
+attachment_urls = AttachmentUrlCache()
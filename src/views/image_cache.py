@@ -0,0 +1,161 @@
+"""
+Process-wide cache of the OLL/PLL case images shown by AlgorithmsView.
+
+Every case image is loaded once, ahead of time, by prefetch() in the bot's setup_hook:
+rendered locally (see rubik.cases) off the event loop, or downloaded concurrently with
+the async Azure Blob client for cases that cannot be rendered. Views only ever read
+bytes from memory. Downloaded images remember their ETag, so revalidate() can cheaply
+re-download just the blobs that changed.
+"""
+
+import asyncio
+import logging
+from io import BytesIO
+
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceNotModifiedError
+
+from rubik.cases import case_image
+from rubik.render_cache import RenderCache
+from views.registry import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Byte budget of the cached images, and how many blobs are downloaded at once
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+DEFAULT_CONCURRENCY = 8
+
+
+class CaseImageCache:
+    """
+    A bounded, in-memory store of case images keyed by (mode, case id).
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, concurrency: int = DEFAULT_CONCURRENCY) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_bytes (int): Maximum total size of the cached images.
+            concurrency (int): Maximum number of simultaneous blob downloads.
+        """
+        self.concurrency = concurrency
+        self._images = RenderCache(max_bytes)
+        self._etags: dict[tuple[str, str], str] = {}  # ETag of every downloaded image
+
+    @staticmethod
+    def _key(mode: str, alg_id: str) -> bytes:
+        return RenderCache.make_key("case_image", mode, alg_id)
+
+    def get(self, mode: str, alg_id: str) -> BytesIO | None:
+        """
+        Returns a case image from memory.
+
+        Args:
+            mode (str): "oll" or "pll".
+            alg_id (str): The case id.
+
+        Returns:
+            BytesIO | None: A fresh stream over the image, or None if it is not loaded.
+        """
+        return self._images.get(self._key(mode, alg_id))
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters, e.g. for logging.
+        """
+        return self._images.stats()
+
+    async def _render(self, mode: str, alg_id: str) -> bool:
+        """
+        Renders one case image in the default executor and stores it.
+
+        Returns:
+            bool: True if the case could be rendered locally.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            image = await loop.run_in_executor(None, case_image, mode, alg_id)
+        except Exception as e:
+            logger.error(f"Error rendering image for {mode} {alg_id}: {e}")
+            return False
+        if image is None:
+            return False
+        self._images.put(self._key(mode, alg_id), image.getvalue())
+        return True
+
+    async def _download(
+        self, blob_service_client, container: str, mode: str, alg_id: str, semaphore: asyncio.Semaphore
+    ) -> bool:
+        """
+        Downloads one case image, skipping the body if its ETag is unchanged.
+
+        Returns:
+            bool: True if new image bytes were stored.
+        """
+        blob_name = f"{mode}/{alg_id}.png"
+        etag = self._etags.get((mode, alg_id))
+        async with semaphore:
+            try:
+                blob_client = blob_service_client.get_blob_client(container=container, blob=blob_name)
+                if etag and self.get(mode, alg_id) is not None:
+                    downloader = await blob_client.download_blob(
+                        etag=etag, match_condition=MatchConditions.IfModified
+                    )
+                else:
+                    downloader = await blob_client.download_blob()
+                data = await downloader.readall()
+            except ResourceNotModifiedError:
+                return False
+            except Exception as e:
+                logger.error(f"Error loading image for {blob_name}: {e}")
+                return False
+
+        self._images.put(self._key(mode, alg_id), data)
+        self._etags[(mode, alg_id)] = downloader.properties.etag
+        return True
+
+    async def prefetch(self, blob_service_client=None, container: str | None = None) -> None:
+        """
+        Loads the image of every registered case into memory.
+
+        Args:
+            blob_service_client (azure.storage.blob.aio.BlobServiceClient, optional):
+                Async client for cases that cannot be rendered locally.
+            container (str, optional): The blob container name.
+        """
+        cases = [(mode, alg_id) for mode, algorithm_set in REGISTRY.items() for alg_id in algorithm_set.algorithms]
+        rendered = await asyncio.gather(*(self._render(mode, alg_id) for mode, alg_id in cases))
+        missing = [case for case, ok in zip(cases, rendered) if not ok]
+
+        if missing and blob_service_client and container:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            await asyncio.gather(
+                *(self._download(blob_service_client, container, mode, alg_id, semaphore) for mode, alg_id in missing)
+            )
+
+        logger.info(f"Prefetched case images: {self.stats()}")
+
+    async def revalidate(self, blob_service_client, container: str) -> int:
+        """
+        Re-downloads the blob-sourced images whose ETag has changed (or that were evicted).
+
+        Args:
+            blob_service_client (azure.storage.blob.aio.BlobServiceClient): Async blob client.
+            container (str): The blob container name.
+
+        Returns:
+            int: The number of images refreshed.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        refreshed = await asyncio.gather(
+            *(
+                self._download(blob_service_client, container, mode, alg_id, semaphore)
+                for mode, alg_id in list(self._etags)
+            )
+        )
+        return sum(refreshed)
+
+
+# Shared by every AlgorithmsView
+case_images = CaseImageCache()
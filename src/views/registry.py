@@ -0,0 +1,108 @@
+"""
+Process-wide registry of the OLL and PLL algorithms shown by AlgorithmsView.
+
+algorithms.json is loaded and validated once, on import, and indexed by group so
+that views only look things up. The registry is read-only and shared by every view;
+a malformed file fails at startup instead of on each command.
+"""
+
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+import discord
+
+from rubik.cases import load_algorithms
+from rubik.compiler import tokenize
+
+OLL_GROUPS = {
+    "Awkward Shape": ("29", "30", "41", "42"),
+    "Big Lightning Bolt": ("39", "40"),
+    "C Shape": ("34", "46"),
+    "Corners Oriented": ("28", "57"),
+    "Cross": ("21", "22", "23", "24", "25", "26", "27"),
+    "Dot": ("1", "2", "3", "4", "17", "18", "19", "20"),
+    "Fish Shape": ("9", "10", "35", "37"),
+    "I Shape": ("51", "52", "55", "56"),
+    "P Shape": ("31", "32", "43", "44"),
+    "Small L Shape": ("47", "48", "49", "50", "53", "54"),
+    "Small Lightning Bolt": ("7", "8", "11", "12"),
+    "W Shape": ("36", "38"),
+    "T Shape": ("33", "45"),
+}
+PLL_GROUPS = {
+    "Adjacent Corner Swap": ("Aa", "Ab", "F", "Ga", "Gb", "Gc", "Gd", "Ja", "Jb", "Ra", "Rb", "T"),
+    "Diagonal Corner Swap": ("E", "Na", "Nb", "V", "Y"),
+    "Edges Only": ("H", "Ua", "Ub", "Z"),
+}
+
+
+class AlgorithmSet(NamedTuple):
+    """
+    The algorithms of one mode ("oll" or "pll"), indexed for the views.
+    """
+
+    mode: str
+    groups: Mapping[str, tuple[str, ...]]
+    algorithms: Mapping[str, str]
+    group_algorithms: Mapping[str, tuple[tuple[str, str], ...]]
+    select_options: tuple[discord.SelectOption, ...]
+
+
+def build_algorithm_set(mode: str, groups: dict[str, tuple[str, ...]], algorithms: dict[str, str]) -> AlgorithmSet:
+    """
+    Validates and indexes the algorithms of one mode.
+
+    Args:
+        mode (str): "oll" or "pll".
+        groups (dict[str, tuple[str, ...]]): Case ids of every group.
+        algorithms (dict[str, str]): Algorithm string of every case id.
+
+    Returns:
+        AlgorithmSet: The read-only, indexed algorithms.
+
+    Raises:
+        ValueError: If a grouped case has no algorithm or an algorithm does not parse.
+    """
+    for alg_id, algorithm in algorithms.items():
+        try:
+            tokenize(algorithm)
+        except ValueError as e:
+            raise ValueError(f"Invalid {mode.upper()} {alg_id} algorithm: {e}") from e
+
+    group_algorithms = {}
+    for group, alg_ids in groups.items():
+        missing = [alg_id for alg_id in alg_ids if alg_id not in algorithms]
+        if missing:
+            raise ValueError(f"No {mode.upper()} algorithm for {', '.join(missing)} ({group})")
+        group_algorithms[group] = tuple((alg_id, algorithms[alg_id]) for alg_id in alg_ids)
+
+    # Sort keys for consistent order
+    select_options = tuple(discord.SelectOption(label=group, value=group) for group in sorted(groups))
+
+    return AlgorithmSet(
+        mode=mode,
+        groups=MappingProxyType(dict(groups)),
+        algorithms=MappingProxyType(dict(algorithms)),
+        group_algorithms=MappingProxyType(group_algorithms),
+        select_options=select_options,
+    )
+
+
+def load_registry() -> Mapping[str, AlgorithmSet]:
+    """
+    Loads algorithms.json and builds the algorithm set of every mode.
+
+    Returns:
+        Mapping[str, AlgorithmSet]: The algorithm sets, keyed by mode.
+    """
+    data = load_algorithms()
+    return MappingProxyType(
+        {
+            "oll": build_algorithm_set("oll", OLL_GROUPS, data.get("oll", {})),
+            "pll": build_algorithm_set("pll", PLL_GROUPS, data.get("pll", {})),
+        }
+    )
+
+
+# Loaded once per process
+REGISTRY = load_registry()
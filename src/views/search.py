@@ -0,0 +1,142 @@
+"""
+In-memory search index over the OLL/PLL algorithms, for /alg and its autocomplete.
+
+Each case gets a lowercase search text (mode, id, case name, group and moves). Short
+query words are looked up in a prefix index over the words of that text, longer ones
+through a trigram index followed by a substring check; every word must match. Cases
+are numbered shortest algorithm first, and posting lists are kept in that order, so
+results come out sorted by move count without sorting at query time.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+from discord import app_commands
+
+from rubik.compiler import MoveCounts, count_moves
+from views.registry import REGISTRY
+
+# Discord shows at most 25 autocomplete choices, with names of up to 100 characters
+MAX_CHOICES = 25
+MAX_CHOICE_NAME = 100
+
+
+class SearchEntry(NamedTuple):
+    """
+    One searchable case.
+    """
+
+    mode: str
+    alg_id: str
+    name: str
+    group: str
+    algorithm: str
+    counts: MoveCounts
+    text: str
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class AlgorithmIndex:
+    """
+    Prefix and trigram index over every registered case.
+    """
+
+    def __init__(self, registry=REGISTRY) -> None:
+        """
+        Builds the index.
+
+        Args:
+            registry (Mapping[str, AlgorithmSet]): The algorithm sets to index.
+        """
+        entries = []
+        for mode, algorithm_set in registry.items():
+            group_of = {alg_id: group for group, alg_ids in algorithm_set.groups.items() for alg_id in alg_ids}
+            for alg_id, algorithm in algorithm_set.algorithms.items():
+                name = f"{alg_id} Perm" if mode == "pll" else f"OLL {alg_id}"
+                group = group_of.get(alg_id, "")
+                text = " ".join((mode, alg_id, name, group, algorithm)).lower()
+                entries.append(SearchEntry(mode, alg_id, name, group, algorithm, count_moves(algorithm), text))
+
+        # Shortest first, so index order is result order
+        entries.sort(key=lambda entry: (entry.counts, entry.mode, entry.alg_id))
+        self.entries = tuple(entries)
+        self._by_value = {f"{entry.mode}:{entry.alg_id}".lower(): index for index, entry in enumerate(entries)}
+
+        prefixes: dict[str, list[int]] = {}
+        trigrams: dict[str, list[int]] = {}
+        for index, entry in enumerate(entries):
+            words = set(entry.text.split())
+            for prefix in {word[:length] for word in words for length in range(1, len(word) + 1)}:
+                prefixes.setdefault(prefix, []).append(index)
+            for trigram in _trigrams(entry.text):
+                trigrams.setdefault(trigram, []).append(index)
+        self._prefixes = {key: tuple(value) for key, value in prefixes.items()}
+        self._trigrams = {key: tuple(value) for key, value in trigrams.items()}
+
+        self.choices = tuple(
+            app_commands.Choice(name=self._choice_name(entry), value=f"{entry.mode}:{entry.alg_id}")
+            for entry in entries
+        )
+        self.autocomplete = lru_cache(maxsize=1024)(self._autocomplete)
+
+    @staticmethod
+    def _choice_name(entry: SearchEntry) -> str:
+        group = f" ({entry.group})" if entry.group else ""
+        name = f"{entry.name}{group} [{entry.counts.htm} HTM]: {entry.algorithm}"
+        return name if len(name) <= MAX_CHOICE_NAME else name[: MAX_CHOICE_NAME - 1] + "…"
+
+    def _word_matches(self, word: str) -> tuple[int, ...]:
+        if len(word) < 3:
+            return self._prefixes.get(word, ())
+        candidates = None
+        for trigram in _trigrams(word):
+            postings = self._trigrams.get(trigram, ())
+            if candidates is None or len(postings) < len(candidates):
+                candidates = postings
+        return tuple(index for index in candidates if word in self.entries[index].text)
+
+    def search(self, query: str, limit: int = MAX_CHOICES) -> list[int]:
+        """
+        Finds the cases matching every word of a query, shortest algorithm first.
+
+        Args:
+            query (str): Free text, e.g. "t perm", "oll 21", "cross" or "r u r'".
+            limit (int): Maximum number of results.
+
+        Returns:
+            list[int]: Indices into entries.
+        """
+        words = query.lower().split()
+        if not words:
+            return list(range(min(limit, len(self.entries))))
+
+        matches = sorted((self._word_matches(word) for word in words), key=len)
+        # Walk the smallest posting list in index order, checking the others
+        others = [set(match) for match in matches[1:]]
+        results = []
+        for index in matches[0]:
+            if all(index in other for other in others):
+                results.append(index)
+                if len(results) == limit:
+                    break
+        return results
+
+    def _autocomplete(self, current: str) -> tuple[app_commands.Choice[str], ...]:
+        return tuple(self.choices[index] for index in self.search(current))
+
+    def lookup(self, query: str) -> SearchEntry | None:
+        """
+        Resolves an autocomplete value ("pll:T") or free text to its best matching case.
+        """
+        index = self._by_value.get(query.strip().lower())
+        if index is None:
+            results = self.search(query, limit=1)
+            index = results[0] if results else None
+        return None if index is None else self.entries[index]
+
+
+# Built once per process
+ALGORITHM_INDEX = AlgorithmIndex()
@@ -3,7 +3,7 @@ import logging
 import discord
 
 from stats import update_user_pbs
-from database import DatabaseManager
+from database import AsyncDatabase, UserIdentityCache, set_query_tag
 from stats.personal_best import calculate_wca_avg, update_user_average_best
 
 logger = logging.getLogger(__name__)
@@ -22,7 +22,8 @@ class TimerView(discord.ui.View):
         user_id: int,
         userName: str,
         puzzle: str,
-        db_manager: DatabaseManager,
+        db: AsyncDatabase,
+        user_ids: UserIdentityCache,
     ) -> None:
         """
         Initialize the TimerView.
@@ -32,52 +33,33 @@ class TimerView(discord.ui.View):
             user_id (int): The Discord ID of the user who started the timer.
             userName (str): The name of the user.
             puzzle (str): The type of puzzle being timed (e.g., '3x3').
-            db_manager: The database manager instance.
+            db (AsyncDatabase): The async database access layer.
+            user_ids (UserIdentityCache): Maps Discord IDs to internal UserIDs.
         """
         super().__init__(timeout=timeout)
         self.user_id = user_id
         self.user_name = userName
         self.puzzle = puzzle
-        self.db_manager = db_manager
+        self.db = db
+        self.user_ids = user_ids
         self.message = None
         self.is_daily = is_daily
         self.start_time = None
         self.end_time = None
         self.base_time = 0.0
         self.solve_status = "Completed"  # Completed, +2, DNF
+        self.db_id = None
 
-        # Check if the user exists in the database, if not create a new entry
-        self.db_id = self._get_or_create_user()
-
-    def _get_or_create_user(self) -> int:
+    async def _get_or_create_user(self) -> int | None:
         """
         Retrieves the internal UserID from the database, creating a new user record if necessary.
 
         Returns:
-            int: The UserID from the database.
+            int | None: The UserID from the database, or None on a database error.
         """
         try:
-            # Check for existing user
-            self.db_manager.cursor.execute(
-                "SELECT UserID FROM Users WHERE DiscordID=?", (self.user_id,)
-            )
-            db_id = self.db_manager.cursor.fetchval()
-
-            if not db_id:
-                # Insert new user if not found
-                self.db_manager.cursor.execute(
-                    "INSERT INTO Users(UserName, DiscordID) VALUES(?, ?)",
-                    (self.user_name, self.user_id),
-                )
-                self.db_manager.connection.commit()
-
-                # Fetch the newly created UserID
-                self.db_manager.cursor.execute(
-                    "SELECT UserID FROM Users WHERE DiscordID=?", (self.user_id,)
-                )
-                db_id = self.db_manager.cursor.fetchval()
-
-            return db_id
+            # Served from memory for known users, otherwise a single upsert
+            return await self.user_ids.get_or_create(self.user_id, self.user_name)
         except Exception as e:
             logger.error(f"Error in _get_or_create_user: {e}")
             return None
@@ -238,11 +220,16 @@ class TimerView(discord.ui.View):
         """
         Saves the result to the database and shows statistics.
         """
+        set_query_tag("confirm_callback")
         # Calculate final time based on status
         final_time = self.base_time
         if self.solve_status == "+2":
             final_time += 2
         
+        # Check if the user exists in the database, if not create a new entry
+        if self.db_id is None:
+            self.db_id = await self._get_or_create_user()
+
         # Save the result to the database
         if self.db_id is None:
             logger.error("Cannot save solve time: User database ID is missing.")
@@ -253,49 +240,48 @@ class TimerView(discord.ui.View):
             return
 
         try:
-            # Save the solve time to the database
-            self.db_manager.cursor.execute(
-                "INSERT INTO SolveTimes(UserID, SolveTime, PuzzleType, SolveStatus) VALUES(?, ?, ?, ?)",
-                (self.db_id, final_time, self.puzzle, self.solve_status),
-            )
-            self.db_manager.connection.commit()
-            
-            # Update the user's personal best if this solve is better
-            # Note: DNF is handled by passing status-aware time or handling it in update_user_pbs logic
-            # Current update_user_pbs assumes float time. DNF usually effectively infinite.
-            # We will pass float('inf') for DNF for PB calculation
-            calc_time = final_time if self.solve_status != "DNF" else float('inf')
-            
-            is_new_pb = update_user_pbs(self.db_manager, self.db_id, self.puzzle, calc_time)
-
-            # Fetch last 15 solves for the specific puzzle to calculate averages
-            self.db_manager.cursor.execute(
-                "SELECT TOP 15 SolveTime, SolveStatus FROM SolveTimes WHERE UserID=? AND PuzzleType=? ORDER BY SolveAt DESC, TimeID DESC",
-                (self.db_id, self.puzzle)
-            )
-            rows = self.db_manager.cursor.fetchall()
-
-            raw_times = []
-            for r in rows:
-                t = float(r[0])
-                s = r[1]
-                if s == "DNF":
-                    raw_times.append(float('inf'))
-                else:
-                    raw_times.append(t)
-
-            ao5 = calculate_wca_avg(raw_times, 5)
-            ao12 = calculate_wca_avg(raw_times, 12)
-            
-            is_new_ao5, is_new_ao12 = update_user_average_best(self.db_manager, self.db_id, self.puzzle, ao5, ao12)
-            
-            # Saving to daily
-            if self.is_daily:
-                self.db_manager.cursor.execute(
-                    "INSERT INTO DailySolves (UserID, SolveTime, SolveStatus)" \
-                    "VALUES (?,?,?)",(self.db_id, final_time, self.solve_status)
+            async with self.db.transaction() as tx:
+                # Save the solve time to the database
+                await tx.execute(
+                    "INSERT INTO SolveTimes(UserID, SolveTime, PuzzleType, SolveStatus) VALUES(?, ?, ?, ?)",
+                    self.db_id, final_time, self.puzzle, self.solve_status,
+                )
+
+                # Update the user's personal best if this solve is better
+                # Note: DNF is handled by passing status-aware time or handling it in update_user_pbs logic
+                # Current update_user_pbs assumes float time. DNF usually effectively infinite.
+                # We will pass float('inf') for DNF for PB calculation
+                calc_time = final_time if self.solve_status != "DNF" else float('inf')
+
+                is_new_pb = await tx.run(update_user_pbs, self.db_id, self.puzzle, calc_time)
+
+                # Fetch last 15 solves for the specific puzzle to calculate averages
+                rows = await tx.fetchall(
+                    self.db.queries.recent_solve_times, self.db_id, self.puzzle,
                 )
-                self.db_manager.cursor.commit()
+
+                raw_times = []
+                for r in rows:
+                    t = float(r[0])
+                    s = r[1]
+                    if s == "DNF":
+                        raw_times.append(float('inf'))
+                    else:
+                        raw_times.append(t)
+
+                ao5 = calculate_wca_avg(raw_times, 5)
+                ao12 = calculate_wca_avg(raw_times, 12)
+
+                is_new_ao5, is_new_ao12 = await tx.run(
+                    update_user_average_best, self.db_id, self.puzzle, ao5, ao12
+                )
+
+                # Saving to daily
+                if self.is_daily:
+                    await tx.execute(
+                        "INSERT INTO DailySolves (UserID, SolveTime, SolveStatus)" \
+                        "VALUES (?,?,?)", self.db_id, final_time, self.solve_status
+                    )
 
         except Exception as e:
             logger.error(f"Error saving solve time to database: {e}")
@@ -0,0 +1,31 @@
+import asyncio
+
+import pytest
+from database.async_db import AsyncDatabase
+from database.sqlite_storage import SqliteStorage
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def storage_sizes():
+    """Minimum and maximum size of the storage fixture's connection pool; override per module or test."""
+    return 0, 1
+
+
+@pytest.fixture
+def storage(tmp_path, storage_sizes):
+    """A connected SQLite backend in a temporary file."""
+    min_size, max_size = storage_sizes
+    storage = SqliteStorage(tmp_path / "cubecrafter.db", min_size=min_size, max_size=max_size)
+    storage.connect()
+    yield storage
+    storage.close()
+
+
+@pytest.fixture
+def db(storage):
+    """An AsyncDatabase on the storage fixture."""
+    return AsyncDatabase(storage)
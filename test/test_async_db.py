@@ -0,0 +1,97 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+from conftest import run
+from database.async_db import AsyncDatabase
+from database.sqlite_storage import SqliteStorage
+
+
+def count_users(storage) -> int:
+    with sqlite3.connect(storage.path) as connection:
+        return connection.execute("SELECT COUNT(*) FROM Users").fetchone()[0]
+
+
+class TestAsyncDatabase:
+    """Tests for the async database façade."""
+
+    def test_execute_and_fetch(self, storage):
+        db = AsyncDatabase(storage)
+
+        async def scenario():
+            assert await db.execute("INSERT INTO Users(DiscordID, UserName) VALUES(?, ?)", 42, "cuber") == 1
+            assert await db.fetchval("SELECT UserID FROM Users WHERE DiscordID = ?", 42) == 1
+            assert await db.fetchone("SELECT DiscordID FROM Users") == (42,)
+            assert await db.fetchall("SELECT DiscordID FROM Users") == [(42,)]
+            assert await db.fetchval("SELECT UserID FROM Users WHERE DiscordID = ?", 7) is None
+
+        run(scenario())
+
+    def test_statements_run_off_the_event_loop(self, storage):
+        db = AsyncDatabase(storage)
+
+        async def scenario():
+            return await db.run(lambda cursor: threading.current_thread().name)
+
+        assert run(scenario()).startswith("db")
+
+    def test_transaction_commits(self, storage):
+        db = AsyncDatabase(storage)
+
+        async def scenario():
+            async with db.transaction() as tx:
+                await tx.execute("INSERT INTO Users(DiscordID, UserName) VALUES(?, ?)", 1, "a")
+                await tx.execute("INSERT INTO Users(DiscordID, UserName) VALUES(?, ?)", 2, "b")
+
+        run(scenario())
+        assert count_users(storage) == 2
+        assert storage.stats()["in_use"] == 0
+
+    def test_transaction_rolls_back_on_error(self, storage):
+        db = AsyncDatabase(storage)
+
+        async def scenario():
+            async with db.transaction() as tx:
+                await tx.execute("INSERT INTO Users(DiscordID, UserName) VALUES(?, ?)", 1, "a")
+                raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            run(scenario())
+        assert count_users(storage) == 0
+        assert storage.stats()["idle"] == 1
+
+    def test_units_of_work_queue_for_a_connection(self, storage):
+        db = AsyncDatabase(storage)
+        release = threading.Event()
+
+        async def scenario():
+            slow = asyncio.create_task(db.run(lambda cursor: release.wait(5)))
+            waiting = asyncio.create_task(db.fetchval("SELECT 1"))
+            await asyncio.sleep(0.05)
+            stats = db.stats()
+            release.set()
+            assert await waiting == 1
+            await slow
+            return stats
+
+        stats = run(scenario())
+        assert stats["running"] == 1
+        assert stats["waiting"] == 1
+        assert db.stats()["running"] == 0
+
+    @pytest.mark.parametrize("storage_sizes", [(0, 2)])
+    def test_units_of_work_run_concurrently(self, db):
+        both_running = threading.Barrier(2, timeout=5)
+
+        async def scenario():
+            # Deadlocks (and the barrier times out) unless both run at once
+            await asyncio.gather(*(db.run(lambda cursor: both_running.wait()) for _ in range(2)))
+
+        run(scenario())
+        assert db.stats()["connections"]["size"] == 2
+
+    def test_not_connected(self, tmp_path):
+        db = AsyncDatabase(SqliteStorage(tmp_path / "test.db"))
+        with pytest.raises(ConnectionError):
+            run(db.fetchval("SELECT 1"))
@@ -0,0 +1,99 @@
+import asyncio
+import time
+import pytest
+from views.attachment_cache import AttachmentUrlCache, url_expiry
+from views.image_cache import case_images
+
+
+@pytest.fixture(scope="module", autouse=True)
+def prefetched_images():
+    asyncio.run(case_images.prefetch())
+
+
+def signed_url(expires_at):
+    return f"https://cdn.discordapp.com/attachments/1/2/case.png?ex={int(expires_at):x}&is=0&hm=abc"
+
+
+class FakeMessage:
+    def __init__(self, message_id, url):
+        self.id = message_id
+        self.attachments = [type("Attachment", (), {"url": url})()]
+
+
+class FakeChannel:
+    """Signs URLs for `lifetime` seconds from now, like the Discord CDN."""
+
+    def __init__(self, lifetime):
+        self.lifetime = lifetime
+        self.uploads = 0
+        self.fetches = 0
+
+    async def send(self, file):
+        self.uploads += 1
+        return FakeMessage(self.uploads, signed_url(time.time() + self.lifetime))
+
+    async def fetch_message(self, message_id):
+        self.fetches += 1
+        return FakeMessage(message_id, signed_url(time.time() + self.lifetime))
+
+
+class FakeBot:
+    def __init__(self, channel):
+        self.channel = channel
+
+    def get_channel(self, channel_id):
+        return self.channel
+
+
+class TestAttachmentUrlCache:
+    """Tests for the upload-once case image URLs."""
+
+    def test_url_expiry(self):
+        assert url_expiry(signed_url(1700000000)) == 1700000000
+        assert url_expiry("https://cdn.discordapp.com/attachments/1/2/case.png") == float("inf")
+
+    def test_disabled_without_channel(self):
+        cache = AttachmentUrlCache()
+        assert asyncio.run(cache.ensure("pll", "Ua")) is None
+
+    def test_uploads_once(self):
+        channel = FakeChannel(lifetime=24 * 3600)
+        cache = AttachmentUrlCache()
+        cache.configure(FakeBot(channel), 123)
+
+        async def flip_pages():
+            return await asyncio.gather(*(cache.ensure("pll", "Ua") for _ in range(5)))
+
+        urls = asyncio.run(flip_pages())
+        assert len(set(urls)) == 1
+        assert cache.get("pll", "Ua") == urls[0]
+        assert channel.uploads == 1
+
+    def test_expiring_url_is_refetched_not_reuploaded(self):
+        channel = FakeChannel(lifetime=60)
+        cache = AttachmentUrlCache(refresh_margin=3600)
+        cache.configure(FakeBot(channel), 123)
+
+        asyncio.run(cache.ensure("oll", "1"))
+        # The URL is inside the refresh margin, so it is not served as is
+        assert cache.get("oll", "1") is None
+        asyncio.run(cache.ensure("oll", "1"))
+        assert channel.uploads == 1
+        assert channel.fetches == 1
+
+    def test_ensure_in_background(self):
+        channel = FakeChannel(lifetime=24 * 3600)
+        cache = AttachmentUrlCache()
+        cache.configure(FakeBot(channel), 123)
+
+        async def next_page():
+            cache.ensure_in_background("oll", "21")
+            # Not uploaded yet: the page attaches the image
+            assert cache.get("oll", "21") is None
+            await asyncio.gather(*cache._uploads)
+            cache.ensure_in_background("oll", "21")
+            assert not cache._uploads
+
+        asyncio.run(next_page())
+        assert cache.get("oll", "21") is not None
+        assert channel.uploads == 1
@@ -0,0 +1,73 @@
+import math
+import random
+from fractions import Fraction
+
+import pytest
+from stats.averages import best_aoN, rolling_aoN, trim_count
+from stats.personal_best import calculate_wca_avg
+
+DNF = float("inf")
+
+
+def brute_force_avg(window: list[float]) -> float:
+    trim = trim_count(len(window))
+    if sum(time == DNF for time in window) > trim:
+        return DNF
+    counted = sorted(window)[trim : len(window) - trim]
+    return float(sum(map(Fraction, counted)) / len(counted))
+
+
+def random_times(count: int, dnf_rate: float, seed: int) -> list[float]:
+    rng = random.Random(seed)
+    return [DNF if rng.random() < dnf_rate else round(rng.uniform(6, 20), 2) for _ in range(count)]
+
+
+class TestRollingAverages:
+    """Tests for the sliding-window WCA averages."""
+
+    def test_trim_count(self):
+        assert [trim_count(size) for size in (3, 5, 11, 12, 20, 21, 50, 100, 1000)] == [1, 1, 1, 1, 1, 2, 3, 5, 50]
+        with pytest.raises(ValueError):
+            trim_count(2)
+
+    @pytest.mark.parametrize("n", [5, 12])
+    def test_matches_calculate_wca_avg(self, n):
+        for seed in range(20):
+            times = random_times(60, 0.1, seed)
+            expected = [calculate_wca_avg(times[i : i + n], n) for i in range(len(times) - n + 1)]
+            assert rolling_aoN(times, n) == pytest.approx(expected)
+
+    @pytest.mark.parametrize("n", [3, 25, 50, 100])
+    def test_matches_brute_force(self, n):
+        times = random_times(400, 0.05, n)
+        expected = [brute_force_avg(times[i : i + n]) for i in range(len(times) - n + 1)]
+        assert rolling_aoN(times, n) == expected
+
+    def test_ao100_over_a_long_history(self):
+        times = random_times(20000, 0.02, 100)
+        averages = rolling_aoN(times, 100)
+        assert len(averages) == len(times) - 99
+        for i in range(0, len(averages), 199):
+            assert averages[i] == brute_force_avg(times[i : i + 100])
+        assert best_aoN(times, 100) == min(average for average in averages if average != DNF)
+
+    def test_dnfs_within_the_trim(self):
+        times = [10.0] * 47 + [DNF] * 3
+        assert rolling_aoN(times, 50) == [10.0]
+        assert rolling_aoN(times[1:] + [DNF], 50) == [DNF]
+
+    def test_averages_are_exact(self):
+        # A running float sum would drift away from 0.3 here
+        times = [0.1, 0.2, 0.3, 0.4, 0.5] * 200
+        assert set(rolling_aoN(times, 5)) == {0.3}
+
+    def test_too_few_times(self):
+        assert rolling_aoN([10.0] * 4, 5) == []
+        assert best_aoN([10.0] * 4, 5) is None
+
+    def test_best_aoN(self):
+        times = [12.0, 11.0, DNF, DNF, 10.0, 9.0, 13.0, 8.0, 7.0]
+        assert best_aoN(times, 5) == pytest.approx(min(
+            avg for avg in (calculate_wca_avg(times[i : i + 5], 5) for i in range(5)) if avg != DNF
+        ))
+        assert best_aoN([DNF] * 6, 5) is None
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from PIL import Image
+from rubik import cases
+from rubik.compiler import compile_scramble
+
+ALGORITHMS = [(mode, alg_id, alg) for mode in cases.MODES for alg_id, alg in cases.load_algorithms()[mode].items()]
+
+
+class TestCases:
+    """Tests for the locally rendered OLL/PLL case images."""
+
+    def test_all_cases_present(self):
+        assert sum(mode == "oll" for mode, _, _ in ALGORITHMS) == 57
+        assert sum(mode == "pll" for mode, _, _ in ALGORITHMS) == 21
+
+    @pytest.mark.parametrize("mode, alg_id, algorithm", ALGORITHMS)
+    def test_algorithm_solves_its_case(self, mode, alg_id, algorithm):
+        state = cases.case_state(algorithm)
+        faces = state.reshape(6, 9)
+        # Held yellow on top and green in front, with the first two layers solved
+        assert faces[0, 4] == cases.YELLOW
+        assert (faces[3] == faces[3, 4]).all()
+        assert all((faces[face, 3:] == faces[face, 4]).all() for face in (1, 2, 4, 5))
+        solved = state[compile_scramble(3, algorithm)].reshape(6, 9)
+        assert all(len(set(face)) == 1 for face in solved.tolist())
+
+    def test_oll_image_is_two_tone(self):
+        image = Image.open(cases.case_image("oll", "1")).convert("RGB")
+        colors = {color for _, color in image.getcolors()}
+        assert colors == {(255, 255, 0), (128, 128, 128), (0, 0, 0), (255, 255, 255)}
+
+    def test_case_image_is_cached_on_disk(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cases, "CASES_DIR", tmp_path)
+        assert cases.build_case_images() == 78
+        assert cases.build_case_images() == 0
+        assert (tmp_path / "pll" / "Ua.png").exists()
+
+    def test_unknown_case(self):
+        assert cases.case_image("pll", "Zz") is None
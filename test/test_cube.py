@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+from rubik.cube import Cube, scramble_batch
+from rubik.moves import move_permutation, solved_state
+from rubik.compiler import Move, compile_scramble, tokenize
+
+
+class TestMovePermutation:
+    """Tests for the cached sticker permutation tables."""
+
+    @pytest.mark.parametrize("size", range(2, 8))
+    @pytest.mark.parametrize("face", "URFDLB")
+    def test_four_quarter_turns_are_identity(self, size, face):
+        state = np.arange(6 * size * size)
+        for _ in range(4):
+            state = state[move_permutation(size, face)]
+        assert np.array_equal(state, np.arange(6 * size * size))
+
+    def test_half_turn_is_two_quarter_turns(self):
+        quarter = move_permutation(5, "R", 1, 2)
+        assert np.array_equal(move_permutation(5, "R", 2, 2), quarter[quarter])
+
+    def test_tables_are_cached_and_read_only(self):
+        table = move_permutation(4, "U", 3, 2)
+        assert move_permutation(4, "U", 3, 2) is table
+        assert not table.flags.writeable
+
+    def test_too_many_layers_raises(self):
+        with pytest.raises(ValueError):
+            move_permutation(3, "R", 1, 4)
+
+
+class TestCube:
+    """Tests for Cube scrambling on top of the flat sticker array."""
+
+    def test_new_cube_is_solved(self):
+        cube = Cube(4)
+        assert np.array_equal(cube.state, solved_state(4))
+        assert cube.faces["white"] == [["white"] * 4 for _ in range(4)]
+
+    def test_sexy_move_has_order_six(self):
+        cube = Cube(3)
+        cube.scrambleCube("R U R' U' " * 6)
+        assert np.array_equal(cube.state, solved_state(3))
+
+    def test_r_moves_front_column_to_top(self):
+        cube = Cube(3)
+        cube.scrambleCube("R")
+        assert [row[2] for row in cube.faces["white"]] == ["green"] * 3
+        assert [row[2] for row in cube.faces["green"]] == ["yellow"] * 3
+        assert [row[0] for row in cube.faces["blue"]] == ["white"] * 3
+
+    def test_u_moves_front_row_to_left(self):
+        cube = Cube(3)
+        cube.scrambleCube("U")
+        assert cube.faces["orange"][0] == ["green"] * 3
+        assert cube.faces["green"][0] == ["red"] * 3
+
+    def test_wide_moves_turn_inner_layers(self):
+        cube = Cube(6)
+        cube.scrambleCube("3Rw")
+        assert [row[3] for row in cube.faces["white"]] == ["green"] * 6
+        assert [row[2] for row in cube.faces["white"]] == ["white"] * 6
+
+    def test_scramble_then_inverse_is_solved(self):
+        cube = Cube(7)
+        cube.scrambleCube("3Fw2 Uw' R L2 3Bw D' Rw2")
+        cube.scrambleCube("Rw2 D 3Bw' L2 R' Uw 3Fw2")
+        assert np.array_equal(cube.state, solved_state(7))
+
+
+class TestCompileScramble:
+    """Tests for the scramble compiler and its cache."""
+
+    def test_compiled_matches_move_by_move(self):
+        scramble = "Rw U2 3Fw' L D2 B' Uw R2 R"
+        expected = solved_state(6)
+        for move in scramble.split():
+            expected = expected[compile_scramble(6, move)]
+        assert np.array_equal(solved_state(6)[compile_scramble(6, scramble)], expected)
+
+    def test_consecutive_turns_are_merged(self):
+        assert tokenize("R R2 U U' F'") == (Move("R", 3, 1), Move("F", 3, 1))
+
+    def test_compiled_scrambles_are_cached(self):
+        assert compile_scramble(3, "R U R'") is compile_scramble(3, "R U R'")
+
+    def test_invalid_move_raises(self):
+        with pytest.raises(ValueError):
+            tokenize("R 2")
+
+    @pytest.mark.parametrize(
+        "size, move, equivalent",
+        [
+            (3, "M", "x' R L'"),
+            (3, "E", "y' U D'"),
+            (3, "S", "z F' B"),
+            (3, "2R", "M'"),
+            (3, "r", "Rw"),
+            (5, "3Rw", "R 2R 3R"),
+            (5, "x", "3Rw 2L' L'"),
+        ],
+    )
+    def test_slices_and_rotations(self, size, move, equivalent):
+        assert np.array_equal(compile_scramble(size, move), compile_scramble(size, equivalent))
+
+    def test_inner_slice_notation(self):
+        assert tokenize("2R 3Rw' (U 3r2)") == (
+            Move("R", 1, 1, 2), Move("R", 3, 3), Move("U", 1, 1), Move("R", 2, 3),
+        )
+
+    def test_middle_slice_needs_odd_cube(self):
+        with pytest.raises(ValueError):
+            compile_scramble(4, "M")
+
+
+class TestScrambleBatch:
+    """Tests for applying many scrambles at once."""
+
+    def test_batch_matches_individual_cubes(self):
+        scrambles = ["R U R' U'", "Fw2 D' 3Lw", "", "B2 B2 Uw"]
+        states = scramble_batch(6, scrambles)
+        assert states.shape == (4, 6 * 6 * 6)
+        for scramble, state in zip(scrambles, states):
+            cube = Cube(6)
+            cube.scrambleCube(scramble)
+            assert np.array_equal(state, cube.state)
+
+    def test_empty_batch(self):
+        assert scramble_batch(3, []).shape == (0, 54)
@@ -0,0 +1,37 @@
+import io
+import pytest
+from PIL import Image
+from rubik.cube import Cube
+from rubik.draw import draw_rubiks_cube
+
+
+def open_rgb(buffer: io.BytesIO) -> Image.Image:
+    return Image.open(buffer).convert("RGB")
+
+
+class TestDrawRubiksCube:
+    """Tests for the vectorized cube net renderer."""
+
+    def test_returns_png_at_position_zero(self):
+        result = draw_rubiks_cube(Cube(3))
+        assert result.tell() == 0
+        assert Image.open(result).format == "PNG"
+
+    @pytest.mark.parametrize("size, expected", [(2, (615, 460)), (3, (615, 460)), (7, (603, 451))])
+    def test_net_dimensions(self, size, expected):
+        assert open_rgb(draw_rubiks_cube(Cube(size))).size == expected
+
+    def test_sticker_colors_and_grid(self):
+        cube = Cube(3)
+        cube.scrambleCube("R")
+        img = open_rgb(draw_rubiks_cube(cube))
+        # U face starts at x=155; its right column now shows the F (green) stickers
+        assert img.getpixel((155 + 125, 25)) == (0, 255, 0)
+        assert img.getpixel((155 + 25, 25)) == (255, 255, 255)
+        # Sticker edges are black grid lines, the gaps between faces stay white
+        assert img.getpixel((155 + 50, 25)) == (0, 0, 0)
+        assert img.getpixel((152, 200)) == (255, 255, 255)
+
+    def test_custom_total_size(self):
+        img = open_rgb(draw_rubiks_cube(Cube(3), total_size=300))
+        assert img.size == (300 * 4 + 15, 300 * 3 + 10)
@@ -0,0 +1,59 @@
+import random
+import numpy as np
+import pytest
+from rubik.cube import Cube
+from rubik.encoding import canonical_key, encoded_size, pack_state, symmetric_states, unpack_state
+from rubik.scrambler import generate_scramble
+
+
+class TestPackState:
+    """Tests for the 3-bit sticker encoding."""
+
+    def test_sizes(self):
+        assert encoded_size(3) == 21
+        assert encoded_size(7) == 111
+        assert len(Cube(3).to_bytes()) == 21
+
+    @pytest.mark.parametrize("size", range(1, 8))
+    def test_round_trip(self, size):
+        cube = Cube(size)
+        if size > 1:
+            cube.scrambleCube(generate_scramble(size, random.Random(size)))
+        assert np.array_equal(Cube.from_bytes(cube.to_bytes(), size).state, cube.state)
+        assert np.array_equal(unpack_state(pack_state(cube.state), size), cube.state)
+
+    def test_wrong_length_raises(self):
+        with pytest.raises(ValueError):
+            unpack_state(bytes(20), 3)
+
+
+class TestCanonicalKey:
+    """Tests for canonical forms under rotation and mirror symmetry."""
+
+    def test_solved_is_canonical(self):
+        key, index = canonical_key(Cube(3).state, 3, mirror=True)
+        assert key == Cube(3).to_bytes()
+
+    def test_rotated_cases_share_a_key(self):
+        # R seen from the left side is F
+        first, second = Cube(3), Cube(3)
+        first.scrambleCube("R U")
+        second.scrambleCube("F U")
+        assert canonical_key(first.state, 3)[0] == canonical_key(second.state, 3)[0]
+
+    def test_mirror_needs_mirror_symmetries(self):
+        first, second = Cube(3), Cube(3)
+        first.scrambleCube("R U")
+        second.scrambleCube("L' U'")
+        assert canonical_key(first.state, 3)[0] != canonical_key(second.state, 3)[0]
+        assert canonical_key(first.state, 3, mirror=True)[0] == canonical_key(second.state, 3, mirror=True)[0]
+
+    @pytest.mark.parametrize("size", [2, 3, 4])
+    def test_invariant_under_symmetry(self, size):
+        cube = Cube(size)
+        cube.scrambleCube(generate_scramble(size, random.Random(0)))
+        key, index = canonical_key(cube.state, size, mirror=True)
+        variants = symmetric_states(cube.state, size, mirror=True)
+        assert len(variants) == 48
+        assert pack_state(variants[index]) == key
+        assert all(canonical_key(variant, size, mirror=True)[0] == key for variant in variants)
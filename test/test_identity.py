@@ -0,0 +1,75 @@
+import asyncio
+
+from database import identity
+from database.identity import UserIdentityCache
+from database.storage import Queries
+
+QUERIES = Queries("recent_solves", "recent_solve_times", "upsert_user", "merge_usage")
+
+
+class FakeDatabase:
+    """Answers UserID queries from a dict, recording every statement."""
+
+    def __init__(self, users: dict[int, int]) -> None:
+        self.users = users
+        self.queries = QUERIES
+        self.statements = []
+
+    async def fetchval(self, sql, *params):
+        self.statements.append(sql)
+        discord_id = params[0]
+        if sql == QUERIES.upsert_user and discord_id not in self.users:
+            self.users[discord_id] = len(self.users) + 1
+        return self.users.get(discord_id)
+
+
+class TestUserIdentityCache:
+    """Tests for the Discord ID to UserID cache."""
+
+    def test_lookup_is_cached(self):
+        db = FakeDatabase({100: 1})
+        users = UserIdentityCache(db)
+        assert asyncio.run(users.lookup(100)) == 1
+        assert asyncio.run(users.lookup(100)) == 1
+        assert len(db.statements) == 1
+        assert users.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+    def test_unknown_users_are_not_cached(self):
+        db = FakeDatabase({})
+        users = UserIdentityCache(db)
+        assert asyncio.run(users.lookup(100)) is None
+        assert asyncio.run(users.get_or_create(100, "cuber")) == 1
+        assert asyncio.run(users.lookup(100)) == 1
+        assert db.statements.count(QUERIES.upsert_user) == 1
+        assert len(db.statements) == 2
+
+    def test_get_or_create_is_one_statement(self):
+        db = FakeDatabase({100: 7})
+        users = UserIdentityCache(db)
+        assert asyncio.run(users.get_or_create(100, "cuber")) == 7
+        assert db.statements == [QUERIES.upsert_user]
+
+    def test_entries_expire(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(identity.time, "monotonic", lambda: now[0])
+        users = UserIdentityCache(FakeDatabase({}), ttl=60)
+        users.put(100, 1)
+        assert users.get(100) == 1
+        now[0] += 61
+        assert users.get(100) is None
+
+    def test_least_recently_used_is_evicted(self):
+        users = UserIdentityCache(FakeDatabase({}), max_size=2)
+        users.put(1, 10)
+        users.put(2, 20)
+        users.get(1)
+        users.put(3, 30)
+        assert users.get(2) is None
+        assert users.get(1) == 10
+        assert users.get(3) == 30
+
+    def test_invalidate(self):
+        users = UserIdentityCache(FakeDatabase({}))
+        users.put(1, 10)
+        users.invalidate(1)
+        assert users.get(1) is None
@@ -0,0 +1,61 @@
+import asyncio
+from azure.core.exceptions import ResourceNotModifiedError
+from views import image_cache
+from views.image_cache import CaseImageCache
+
+
+class FakeDownloader:
+    def __init__(self, data, etag):
+        self.data = data
+        self.properties = type("Properties", (), {"etag": etag})()
+
+    async def readall(self):
+        return self.data
+
+
+class FakeBlobServiceClient:
+    """Serves every blob as b"v<version>" with ETag "<version>"."""
+
+    def __init__(self):
+        self.version = 1
+        self.downloads = 0
+
+    def get_blob_client(self, container, blob):
+        client = self
+
+        class FakeBlobClient:
+            async def download_blob(self, etag=None, match_condition=None):
+                if etag == str(client.version):
+                    raise ResourceNotModifiedError("not modified")
+                client.downloads += 1
+                return FakeDownloader(f"v{client.version}".encode(), str(client.version))
+
+        return FakeBlobClient()
+
+
+class TestCaseImageCache:
+    """Tests for the shared, prefetched case image cache."""
+
+    def test_prefetch_renders_every_case(self):
+        cache = CaseImageCache()
+        asyncio.run(cache.prefetch())
+        assert cache.stats()["entries"] == 57 + 21
+        assert cache.get("pll", "Ua").read(8) == b"\x89PNG\r\n\x1a\n"
+        assert cache.get("pll", "Zz") is None
+
+    def test_blob_fallback_and_etag_revalidation(self, monkeypatch):
+        # Pretend no case can be rendered locally, so everything comes from blobs
+        monkeypatch.setattr(image_cache, "case_image", lambda mode, alg_id: None)
+        client = FakeBlobServiceClient()
+        cache = CaseImageCache()
+
+        asyncio.run(cache.prefetch(client, "container"))
+        assert client.downloads == 78
+        assert cache.get("oll", "1").read() == b"v1"
+
+        assert asyncio.run(cache.revalidate(client, "container")) == 0
+        assert client.downloads == 78
+
+        client.version = 2
+        assert asyncio.run(cache.revalidate(client, "container")) == 78
+        assert cache.get("oll", "1").read() == b"v2"
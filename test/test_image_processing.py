@@ -10,7 +10,7 @@ def processor():
     """Create a RubiksCommands instance with minimal mocking for image tests."""
 
     class FakeBot:
-        db_manager = None
+        storage = None
 
     cmd = object.__new__(RubiksCommands)
     cmd.bot = FakeBot()
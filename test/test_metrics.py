@@ -0,0 +1,96 @@
+import asyncio
+import contextvars
+import logging
+import sqlite3
+
+import pytest
+from database.metrics import InstrumentedCursor, QueryMetrics, normalize_sql, query_tag, set_query_tag
+from stats.personal_best import get_user_pbs
+
+
+@pytest.fixture
+def cursor():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE Solves (UserID INTEGER, SolveTime REAL)")
+    connection.executemany("INSERT INTO Solves VALUES (?, ?)", [(1, 9.5), (1, 10.0), (2, 8.0)])
+    yield InstrumentedCursor(connection.cursor(), QueryMetrics(), tag="/time")
+    connection.close()
+
+
+def in_new_context(func, *args):
+    return contextvars.copy_context().run(func, *args)
+
+
+class TestQueryMetrics:
+    """Tests for the per-statement query instrumentation."""
+
+    def test_normalize_sql(self):
+        assert normalize_sql("SELECT TOP 15 *\n  FROM Users WHERE Name = 'x''y' AND DiscordID IN (?, ?,?)") == (
+            "SELECT TOP ? * FROM Users WHERE Name = ? AND DiscordID IN (?...)"
+        )
+        assert normalize_sql("SELECT BestAo5 FROM UserStats WHERE UserID = ?") == (
+            "SELECT BestAo5 FROM UserStats WHERE UserID = ?"
+        )
+
+    def test_query_tag(self):
+        def tags():
+            untagged = query_tag(get_user_pbs)
+            set_query_tag("/adjust_time")
+            return untagged, query_tag(), query_tag(get_user_pbs), query_tag(lambda cursor: None)
+
+        assert in_new_context(tags) == ("get_user_pbs", "/adjust_time", "/adjust_time > get_user_pbs", "/adjust_time")
+
+    def test_rows_and_calls_are_counted(self, cursor):
+        for user_id in (1, 2):
+            cursor.execute("SELECT SolveTime FROM Solves WHERE UserID = ?", (user_id,)).fetchall()
+        cursor.execute("SELECT COUNT(*) FROM Solves")
+        cursor.fetchone()
+        cursor.close()
+
+        summary = {s.sql: s for s in cursor._metrics.summary()}
+        solves = summary["SELECT SolveTime FROM Solves WHERE UserID = ?"]
+        assert (solves.tag, solves.calls, solves.rows, solves.errors) == ("/time", 2, 3, 0)
+        assert solves.p50_ms <= solves.p95_ms <= solves.max_ms
+        assert summary["SELECT COUNT(*) FROM Solves"].rows == 1
+
+    def test_errors_are_counted(self, cursor):
+        with pytest.raises(sqlite3.OperationalError):
+            cursor.execute("SELECT Missing FROM Solves")
+        [summary] = cursor._metrics.summary()
+        assert (summary.calls, summary.errors) == (1, 1)
+
+    def test_slow_queries_are_logged(self, caplog):
+        metrics = QueryMetrics(slow_query_ms=100)
+        with caplog.at_level(logging.WARNING, logger="database.metrics"):
+            metrics.record("/daily", "SELECT 1", 50, 1)
+            metrics.record("/daily", "SELECT  *\nFROM DailySolves WHERE SolveDate = '2025-03-09'", 150, 4)
+        assert [record.getMessage() for record in caplog.records] == [
+            "Slow query (150 ms, 4 rows, /daily): SELECT * FROM DailySolves WHERE SolveDate = ?"
+        ]
+
+    def test_time_between_statements_is_not_counted(self, db):
+
+        async def command():
+            async with db.transaction() as tx:
+                await tx.fetchall("SELECT UserID FROM Users")
+                await asyncio.sleep(0.3)
+                await tx.fetchval("SELECT COUNT(*) FROM Users")
+                await asyncio.sleep(0.3)
+
+        asyncio.run(command())
+        assert len(db.metrics.summary()) == 2
+        assert all(s.max_ms < 200 for s in db.metrics.summary())
+
+    def test_async_database_tags_statements(self, db):
+
+        async def command():
+            set_query_tag("/personal_bests")
+            await db.fetchval("SELECT COUNT(*) FROM Users")
+            await db.run(get_user_pbs, 1, "3x3")
+
+        asyncio.run(command())
+        assert {(s.tag, s.calls) for s in db.metrics.summary()} == {
+            ("/personal_bests", 1),
+            ("/personal_bests > get_user_pbs", 1),
+        }
+        assert "/personal_bests" in db.metrics.report()
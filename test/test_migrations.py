@@ -0,0 +1,70 @@
+import pytest
+from conftest import run
+from database.migrations import LATEST_VERSION, MIGRATIONS, migrate, schema_version
+from database.storage import BACKENDS
+from stats.personal_best import get_user_pbs, recalculate_user_pbs, update_user_pbs
+
+
+@pytest.fixture
+def storage_sizes():
+    return 1, 1
+
+
+def query_plan(db, sql: str, *params) -> str:
+    rows = run(db.fetchall(f"EXPLAIN QUERY PLAN {sql}", *params))
+    return " ".join(row[-1] for row in rows)
+
+
+class TestMigrations:
+    """Tests for the schema migration runner, on the SQLite backend."""
+
+    def test_every_dialect_has_every_migration(self):
+        assert [migration.version for migration in MIGRATIONS] == list(range(1, LATEST_VERSION + 1))
+        for migration in MIGRATIONS:
+            assert set(migration.statements) == set(BACKENDS)
+
+    def test_migrate_records_the_version(self, db):
+        assert run(db.run(schema_version, "sqlite")) == 0
+        assert run(migrate(db)) == list(range(1, LATEST_VERSION + 1))
+        assert run(db.run(schema_version, "sqlite")) == LATEST_VERSION
+        assert run(migrate(db)) == []
+
+    def test_target_version(self, db):
+        assert run(migrate(db, target=0)) == []
+        assert run(db.run(schema_version, "sqlite")) == 0
+
+    def test_duplicate_user_stats_are_merged(self, db):
+        run(db.execute("INSERT INTO Users (DiscordID, UserName) VALUES (?, ?)", 100, "cuber"))
+        run(db.execute("INSERT INTO UserStats (UserID, PuzzleType, BestSingle, BestAo5) VALUES (1, '3x3', 9.5, NULL)"))
+        run(db.execute("INSERT INTO UserStats (UserID, PuzzleType, BestSingle, BestAo5) VALUES (1, '3x3', 10.0, 11.2)"))
+        run(db.execute("INSERT INTO UserStats (UserID, PuzzleType, BestSingle) VALUES (1, '2x2', 3.0)"))
+        run(migrate(db))
+
+        rows = run(db.fetchall("SELECT StatID, PuzzleType, BestSingle, BestAo5 FROM UserStats ORDER BY StatID"))
+        assert rows == [(1, "3x3", 9.5, 11.2), (3, "2x2", 3.0, None)]
+        with pytest.raises(Exception):
+            run(db.execute("INSERT INTO UserStats (UserID, PuzzleType) VALUES (1, '3x3')"))
+
+    def test_hot_queries_use_covering_indexes(self, db):
+        run(migrate(db))
+        queries = db.queries
+        assert "COVERING INDEX IX_SolveTimes_User_Puzzle_TimeID" in query_plan(db, queries.recent_solves, 1, "3x3")
+        assert "COVERING INDEX IX_SolveTimes_User_Puzzle_SolveAt" in query_plan(db, queries.recent_solve_times, 1, "3x3")
+        plan = query_plan(db, "SELECT SolveTime, SolveStatus FROM DailySolves WHERE UserID=? AND SolveDate=?", 1, "2025-03-09")
+        assert "COVERING INDEX IX_DailySolves_User_Date" in plan
+        plan = query_plan(db, "SELECT UserID, UserName FROM Users WHERE DiscordID IN (?, ?)", 1, 2)
+        assert plan.startswith("SEARCH Users USING INDEX")
+
+    def test_solve_after_adjusting_the_only_solve_to_dnf(self, db):
+        run(migrate(db))
+        run(db.execute("INSERT INTO Users (DiscordID, UserName) VALUES (?, ?)", 100, "cuber"))
+        run(db.execute("INSERT INTO SolveTimes (UserID, SolveTime, PuzzleType, SolveStatus) VALUES (1, 12.0, '3x3', 'Completed')"))
+        assert run(db.run(update_user_pbs, 1, "3x3", 12.0))
+        # /adjust_time dnf on the only solve leaves the UserStats row without a BestSingle
+        run(db.execute("UPDATE SolveTimes SET SolveStatus = 'DNF'"))
+        run(db.run(recalculate_user_pbs, 1, "3x3"))
+        assert run(db.fetchall("SELECT BestSingle FROM UserStats")) == [(None,)]
+
+        assert run(db.run(update_user_pbs, 1, "3x3", 10.5))
+        assert run(db.run(get_user_pbs, 1, "3x3"))["BestSingle"] == 10.5
+        assert run(db.fetchval("SELECT COUNT(*) FROM UserStats")) == 1
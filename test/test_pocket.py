@@ -0,0 +1,47 @@
+import random
+import numpy as np
+import pytest
+from rubik import pocket
+from rubik.cube import Cube
+
+
+def is_solved(cube):
+    # Any whole-cube orientation counts as solved
+    return all(len(set(face)) == 1 for face in cube.state.reshape(6, -1).tolist())
+
+
+class TestPocket:
+    """Tests for the 2x2 distance table, solver and random-state scrambler."""
+
+    def test_distance_distribution(self):
+        counts = np.bincount(pocket.distance(np.arange(pocket.N_STATES)))
+        # Known number of 2x2 states at each distance (half-turn metric)
+        assert counts.tolist() == [
+            1, 9, 54, 321, 1847, 9992, 50136, 227536, 870072, 1887748, 623800, 2644,
+        ]
+
+    def test_solved_cube(self):
+        assert pocket.solve(Cube(2)) == ""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_scramble_is_solved_optimally(self, seed):
+        scramble = pocket.random_state_scramble(random.Random(seed))
+        cube = Cube(2)
+        cube.scrambleCube(scramble)
+        solution = pocket.solve(cube)
+        assert len(solution.split()) == len(scramble.split()) >= pocket.MIN_SCRAMBLE_DISTANCE
+        cube.scrambleCube(solution)
+        assert is_solved(cube)
+
+    def test_rotated_cube(self):
+        cube = Cube(2)
+        cube.scrambleCube("Rw U Fw' R2")
+        cube.scrambleCube(pocket.solve(cube))
+        assert is_solved(cube)
+
+    def test_invalid_cube(self):
+        cube = Cube(2)
+        cube.state = cube.state.copy()
+        cube.state[[0, 4]] = cube.state[[4, 0]]
+        with pytest.raises(ValueError):
+            pocket.solve(cube)
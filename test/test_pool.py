@@ -0,0 +1,88 @@
+import sqlite3
+import threading
+
+import pytest
+from database.pool import ConnectionPool
+
+
+def make_pool(tmp_path, min_size=1, max_size=2) -> ConnectionPool:
+    return ConnectionPool(
+        lambda: sqlite3.connect(tmp_path / "test.db", check_same_thread=False), min_size, max_size
+    )
+
+
+class TestConnectionPool:
+    """Tests for the database connection pool."""
+
+    def test_open_creates_min_size(self, tmp_path):
+        pool = make_pool(tmp_path, min_size=2, max_size=3)
+        pool.open()
+        assert pool.stats() == {"size": 2, "idle": 2, "in_use": 0, "max_size": 3}
+
+    def test_connections_are_reused(self, tmp_path):
+        pool = make_pool(tmp_path)
+        pool.open()
+        connection = pool.acquire()
+        pool.release(connection)
+        assert pool.acquire() is connection
+
+    def test_grows_up_to_max_size(self, tmp_path):
+        pool = make_pool(tmp_path, max_size=2)
+        pool.open()
+        first, second = pool.acquire(), pool.acquire()
+        assert first is not second
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.05)
+
+    def test_waits_for_a_released_connection(self, tmp_path):
+        pool = make_pool(tmp_path, max_size=1)
+        pool.open()
+        connection = pool.acquire()
+        threading.Timer(0.05, pool.release, (connection,)).start()
+        assert pool.acquire(timeout=5) is connection
+
+    def test_broken_connection_is_replaced_on_checkout(self, tmp_path):
+        pool = make_pool(tmp_path)
+        pool.open()
+        broken = pool.acquire()
+        broken.close()
+        pool.release(broken)
+
+        connection = pool.acquire()
+        assert connection is not broken
+        assert connection.execute("SELECT 1").fetchone() == (1,)
+        assert pool.stats()["size"] == 1
+
+    def test_connection_context_rolls_back(self, tmp_path):
+        pool = make_pool(tmp_path)
+        pool.open()
+        with pool.connection() as connection:
+            connection.execute("CREATE TABLE t (x INTEGER)")
+            connection.commit()
+        with pytest.raises(RuntimeError):
+            with pool.connection() as connection:
+                connection.execute("INSERT INTO t VALUES (1)")
+                raise RuntimeError
+        with pool.connection() as connection:
+            assert connection.execute("SELECT COUNT(*) FROM t").fetchone() == (0,)
+
+    def test_prune_keeps_min_size(self, tmp_path):
+        pool = make_pool(tmp_path, min_size=1, max_size=3)
+        pool.open()
+        connections = [pool.acquire() for _ in range(3)]
+        for connection in connections:
+            pool.release(connection)
+        assert pool.prune(max_idle=0) == 2
+        assert pool.stats()["size"] == 1
+
+    def test_closed_pool(self, tmp_path):
+        pool = make_pool(tmp_path)
+        pool.open()
+        pool.close()
+        assert pool.stats()["size"] == 0
+        with pytest.raises(ConnectionError):
+            pool.acquire()
+
+    def test_invalid_sizes(self, tmp_path):
+        with pytest.raises(ValueError):
+            make_pool(tmp_path, min_size=3, max_size=2)
@@ -0,0 +1,83 @@
+import pytest
+from rubik.cases import load_algorithms
+from rubik.cube import Cube
+from rubik.moves import FACES
+from rubik.recognize import AUFS, Recognition, get_tables, describe, recognize
+
+ALGORITHMS = load_algorithms()
+PLLS = sorted(ALGORITHMS["pll"])
+
+
+def invert(algorithm: str) -> str:
+    moves = []
+    for move in reversed(algorithm.split()):
+        moves.append(move[:-1] if move.endswith("'") else move if move.endswith("2") else move + "'")
+    return " ".join(moves)
+
+
+def setup(scramble: str) -> Cube:
+    cube = Cube(3)
+    cube.scrambleCube(scramble)
+    return cube
+
+
+def solve(cube: Cube, recognition: Recognition) -> None:
+    top = cube.state[4]
+    cube.scrambleCube(f"{recognition.pre_auf} {ALGORITHMS[recognition.mode][recognition.alg_id]}")
+    if recognition.post_auf:
+        # Algorithms with rotations leave the last layer on another face
+        face = FACES[list(cube.state[4::9]).index(top)]
+        cube.scrambleCube(face + recognition.post_auf[1:])
+
+
+def is_solved(cube: Cube) -> bool:
+    return all(len(set(face)) == 1 for face in cube.state.reshape(6, 9).tolist())
+
+
+class TestRecognize:
+    """Tests for the OLL/PLL case recognizer."""
+
+    def test_table_sizes(self):
+        oll, pll = get_tables()
+        # Every orientation (3^3 * 2^3) and permutation (4! * 4! / 2) of the last layer
+        assert len(oll) == 216
+        assert len(pll) == 288
+
+    @pytest.mark.parametrize("alg_id", PLLS)
+    @pytest.mark.parametrize("auf", AUFS)
+    def test_pll_is_recognized_and_solved(self, alg_id, auf):
+        scramble = f"{invert(ALGORITHMS['pll'][alg_id])} {auf}"
+        recognition = recognize(setup(scramble).state)
+        assert recognition.mode == "pll"
+        cube = setup(scramble)
+        solve(cube, recognition)
+        assert is_solved(cube)
+
+    def test_pll_case(self):
+        recognition = recognize(setup(f"U {invert(ALGORITHMS['pll']['T'])} U'").state)
+        assert recognition == Recognition("pll", "T", "U", "U'")
+
+    def test_oll_is_recognized(self):
+        cube = setup(invert(ALGORITHMS["oll"]["27"]))
+        assert recognize(cube.state) == Recognition("oll", "27", "", "")
+
+    def test_oll_pre_auf(self):
+        cube = setup(f"{invert(ALGORITHMS['oll']['45'])} U")
+        recognition = recognize(cube.state)
+        assert recognition == Recognition("oll", "45", "U'", "")
+        solve(cube, recognition)
+        assert (cube.state[:9] == cube.state[4]).all()
+
+    def test_skips(self):
+        assert recognize(Cube(3).state) == Recognition("pll", "skip", "", "")
+        assert recognize(setup("U2").state) == Recognition("pll", "skip", "", "U2")
+
+    def test_unsolved_first_two_layers(self):
+        assert recognize(setup("R U R' F").state) is None
+
+    def test_invalid_state(self):
+        assert recognize(Cube(4).state) is None
+
+    def test_describe(self):
+        assert describe(Recognition("pll", "T", "U'", "U2")) == "PLL T (U' before, U2 after)"
+        assert describe(Recognition("oll", "21", "", "")) == "OLL 21"
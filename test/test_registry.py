@@ -0,0 +1,23 @@
+import pytest
+from views.registry import OLL_GROUPS, REGISTRY, build_algorithm_set
+
+
+class TestRegistry:
+    """Tests for the shared OLL/PLL algorithm registry."""
+
+    def test_groups_are_indexed(self):
+        pll = REGISTRY["pll"]
+        assert pll.group_algorithms["Edges Only"][1] == ("Ua", pll.algorithms["Ua"])
+        assert [option.value for option in pll.select_options] == sorted(pll.groups)
+
+    def test_registry_is_read_only(self):
+        with pytest.raises(TypeError):
+            REGISTRY["oll"].algorithms["1"] = "R"
+
+    def test_missing_algorithm_raises(self):
+        with pytest.raises(ValueError):
+            build_algorithm_set("oll", OLL_GROUPS, {"1": "R U R'"})
+
+    def test_invalid_algorithm_raises(self):
+        with pytest.raises(ValueError):
+            build_algorithm_set("oll", {"Dot": ("1",)}, {"1": "R Q"})
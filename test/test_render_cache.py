@@ -0,0 +1,48 @@
+import pytest
+from rubik.cube import Cube
+from rubik.draw import draw_rubiks_cube
+from rubik.render_cache import RenderCache, render_cache
+
+
+class TestRenderCache:
+    """Tests for the byte-bounded LRU render cache."""
+
+    def test_miss_then_hit(self):
+        cache = RenderCache()
+        key = RenderCache.make_key("net", 3, b"state")
+        assert cache.get(key) is None
+        cache.put(key, b"png")
+        assert cache.get(key).read() == b"png"
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    def test_streams_share_the_same_bytes(self):
+        cache = RenderCache()
+        first = cache.get_or_render(b"k", lambda: b"x" * 100)
+        second = cache.get_or_render(b"k", lambda: pytest.fail("rendered twice"))
+        first.read()
+        assert second.tell() == 0
+        assert second.getbuffer().tobytes() == b"x" * 100
+
+    def test_evicts_least_recently_used_by_size(self):
+        cache = RenderCache(max_bytes=250)
+        cache.put(b"a", b"a" * 100)
+        cache.put(b"b", b"b" * 100)
+        cache.get(b"a")
+        cache.put(b"c", b"c" * 100)
+        assert cache.get(b"b") is None
+        assert cache.get(b"a") is not None
+        assert cache.stats()["bytes"] == 200
+
+    def test_keys_depend_on_every_part(self):
+        assert RenderCache.make_key("ab", "c") != RenderCache.make_key("a", "bc")
+        assert RenderCache.make_key(3, b"s") != RenderCache.make_key(4, b"s")
+
+    def test_draw_reuses_rendered_state(self):
+        cube = Cube(5)
+        cube.scrambleCube("Rw U2 F'")
+        draw_rubiks_cube(cube)
+        hits = render_cache.stats()["hits"]
+        again = Cube(5)
+        again.scrambleCube("Rw U2 F'")
+        draw_rubiks_cube(again)
+        assert render_cache.stats()["hits"] == hits + 1
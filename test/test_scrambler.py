@@ -0,0 +1,44 @@
+import random
+import pytest
+from rubik import pocket
+from rubik.compiler import tokenize
+from rubik.scrambler import SCRAMBLE_LENGTHS, generate_scramble
+
+AXES = {"U": 0, "D": 0, "R": 1, "L": 1, "F": 2, "B": 2}
+
+
+class TestGenerateScramble:
+    """Tests for the local random-move scrambler."""
+
+    @pytest.mark.parametrize("size", range(3, 8))
+    def test_length_matches_wca(self, size):
+        scramble = generate_scramble(size, random.Random(size))
+        assert len(scramble.split()) == SCRAMBLE_LENGTHS[size]
+
+    @pytest.mark.parametrize("size", range(2, 8))
+    def test_no_moves_cancel_or_merge(self, size):
+        moves = generate_scramble(size, random.Random(42)).split()
+        # The compiler merges consecutive turns of the same layers, so nothing may collapse
+        assert len(tokenize(" ".join(moves))) == len(moves)
+        axis, run = None, set()
+        for move in tokenize(" ".join(moves)):
+            if AXES[move.face] != axis:
+                axis, run = AXES[move.face], set()
+            assert (move.face, move.layers) not in run
+            run.add((move.face, move.layers))
+
+    def test_two_by_two_is_random_state(self):
+        scramble = generate_scramble(2, random.Random(7))
+        assert pocket.MIN_SCRAMBLE_DISTANCE <= len(scramble.split()) <= 11
+
+    def test_two_by_two_keeps_one_corner_fixed(self):
+        scramble = generate_scramble(2, random.Random(7))
+        assert set(move[0] for move in scramble.split()) <= {"U", "R", "F"}
+
+    def test_wide_moves_only_on_big_cubes(self):
+        assert "w" not in generate_scramble(3, random.Random(1))
+        assert "3" in generate_scramble(7, random.Random(1))
+
+    def test_unsupported_size_raises(self):
+        with pytest.raises(ValueError):
+            generate_scramble(8)
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+from cogs.commands import RubiksCommands
+from rubik.compiler import count_moves
+from views.attachment_cache import attachment_urls
+from views.image_cache import case_images
+from views.search import ALGORITHM_INDEX, MAX_CHOICE_NAME, MAX_CHOICES
+
+
+def names(query):
+    return [ALGORITHM_INDEX.entries[index].name for index in ALGORITHM_INDEX.search(query)]
+
+
+class TestCountMoves:
+    """Tests for the HTM/QTM/STM move counts."""
+
+    @pytest.mark.parametrize(
+        "moves, counts",
+        [
+            ("R U R' U'", (4, 4, 4)),
+            ("R U2 R'", (3, 4, 3)),
+            ("M2 U M2 U2 M2 U M2", (11, 20, 7)),
+            ("x R2 D2 y'", (2, 4, 2)),
+            ("Rw 2R'", (3, 3, 2)),
+        ],
+    )
+    def test_metrics(self, moves, counts):
+        assert tuple(count_moves(moves)) == counts
+
+
+class TestAlgorithmIndex:
+    """Tests for the /alg search index."""
+
+    def test_finds_by_name_id_group_and_moves(self):
+        assert names("t perm") == ["T Perm"]
+        assert names("OLL 21") == ["OLL 21"]
+        assert "OLL 21" in names("cross")
+        assert "H Perm" in names("m2 u m2")
+
+    def test_results_are_shortest_first(self):
+        lengths = [ALGORITHM_INDEX.entries[index].counts for index in ALGORITHM_INDEX.search("perm")]
+        assert lengths == sorted(lengths)
+
+    def test_autocomplete_choices(self):
+        choices = ALGORITHM_INDEX.autocomplete("")
+        assert len(choices) == MAX_CHOICES
+        assert all(len(choice.name) <= MAX_CHOICE_NAME for choice in ALGORITHM_INDEX.choices)
+        assert ALGORITHM_INDEX.autocomplete("ua")[0].value == "pll:Ua"
+
+    def test_lookup(self):
+        assert ALGORITHM_INDEX.lookup("pll:Ua").alg_id == "Ua"
+        assert ALGORITHM_INDEX.lookup("t perm").alg_id == "T"
+        assert ALGORITHM_INDEX.lookup("no such case") is None
+
+
+class HangingChannel:
+    """An asset channel whose uploads never finish, like a rate-limited Discord."""
+
+    def __init__(self):
+        self.uploads = 0
+
+    async def send(self, file):
+        self.uploads += 1
+        await asyncio.Event().wait()
+
+
+class FakeInteraction:
+    def __init__(self):
+        self.sent = []
+        self.response = self
+        self.followup = self
+
+    async def defer(self):
+        pass
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append(kwargs)
+
+
+class TestAlgCommand:
+    """Tests for the /alg command."""
+
+    def test_replies_without_waiting_for_an_upload(self, monkeypatch):
+        channel = HangingChannel()
+        monkeypatch.setattr(attachment_urls, "bot", type("Bot", (), {"get_channel": lambda self, _: channel})())
+        monkeypatch.setattr(attachment_urls, "channel_id", 123)
+        monkeypatch.setattr(attachment_urls, "_channel", None)
+        cog = object.__new__(RubiksCommands)
+        cog.bot = type("Bot", (), {"command_usage": type("Usage", (), {"record": lambda self, name: None})()})()
+        interaction = FakeInteraction()
+
+        async def command():
+            await case_images.prefetch()
+            await asyncio.wait_for(RubiksCommands.alg.callback(cog, interaction, "T Perm"), 1)
+            await asyncio.sleep(0)
+            uploads = set(attachment_urls._uploads)
+            for task in uploads:
+                task.cancel()
+            return uploads
+
+        assert len(asyncio.run(command())) == 1
+        assert channel.uploads == 1
+        [reply] = interaction.sent
+        assert reply["embed"].image.url.startswith("attachment://")
+        assert "file" in reply
@@ -0,0 +1,115 @@
+import datetime
+
+import pytest
+from conftest import run
+from database.async_db import AsyncDatabase
+from database.identity import UserIdentityCache
+from database.sqlite_storage import SqliteStorage
+from database.storage import Storage, create_storage
+from database.usage import CommandUsageBuffer, usage_month
+from stats.personal_best import get_user_pbs, recalculate_user_pbs, update_user_pbs
+
+
+@pytest.fixture
+def storage_sizes():
+    return 1, 2
+
+
+async def add_solves(db, user_id: int, times: list[float], puzzle: str = "3x3") -> None:
+    async with db.transaction() as tx:
+        for time in times:
+            await tx.execute(
+                "INSERT INTO SolveTimes(UserID, SolveTime, PuzzleType, SolveStatus) VALUES(?, ?, ?, ?)",
+                user_id, time, puzzle, "Completed",
+            )
+
+
+class TestSqliteStorage:
+    """Tests for the embedded SQLite backend, running the bot's own queries."""
+
+    def test_wal_mode(self, db):
+        assert run(db.fetchval("PRAGMA journal_mode")) == "wal"
+        assert run(db.fetchval("PRAGMA foreign_keys")) == 1
+
+    def test_schema_is_created_once(self, tmp_path):
+        path = tmp_path / "cubecrafter.db"
+        for _ in range(2):
+            storage = SqliteStorage(path, min_size=0, max_size=1)
+            storage.connect()
+            storage.close()
+        db = AsyncDatabase(SqliteStorage(path))
+        db.storage.connect()
+        tables = run(db.fetchall("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite%'"))
+        assert {name for (name,) in tables} == {
+            "Users", "SolveTimes", "UserStats", "DailySolves", "DailyScramble",
+            "CommandLog", "CommandTrack", "DuelMatches",
+        }
+        db.storage.close()
+
+    def test_upsert_user(self, db):
+        users = UserIdentityCache(db)
+        user_id = run(users.get_or_create(100, "cuber"))
+        users.invalidate(100)
+        assert run(users.get_or_create(100, "renamed")) == user_id
+        assert run(users.get_or_create(200, "other")) != user_id
+        assert run(db.fetchval("SELECT UserName FROM Users WHERE DiscordID = ?", 100)) == "cuber"
+
+    def test_merge_usage(self, db):
+        usage = CommandUsageBuffer(db)
+        usage.record("scramble")
+        run(usage.flush())
+        usage.record("scramble")
+        usage.record("time")
+        run(usage.flush())
+        rows = run(db.fetchall("SELECT CommandName, UsageCount FROM CommandTrack WHERE UsageMonth = ?", usage_month()))
+        assert sorted(rows) == [("scramble", 2), ("time", 1)]
+
+    def test_recent_solves_keep_the_latest_15(self, db):
+        user_id = run(UserIdentityCache(db).get_or_create(100, "cuber"))
+        run(add_solves(db, user_id, [float(t) for t in range(20)]))
+        run(add_solves(db, user_id, [1.0], puzzle="2x2"))
+
+        rows = run(db.fetchall(db.queries.recent_solves, user_id, "3x3"))
+        assert [row[1] for row in rows] == [float(t) for t in range(19, 4, -1)]
+        rows = run(db.fetchall(db.queries.recent_solve_times, user_id, "3x3"))
+        assert rows[0] == (19.0, "Completed")
+        assert len(rows) == 15
+
+    def test_personal_bests(self, db):
+        user_id = run(UserIdentityCache(db).get_or_create(100, "cuber"))
+        run(add_solves(db, user_id, [10.0, 12.0, 9.0, 11.0, 13.0]))
+        run(db.run(recalculate_user_pbs, user_id, "3x3"))
+        pbs = run(db.run(get_user_pbs, user_id, "3x3"))
+        assert pbs == {"BestSingle": 9.0, "BestAo5": 11.0, "BestAo12": None}
+
+        assert run(db.run(update_user_pbs, user_id, "3x3", 8.5))
+        assert not run(db.run(update_user_pbs, user_id, "3x3", 9.5))
+        assert run(db.run(get_user_pbs, user_id, "3x3"))["BestSingle"] == 8.5
+
+    def test_dates_are_stored_as_iso_text(self, db):
+        today = datetime.date(2025, 3, 9)
+        run(db.execute(
+            "INSERT INTO DailyScramble (ScrambleText, ScrambleDate, PuzzleType, ImageString) VALUES (?, ?, ?, ?)",
+            "R U", today, "3x3", "",
+        ))
+        assert run(db.fetchone("SELECT 1 FROM DailyScramble WHERE ScrambleDate = ?", today)) == (1,)
+
+
+def test_create_storage(monkeypatch):
+    monkeypatch.setenv("DB_BACKEND", "SQLite")
+    assert isinstance(create_storage(), SqliteStorage)
+    with pytest.raises(ValueError):
+        create_storage("postgres")
+
+
+def test_incomplete_backend_fails_on_construction():
+    class NoQueries(Storage):
+        def _open_connection(self):
+            return None
+
+    class NoConnection(Storage):
+        queries = SqliteStorage.queries
+
+    for backend in (Storage, NoQueries, NoConnection):
+        with pytest.raises(TypeError):
+            backend()
@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+from conftest import run
+from database import supervisor
+from database.async_db import AsyncDatabase
+from database.sqlite_storage import SqliteStorage
+from database.supervisor import (
+    CONNECTED,
+    CircuitBreaker,
+    CircuitOpenError,
+    ConnectionSupervisor,
+    backoff_delay,
+)
+
+
+class FlakyStorage(SqliteStorage):
+    """A SQLite backend whose first connection attempts fail."""
+
+    def __init__(self, path, failures: int) -> None:
+        super().__init__(path, min_size=0, max_size=1)
+        self.failures = failures
+        self.pings = 0
+
+    def ping(self) -> None:
+        self.pings += 1
+        if self.pings <= self.failures:
+            raise ConnectionError("database is down")
+        super().ping()
+
+
+async def wait_for(condition, timeout: float = 5) -> None:
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.001)
+
+
+class TestCircuitBreaker:
+    """Tests for the database circuit breaker."""
+
+    def test_opens_at_the_failure_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        opened = []
+        breaker.on_open(lambda: opened.append(True))
+        breaker.record_failure(ConnectionError("one"))
+        breaker.check()
+        breaker.record_failure(ConnectionError("two"))
+        with pytest.raises(CircuitOpenError, match="two"):
+            breaker.check()
+        breaker.trip("three")
+        assert opened == [True]
+
+        breaker.reset()
+        breaker.check()
+        assert breaker.failures == 0
+
+    def test_success_resets_the_count(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure(ConnectionError())
+        breaker.record_success()
+        breaker.record_failure(ConnectionError())
+        assert not breaker.is_open
+
+    def test_backoff_is_capped_and_jittered(self, monkeypatch):
+        monkeypatch.setattr(supervisor.random, "uniform", lambda low, high: high)
+        assert [backoff_delay(attempt, 1, 10) for attempt in range(6)] == [1, 2, 4, 8, 10, 10]
+        monkeypatch.undo()
+        assert 0 <= backoff_delay(3, 1, 10) <= 8
+
+
+class TestConnectionSupervisor:
+    """Tests for the background reconnect loop."""
+
+    def test_checkout_failures_open_the_breaker(self, tmp_path):
+        db = AsyncDatabase(SqliteStorage(tmp_path / "test.db"))
+
+        async def scenario():
+            for _ in range(db.breaker.failure_threshold):
+                with pytest.raises(ConnectionError):
+                    await db.fetchval("SELECT 1")
+            with pytest.raises(CircuitOpenError):
+                await db.fetchval("SELECT 1")
+
+        run(scenario())
+        assert db.stats()["completed"] == db.breaker.failure_threshold
+
+    def test_reconnects_with_backoff(self, tmp_path):
+        storage = FlakyStorage(tmp_path / "test.db", failures=3)
+        db = AsyncDatabase(storage)
+        connected = []
+
+        async def on_connect():
+            connected.append(await db.fetchval("SELECT 1"))
+
+        async def scenario():
+            db_supervisor = ConnectionSupervisor(db, on_connect, base_delay=0.001, max_delay=0.01)
+            db_supervisor.start()
+            with pytest.raises(CircuitOpenError):
+                await db.fetchval("SELECT 1")
+            await wait_for(lambda: connected)
+            health = db_supervisor.health
+            await db_supervisor.stop()
+            return health
+
+        health = run(scenario())
+        assert storage.pings == 4
+        assert connected == [1]
+        assert health.state == CONNECTED
+        assert not health.breaker_open
+        assert health.attempts == 3
+
+    def test_failed_health_check_reconnects(self, tmp_path):
+        storage = FlakyStorage(tmp_path / "test.db", failures=0)
+        db = AsyncDatabase(storage)
+
+        async def scenario():
+            db_supervisor = ConnectionSupervisor(db, base_delay=0.001)
+            db_supervisor.start()
+            await wait_for(lambda: db_supervisor.state == CONNECTED)
+            assert (await db_supervisor.check_health()).latency_ms is not None
+
+            storage.failures = storage.pings + 1
+            await db.call(storage.close)
+            health = await db_supervisor.check_health()
+            assert health.breaker_open
+            await wait_for(lambda: not db.breaker.is_open)
+            await db_supervisor.stop()
+
+        run(scenario())
+        assert storage.pings == 3
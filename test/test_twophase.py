@@ -0,0 +1,66 @@
+import random
+import numpy as np
+import pytest
+from rubik.cube import Cube
+from rubik.scrambler import generate_scramble
+from rubik.tables import load_tables, save_tables
+from rubik import twophase
+
+
+class TestTables:
+    """Tests for the memory-mapped table file format."""
+
+    def test_round_trip(self, tmp_path):
+        tables = {"a": np.arange(10, dtype=np.uint8), "b": np.arange(12, dtype=np.uint16).reshape(3, 4)}
+        save_tables(tmp_path / "test.tbl", tables)
+        loaded = load_tables(tmp_path / "test.tbl")
+        assert set(loaded) == {"a", "b"}
+        for name, array in tables.items():
+            assert loaded[name].dtype == array.dtype
+            assert np.array_equal(loaded[name], array)
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "other.tbl"
+        path.write_bytes(b"not a table file")
+        with pytest.raises(ValueError):
+            load_tables(path)
+
+
+class TestSolve:
+    """Tests for the two-phase 3x3 solver."""
+
+    def test_solved_cube(self):
+        assert twophase.solve(Cube(3)) == ""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_solution_solves_scramble(self, seed):
+        cube = Cube(3)
+        cube.scrambleCube(generate_scramble(3, random.Random(seed)))
+        solution = twophase.solve(cube)
+        assert len(solution.split()) <= twophase.DEFAULT_MAX_LENGTH
+        cube.scrambleCube(solution)
+        assert np.array_equal(cube.state, Cube(3).state)
+
+    def test_superflip(self):
+        cube = Cube(3)
+        cube.scrambleCube("U R2 F B R B2 R U2 L B2 R U' D' R2 F R' L B2 U2 F2")
+        solution = twophase.solve(cube)
+        cube.scrambleCube(solution)
+        assert np.array_equal(cube.state, Cube(3).state)
+
+    def test_timeout(self):
+        cube = Cube(3)
+        cube.scrambleCube("U R2 F B R B2 R U2 L B2 R U' D' R2 F R' L B2 U2 F2")
+        with pytest.raises(TimeoutError):
+            twophase.solve(cube, timeout=0)
+
+    def test_invalid_cube(self):
+        cube = Cube(3)
+        cube.state = cube.state.copy()
+        cube.state[[0, 9]] = cube.state[[9, 0]]
+        with pytest.raises(ValueError):
+            twophase.solve(cube)
+
+    def test_requires_3x3(self):
+        with pytest.raises(ValueError):
+            twophase.solve(Cube(4))
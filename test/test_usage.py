@@ -0,0 +1,78 @@
+import asyncio
+import datetime
+
+from database.storage import Queries
+from database.usage import CommandUsageBuffer, usage_month
+
+QUERIES = Queries("recent_solves", "recent_solve_times", "upsert_user", "merge_usage")
+
+
+class FakeCursor:
+    def __init__(self) -> None:
+        self.batches = []
+
+    def executemany(self, sql, rows) -> None:
+        assert sql == QUERIES.merge_usage
+        self.batches.append(sorted(rows))
+
+
+class FakeDatabase:
+    """Runs units of work on a recording cursor, like AsyncDatabase.run."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.queries = QUERIES
+        self.cursor = FakeCursor()
+        self.fail = fail
+
+    async def run(self, func, *args):
+        if self.fail:
+            raise ConnectionError("database is down")
+        return func(self.cursor, *args)
+
+
+class TestCommandUsageBuffer:
+    """Tests for the write-behind command usage buffer."""
+
+    def test_usage_month(self):
+        assert usage_month(datetime.datetime(2025, 3, 9)) == "03-2025"
+
+    def test_counts_are_aggregated_into_one_batch(self):
+        db = FakeDatabase()
+        usage = CommandUsageBuffer(db)
+        for command in ("scramble", "time", "scramble"):
+            usage.record(command)
+        assert usage.pending == 3
+
+        assert asyncio.run(usage.flush()) == 3
+        month = usage_month()
+        assert db.cursor.batches == [[("scramble", month, 2), ("time", month, 1)]]
+        assert usage.pending == 0
+
+    def test_empty_flush_skips_the_database(self):
+        db = FakeDatabase()
+        assert asyncio.run(CommandUsageBuffer(db).flush()) == 0
+        assert db.cursor.batches == []
+
+    def test_failed_flush_keeps_the_counts(self):
+        db = FakeDatabase(fail=True)
+        usage = CommandUsageBuffer(db)
+        usage.record("help")
+        assert asyncio.run(usage.flush()) == 0
+        assert usage.pending == 1
+
+        db.fail = False
+        usage.record("help")
+        assert asyncio.run(usage.flush()) == 2
+        assert db.cursor.batches == [[("help", usage_month(), 2)]]
+
+    def test_flushes_when_full(self):
+        db = FakeDatabase()
+        usage = CommandUsageBuffer(db, max_pending=3)
+
+        async def scenario():
+            for _ in range(3):
+                usage.record("solve")
+            await asyncio.sleep(0)
+
+        asyncio.run(scenario())
+        assert db.cursor.batches == [[("solve", usage_month(), 3)]]